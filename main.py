@@ -1,4 +1,6 @@
 # main.py
+import time
+_debut = time.perf_counter()
 
 import sys
 import os
@@ -8,11 +10,56 @@ import platform
 if platform.system() == 'Linux':
     os.environ['QT_QPA_PLATFORMTHEME'] = ''
 
+# --profile-startup : affiche la durée de chaque étape du démarrage
+PROFIL_DEMARRAGE = "--profile-startup" in sys.argv
+if PROFIL_DEMARRAGE:
+    sys.argv.remove("--profile-startup")
+
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QObject, QEvent, QTimer
+_import_qt = time.perf_counter()
+
 from screens.accueil import AccueilWindow
+_import_ecrans = time.perf_counter()
+
+
+class MesureDemarrage(QObject):
+    """Mesure les étapes du démarrage et les affiche une fois la première image de la fenêtre dessinée"""
+    def __init__(self):
+        super().__init__()
+        self.etapes = [("import de PySide6", _import_qt - _debut), ("import des écrans", _import_ecrans - _import_qt)]
+        self.precedente = _import_ecrans
+        self.dessin_vu = False
+
+    def etape(self, nom):
+        maintenant = time.perf_counter()
+        self.etapes.append((nom, maintenant - self.precedente))
+        self.precedente = maintenant
+
+    def eventFilter(self, objet, event):
+        if event.type() == QEvent.Paint and not self.dessin_vu:
+            self.dessin_vu = True
+            QTimer.singleShot(0, self.premiere_image)  # une fois ce passage de dessin terminé
+        return False
+
+    def premiere_image(self):
+        QApplication.instance().removeEventFilter(self)
+        self.etape("première image")
+        mode = "exe" if getattr(sys, 'frozen', False) else "développement"
+        print(f"Démarrage ({mode}) :")
+        for nom, duree in self.etapes:
+            print(f"  {nom:<20} {duree * 1000:8.1f} ms")
+        print(f"  {'total':<20} {(self.precedente - _debut) * 1000:8.1f} ms")
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    if PROFIL_DEMARRAGE:
+        mesure = MesureDemarrage()
+        mesure.etape("QApplication")
+        app.installEventFilter(mesure)
     window = AccueilWindow()
+    if PROFIL_DEMARRAGE:
+        mesure.etape("fenêtre d'accueil")
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
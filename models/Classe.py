@@ -1,5 +1,8 @@
 class Classe:
-    def __init__(self, nom, effectif, couleur="gris"):
+    __slots__ = ("id", "nom", "effectif", "couleur")
+
+    def __init__(self, nom, effectif, couleur="gris", id=None):
+        self.id = id  # identifiant stable, référencé par les devoirs (le nom peut changer)
         self.nom = nom
         self.effectif = self._valider_effectif(effectif)
         self.couleur = couleur
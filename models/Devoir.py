@@ -1,11 +1,79 @@
-from datetime import datetime
+import sys
+from datetime import date as Date
+
+# Les mêmes dates reviennent sur des milliers de devoirs : on ne les analyse
+# qu'une fois, et les devoirs d'un même jour partagent le même entier.
+_ordinaux = {}
+
+def date_vers_ordinal(texte):
+    """Convertit "AAAA-MM-JJ" en numéro de jour (date.toordinal()), ou None si la date est invalide"""
+    ordinal = _ordinaux.get(texte)
+    if ordinal is None:
+        try:
+            ordinal = Date.fromisoformat(texte).toordinal()
+        except (TypeError, ValueError):
+            return None
+        _ordinaux[texte] = ordinal
+    return ordinal
+
+# États d'échéance, calculés pour toute une liste par classer_devoirs()
+FAIT = "fait"
+A_VENIR = "à venir"
+AUJOURD_HUI = "aujourd'hui"
+EN_RETARD = "en retard"
+
+STATUTS_TERMINES = ("Fait", "Terminé")
+
+def classer_devoirs(devoirs, aujourd_hui=None):
+    """Retourne l'état d'échéance de chaque devoir (dans le même ordre), en ne lisant l'horloge qu'une fois.
+
+    aujourd_hui est un numéro de jour (date.toordinal()) ; par défaut, la date du jour.
+    Un devoir dont la date est illisible est considéré comme à venir.
+    """
+    if aujourd_hui is None:
+        aujourd_hui = Date.today().toordinal()
+    etats = []
+    for devoir in devoirs:
+        jour = devoir.jour
+        if devoir.statut in STATUTS_TERMINES:
+            etats.append(FAIT)
+        elif jour > aujourd_hui or jour == 0:
+            etats.append(A_VENIR)
+        elif jour == aujourd_hui:
+            etats.append(AUJOURD_HUI)
+        else:
+            etats.append(EN_RETARD)
+    return etats
 
 class Devoir:
-    def __init__(self, contenu, classe_objet, date=None, statut="Pas fait"):
+    __slots__ = ("id", "contenu", "classe_objet", "jour", "_date_texte", "statut")
+
+    def __init__(self, contenu, classe_objet, date=None, statut="Pas fait", id=None):
+        self.id = id  # identifiant unique et stable (attribué à l'ajout dans une ListeDevoirs)
         self.contenu = contenu
         self.classe_objet = classe_objet  # maintenant un objet Classe
-        self.date = date if date else datetime.now().strftime("%Y-%m-%d")
-        self.statut = statut
+        self.date = date if date else Date.today().isoformat()
+        self.statut = sys.intern(statut)  # quelques valeurs possibles : une seule chaîne pour chacune
+
+    @property
+    def date(self):
+        """Date d'échéance au format "AAAA-MM-JJ" (stockée sous forme de numéro de jour)"""
+        if self._date_texte is not None:
+            return self._date_texte
+        return Date.fromordinal(self.jour).isoformat()
+
+    @date.setter
+    def date(self, texte):
+        ordinal = date_vers_ordinal(texte)
+        # jour vaut 0 pour une date illisible, qu'on garde telle quelle
+        self.jour = ordinal if ordinal is not None else 0
+        self._date_texte = None if ordinal is not None else texte
+
+    def date_formatee(self, format="%d/%m/%Y"):
+        """Retourne la date d'échéance au format d'affichage donné"""
+        if self._date_texte is not None:
+            return self._date_texte
+        return Date.fromordinal(self.jour).strftime(format)
 
     def marquer_comme_fait(self):
         self.statut = "Fait"
@@ -15,10 +83,7 @@ class Devoir:
         return f"Devoir : {self.contenu} | Classe : {nom_classe} | Échéance : {self.date} | Statut : {self.statut}"
 
     def est_en_retard(self):
-        if self.statut == "Fait":
+        if self.statut in STATUTS_TERMINES or self._date_texte is not None:
             return False
-        try:
-            date_echeance = datetime.strptime(self.date, "%Y-%m-%d")
-            return date_echeance < datetime.now()
-        except ValueError:
-            return False
\ No newline at end of file
+        # L'échéance est à minuit : le devoir est en retard dès le jour même
+        return self.jour <= Date.today().toordinal()
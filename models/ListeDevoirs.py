@@ -0,0 +1,208 @@
+from bisect import bisect_left
+
+
+class ListeDevoirs(list):
+    """Liste de devoirs (dans l'ordre manuel) indexée par identifiant.
+
+    Chaque devoir ajouté reçoit un identifiant unique s'il n'en a pas (ou si
+    le sien est déjà pris). `devoir in liste`, index() et remove() passent
+    par deux dictionnaires id -> devoir et id -> position au lieu de
+    parcourir la liste. Après une insertion ou une suppression, seules les
+    positions situées après l'élément touché sont recalculées, et seulement
+    au moment où on en a besoin.
+
+    Un index inverse classe -> devoirs permet de retrouver les devoirs d'une
+    classe sans parcourir la liste (dans l'ordre où ils ont été indexés, pas
+    dans l'ordre manuel). Pour changer la classe d'un devoir de la liste,
+    passer par changer_classe() afin de garder cet index à jour.
+
+    devoirs_de_classe_par_date() s'appuie sur un second index, par classe
+    et par date (clés (jour, id) triées et devoirs dans le même ordre),
+    construit à la première demande
+    pour une classe puis tenu à jour à chaque insertion, suppression ou
+    changement de classe. Pour changer la date d'un devoir de la liste,
+    passer par changer_date().
+    """
+    def __init__(self, devoirs=()):
+        super().__init__()
+        self._par_id = {}
+        self._positions = {}
+        self._par_classe = {}  # classe -> {id: devoir}
+        self._dates_par_classe = {}  # classe -> ([(jour, id)] triée, [devoir]), pour les classes déjà demandées
+        self._positions_valides = 0  # les positions des éléments [0, _positions_valides) sont à jour
+        self.prochain_id = 1
+        self.ids_attribues = False  # True si des devoirs sans identifiant en ont reçu un
+        self.extend(devoirs)
+
+    # ----- Index -----
+
+    def _indexer(self, devoir):
+        if devoir.id is None or devoir.id in self._par_id:
+            devoir.id = self.prochain_id
+            self.ids_attribues = True
+        self._par_id[devoir.id] = devoir
+        self._par_classe.setdefault(devoir.classe_objet, {})[devoir.id] = devoir
+        self._dater(devoir)
+        self.prochain_id = max(self.prochain_id, devoir.id + 1)
+
+    def _desindexer(self, devoir):
+        del self._par_id[devoir.id]
+        self._positions.pop(devoir.id, None)
+        devoirs_classe = self._par_classe[devoir.classe_objet]
+        del devoirs_classe[devoir.id]
+        if not devoirs_classe:
+            del self._par_classe[devoir.classe_objet]
+        self._dedater(devoir)
+
+    def _dater(self, devoir):
+        index_dates = self._dates_par_classe.get(devoir.classe_objet)
+        if index_dates is not None:
+            cles, devoirs = index_dates
+            cle = (devoir.jour, devoir.id)
+            position = bisect_left(cles, cle)
+            cles.insert(position, cle)
+            devoirs.insert(position, devoir)
+
+    def _dedater(self, devoir):
+        index_dates = self._dates_par_classe.get(devoir.classe_objet)
+        if index_dates is not None:
+            cles, devoirs = index_dates
+            position = bisect_left(cles, (devoir.jour, devoir.id))
+            del cles[position]
+            del devoirs[position]
+
+    def _invalider(self, index):
+        self._positions_valides = min(self._positions_valides, index)
+
+    def _reindexer(self):
+        self._par_id.clear()
+        self._positions.clear()
+        self._par_classe.clear()
+        self._dates_par_classe.clear()
+        self._positions_valides = 0
+        for devoir in list.__iter__(self):
+            self._indexer(devoir)
+
+    def devoir_par_id(self, id_devoir):
+        """Retourne le devoir de cet identifiant (ou None)"""
+        return self._par_id.get(id_devoir)
+
+    def devoirs_de_classe(self, classe):
+        """Retourne les devoirs rattachés à cette classe"""
+        return list(self._par_classe.get(classe, {}).values())
+
+    def devoirs_de_classe_par_date(self, classe):
+        """Retourne les devoirs rattachés à cette classe, par date croissante (à date égale, par identifiant)"""
+        index_dates = self._dates_par_classe.get(classe)
+        if index_dates is None:
+            tries = sorted(((devoir.jour, id_devoir), devoir) for id_devoir, devoir in self._par_classe.get(classe, {}).items())
+            index_dates = ([cle for cle, _ in tries], [devoir for _, devoir in tries])
+            self._dates_par_classe[classe] = index_dates
+        return list(index_dates[1])
+
+    def ids_de_classe(self, classe):
+        """Retourne les identifiants des devoirs rattachés à cette classe (vue, sans copie)"""
+        return self._par_classe.get(classe, {}).keys()
+
+    def classes(self):
+        """Retourne les classes qui ont au moins un devoir"""
+        return list(self._par_classe)
+
+    def __contains__(self, devoir):
+        return getattr(devoir, "id", None) is not None and self._par_id.get(devoir.id) is devoir
+
+    def index(self, devoir, *args):
+        if devoir not in self:
+            raise ValueError("Ce devoir n'est pas dans la liste")
+        position = self._positions.get(devoir.id)
+        if position is None or position >= self._positions_valides:
+            # Recalculer les positions à partir du premier élément qui a bougé
+            for i in range(self._positions_valides, len(self)):
+                self._positions[list.__getitem__(self, i).id] = i
+            self._positions_valides = len(self)
+            position = self._positions[devoir.id]
+        return position
+
+    # ----- Modifications -----
+
+    def append(self, devoir):
+        self._indexer(devoir)
+        super().append(devoir)
+
+    def extend(self, devoirs):
+        for devoir in devoirs:
+            self.append(devoir)
+
+    def __iadd__(self, devoirs):
+        self.extend(devoirs)
+        return self
+
+    def insert(self, index, devoir):
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        self._indexer(devoir)
+        super().insert(index, devoir)
+        self._invalider(index)
+
+    def pop(self, index=-1):
+        if index < 0:
+            index += len(self)
+        devoir = super().pop(index)
+        self._desindexer(devoir)
+        self._invalider(index)
+        return devoir
+
+    def retirer_devoirs(self, devoirs):
+        """Retire plusieurs devoirs en un seul parcours de la liste"""
+        ids = {devoir.id for devoir in devoirs if devoir in self}
+        if not ids:
+            return
+        premier = min(self.index(self._par_id[id_devoir]) for id_devoir in ids)
+        for id_devoir in ids:
+            self._desindexer(self._par_id[id_devoir])
+        restants = [d for d in list.__iter__(self) if d.id not in ids]
+        list.__setitem__(self, slice(None), restants)
+        self._invalider(premier)
+
+    def changer_classe(self, devoir, classe):
+        """Rattache un devoir de la liste à une autre classe"""
+        devoirs_classe = self._par_classe[devoir.classe_objet]
+        del devoirs_classe[devoir.id]
+        if not devoirs_classe:
+            del self._par_classe[devoir.classe_objet]
+        self._dedater(devoir)
+        devoir.classe_objet = classe
+        self._par_classe.setdefault(classe, {})[devoir.id] = devoir
+        self._dater(devoir)
+
+    def changer_date(self, devoir, date):
+        """Donne une nouvelle date ("AAAA-MM-JJ") à un devoir de la liste"""
+        self._dedater(devoir)
+        devoir.date = date
+        self._dater(devoir)
+
+    def remove(self, devoir):
+        self.pop(self.index(devoir))
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            super().__delitem__(index)
+            self._reindexer()
+        else:
+            self.pop(index)
+
+    def __setitem__(self, index, valeur):
+        super().__setitem__(index, valeur)
+        # Remplacement d'un ou plusieurs éléments : on reconstruit l'index
+        self._reindexer()
+
+    def clear(self):
+        super().clear()
+        self._reindexer()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._invalider(0)
+
+    def reverse(self):
+        super().reverse()
+        self._invalider(0)
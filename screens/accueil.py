@@ -1,31 +1,26 @@
+import importlib
+import time
+import traceback
+
 from PySide6.QtWidgets import (QMainWindow, QWidget, QPushButton, 
                                QVBoxLayout, QLabel, QStackedWidget, QHBoxLayout)
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont
-
-from utils.config_manager import get_lien_ent
-
-# Imports des modules des écrans
-try:
-    from screens import gestion_classes
-    print(f"gestion_classes importé: {dir(gestion_classes)}")
-except Exception as e:
-    print(f"Erreur d'import gestion_classes: {e}")
-    import traceback
-    traceback.print_exc()
-    gestion_classes = None
-
-try:
-    from screens import gestion_devoirs
-except Exception as e:
-    print(f"Erreur d'import gestion_devoirs: {e}")
-    gestion_devoirs = None
-
-try:
-    from screens import gestion_parametres
-except Exception as e:
-    print(f"Erreur d'import gestion_parametres: {e}")
-    gestion_parametres = None
+from PySide6.QtCore import Qt, QEvent, QTimer
+from PySide6.QtGui import QFont, QKeySequence, QShortcut
+
+from utils.config_manager import get_lien_ent, get_prechargement
+from utils.historique import historique
+from utils.persistance import vider_ecritures
+
+# Les modules des écrans ne sont importés qu'à leur première ouverture :
+# la page d'accueil s'affiche sans attendre leur chargement
+def importer_ecran(nom):
+    """Importe le module d'un écran (screens.nom) ; None en cas d'erreur"""
+    try:
+        return importlib.import_module(f"screens.{nom}")
+    except Exception as e:
+        print(f"Erreur d'import {nom}: {e}")
+        traceback.print_exc()
+        return None
 
 class AccueilPage(QWidget):
     """Page d'accueil avec les boutons de navigation"""
@@ -111,6 +106,9 @@ class AccueilPage(QWidget):
 
 
 class AccueilWindow(QMainWindow):
+    PAGES_PROJECTION_MAX = 4  # projections de classes gardées prêtes ; les plus anciennes sont libérées
+    BUDGET_PRECHARGEMENT = 0.008  # secondes de préchargement au plus par passage de la boucle d'événements
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Mes devoirs")
@@ -132,8 +130,83 @@ class AccueilWindow(QMainWindow):
         # Pages des modules (lazy loading)
         self.page_classes = None
         self.page_devoirs = None
+        self.contenu_devoirs = None
         self.page_parametres = None
+        self.page_selection_projection = None
+        self.selection_projection = None
+        self.pages_projection = {}  # nom de classe -> (page, PageProjection), de la moins à la plus récemment affichée
+
+        # Annuler / rétablir (Ctrl+Z, et Ctrl+Y ou Ctrl+Maj+Z selon le système), quel que soit l'écran affiché ;
+        # dans un champ de saisie, ces raccourcis restent ceux du champ
+        QShortcut(QKeySequence.Undo, self, historique.annuler)
+        QShortcut(QKeySequence.Redo, self, historique.retablir)
+
+        # Préchargement des écrans pendant les temps morts, une fois l'accueil dessiné
+        self.prechargement = None
+        self.minuteur_prechargement = None
+        if get_prechargement():
+            self.page_accueil.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.page_accueil and event.type() == QEvent.Paint:
+            self.page_accueil.removeEventFilter(self)
+            self.demarrer_prechargement()
+        return super().eventFilter(obj, event)
+
+    def demarrer_prechargement(self):
+        """Lance le préchargement par tranches ; un minuteur à 0 ms ne s'exécute que lorsque la boucle d'événements est libre"""
+        self.prechargement = self.etapes_prechargement()
+        self.minuteur_prechargement = QTimer(self)
+        self.minuteur_prechargement.timeout.connect(self.precharger_tranche)
+        self.minuteur_prechargement.start(0)
+
+    def precharger_tranche(self):
+        """Avance le préchargement tant que le budget de la tranche n'est pas dépassé"""
+        fin = time.perf_counter() + self.BUDGET_PRECHARGEMENT
+        try:
+            while time.perf_counter() < fin:
+                next(self.prechargement)
+        except StopIteration:
+            self.arreter_prechargement()
+        except Exception as e:
+            print(f"Erreur lors du préchargement: {e}")
+            self.arreter_prechargement()
+
+    def arreter_prechargement(self):
+        """Arrête le préchargement (terminé ou en erreur)"""
+        if self.minuteur_prechargement is not None:
+            self.minuteur_prechargement.stop()
+            self.minuteur_prechargement.deleteLater()
+        self.minuteur_prechargement = None
+        self.prechargement = None
+
+    def etapes_prechargement(self):
+        """Étapes du préchargement, une par yield ; ce que l'utilisateur a déjà ouvert entre-temps est sauté"""
+        from utils.gestion import charger_classes, charger_devoirs, devoirs_de_classe_par_date
+        # Données : lecture du stockage, puis index par classe et par date de la projection
+        classes = charger_classes()
+        yield
+        charger_devoirs()
+        yield
+        for classe in list(classes):
+            devoirs_de_classe_par_date(classe)
+            yield
+        # Écrans : modules, puis pages construites hors de la vue
+        for nom in ("gestion_classes", "gestion_devoirs", "gestion_projection"):
+            importer_ecran(nom)
+            yield
+        self.preparer_page_classes()
+        yield
+        self.preparer_page_devoirs()
+        yield
+        if self.contenu_devoirs is not None:
+            yield from self.contenu_devoirs.preparer_recherche_par_tranches()
     
+    def closeEvent(self, event):
+        """Termine les sauvegardes en attente avant de fermer"""
+        vider_ecritures()
+        super().closeEvent(event)
+
     def create_page_with_back_button(self, content_widget, title):
         """Crée une page avec un bouton retour"""
         page_widget = QWidget()
@@ -194,9 +267,10 @@ class AccueilWindow(QMainWindow):
         """Affiche la page d'accueil"""
         self.stacked_widget.setCurrentWidget(self.page_accueil)
     
-    def show_gestion_classes(self):
-        """Affiche la page de gestion des classes"""
-        if self.page_classes is None and gestion_classes:
+    def preparer_page_classes(self):
+        """Crée la page de gestion des classes si elle n'existe pas encore ; la retourne (None en cas d'erreur)"""
+        gestion_classes = importer_ecran("gestion_classes") if self.page_classes is None else None
+        if gestion_classes:
             try:
                 if hasattr(gestion_classes, 'ClassesWidget'):
                     content = gestion_classes.ClassesWidget(main_window=self)
@@ -206,31 +280,38 @@ class AccueilWindow(QMainWindow):
                     self.stacked_widget.addWidget(self.page_classes)
             except Exception as e:
                 print(f"Erreur lors de la création de la page classes: {e}")
-                return
-        
-        if self.page_classes:
+        return self.page_classes
+
+    def show_gestion_classes(self):
+        """Affiche la page de gestion des classes"""
+        if self.preparer_page_classes():
             self.stacked_widget.setCurrentWidget(self.page_classes)
     
-    def show_gestion_devoirs(self):
-        """Affiche la page de gestion des devoirs"""
-        if self.page_devoirs is None and gestion_devoirs:
+    def preparer_page_devoirs(self):
+        """Crée la page de gestion des devoirs si elle n'existe pas encore ; la retourne (None en cas d'erreur)"""
+        gestion_devoirs = importer_ecran("gestion_devoirs") if self.page_devoirs is None else None
+        if gestion_devoirs:
             try:
                 if hasattr(gestion_devoirs, 'DevoirsWidget'):
                     content = gestion_devoirs.DevoirsWidget()
                     self.page_devoirs = self.create_page_with_back_button(
                         content, "Gestion des Devoirs"
                     )
+                    self.contenu_devoirs = content
                     self.stacked_widget.addWidget(self.page_devoirs)
             except Exception as e:
                 print(f"Erreur lors de la création de la page devoirs: {e}")
-                return
-        
-        if self.page_devoirs:
+        return self.page_devoirs
+
+    def show_gestion_devoirs(self):
+        """Affiche la page de gestion des devoirs"""
+        if self.preparer_page_devoirs():
             self.stacked_widget.setCurrentWidget(self.page_devoirs)
     
     def show_gestion_parametres(self):
         """Affiche la page de gestion des paramètres"""
-        if self.page_parametres is None and gestion_parametres:
+        gestion_parametres = importer_ecran("gestion_parametres") if self.page_parametres is None else None
+        if gestion_parametres:
             try:
                 if hasattr(gestion_parametres, 'ParametresWidget'):
                     content = gestion_parametres.ParametresWidget(main_window=self)
@@ -243,4 +324,37 @@ class AccueilWindow(QMainWindow):
                 return
         
         if self.page_parametres:
-            self.stacked_widget.setCurrentWidget(self.page_parametres)
\ No newline at end of file
+            self.stacked_widget.setCurrentWidget(self.page_parametres)
+
+    def show_selection_projection(self):
+        """Affiche la page de sélection des devoirs à projeter (créée une fois, puis réutilisée)"""
+        if self.page_selection_projection is None:
+            from screens.gestion_projection import ProjectionWidget
+            self.selection_projection = ProjectionWidget(main_window=self)
+            self.page_selection_projection = self.create_page_with_back_button(
+                self.selection_projection, "Projection"
+            )
+            self.stacked_widget.addWidget(self.page_selection_projection)
+        else:
+            # Classes et devoirs ont pu changer depuis le dernier affichage
+            self.selection_projection.charger_classes()
+        self.stacked_widget.setCurrentWidget(self.page_selection_projection)
+
+    def show_projection(self, devoirs, classe_nom):
+        """Projette des devoirs ; la page de la classe est mise à jour sur place si elle est encore gardée"""
+        page_gardee = self.pages_projection.pop(classe_nom, None)
+        if page_gardee is None:
+            from screens.gestion_projection import PageProjection
+            # Libérer les projections les moins récemment affichées
+            while len(self.pages_projection) >= self.PAGES_PROJECTION_MAX:
+                ancienne, _ = self.pages_projection.pop(next(iter(self.pages_projection)))
+                self.stacked_widget.removeWidget(ancienne)
+                ancienne.deleteLater()
+            projection = PageProjection(devoirs, classe_nom, self)
+            page = self.create_page_with_back_button(projection, f"Projection - {classe_nom}")
+            self.stacked_widget.addWidget(page)
+            page_gardee = (page, projection)
+        else:
+            page_gardee[1].definir_devoirs(devoirs, classe_nom)
+        self.pages_projection[classe_nom] = page_gardee  # remise en fin : la plus récemment affichée
+        self.stacked_widget.setCurrentWidget(page_gardee[0])
@@ -0,0 +1,233 @@
+# screens/export_projection.py
+"""Export des projections de toutes les classes en PDF ou en PNG, sans fenêtre.
+
+    python -m screens.export_projection DOSSIER [--format pdf|png] [--du AAAA-MM-JJ] [--au AAAA-MM-JJ]
+
+La mise en page est celle de PageProjection (taille de texte ajustée,
+séances réparties sur plusieurs diapositives si besoin). Chaque classe est
+rendue dans un processus à part (un par cœur). Un manifeste garde
+l'empreinte du contenu exporté pour chaque classe : une classe dont rien
+n'a changé depuis le dernier export n'est pas redessinée.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Ajouter le dossier parent au chemin
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from PySide6.QtCore import Qt, QRect, QMarginsF
+from PySide6.QtGui import (
+    QGuiApplication, QColor, QFont, QFontMetrics, QImage, QPainter, QPen, QPageLayout, QPageSize, QPdfWriter
+)
+
+from models.Devoir import date_vers_ordinal
+from utils.fichiers import ecrire_json_atomique
+from utils.gestion import charger_classes, devoirs_de_classe_par_date
+from screens.gestion_projection import contenu_projection, dessiner_diapositive, mettre_en_page
+
+MANIFESTE = ".projections.json"
+VERSION_RENDU = 1  # à augmenter quand le dessin change : tout sera réexporté
+TAILLE_PNG = (1920, 1080)  # pixels, une image par diapositive
+MARGE_PAGE = 50
+
+
+def _nom_fichier(nom):
+    """Nom de classe utilisable comme nom de fichier"""
+    return re.sub(r'[^\w\-°]+', '_', nom).strip('_') or "classe"
+
+def _empreinte(tache):
+    donnees = json.dumps([VERSION_RENDU, tache["format"], tache["classe"], tache["contenu"]], ensure_ascii=False)
+    return hashlib.sha256(donnees.encode("utf-8")).hexdigest()
+
+def _application():
+    """QGuiApplication du processus (sans affichage si aucune n'existe encore), nécessaire aux polices"""
+    application = QGuiApplication.instance()
+    if application is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        application = QGuiApplication([])
+    return application
+
+def _dessiner_page(painter, largeur, hauteur, classe, contenu, numero, nombre):
+    """Dessine une page complète : titre, trait, diapositive numero et, s'il y en a plusieurs, son numéro"""
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    police_titre = QFont("Arial", 28, QFont.Bold)
+    hauteur_titre = QFontMetrics(police_titre).height()
+    police_page = QFont("Arial", 14)
+    hauteur_pied = QFontMetrics(police_page).height() + 10 if nombre > 1 else 0
+
+    painter.setFont(police_titre)
+    painter.setPen(QColor("#2c3e50"))
+    painter.drawText(QRect(0, MARGE_PAGE // 2, largeur, hauteur_titre), Qt.AlignCenter, f"Devoirs - {classe}")
+    y = MARGE_PAGE // 2 + hauteur_titre + 15
+    painter.setPen(QPen(QColor("#ddd"), 2))
+    painter.drawLine(MARGE_PAGE, y, largeur - MARGE_PAGE, y)
+    y += 20
+
+    painter.save()
+    painter.translate(MARGE_PAGE, y)
+    dessiner_diapositive(painter, contenu, largeur - 2 * MARGE_PAGE, hauteur - y - MARGE_PAGE // 2 - hauteur_pied, numero)
+    painter.restore()
+
+    if nombre > 1:
+        painter.setFont(police_page)
+        painter.setPen(QColor("#666"))
+        painter.drawText(QRect(0, hauteur - MARGE_PAGE // 2 - hauteur_pied, largeur - MARGE_PAGE, hauteur_pied),
+                         Qt.AlignRight | Qt.AlignVCenter, f"{numero + 1} / {nombre}")
+
+def _exporter_classe(tache):
+    """Rend les diapositives d'une classe dans son fichier PDF ou ses images PNG ; retourne les fichiers écrits"""
+    _application()
+
+    classe, contenu, base = tache["classe"], tache["contenu"], tache["base"]
+    fichiers = []
+    if tache["format"] == "pdf":
+        chemin = base + ".pdf"
+        temporaire = chemin + ".tmp"
+        writer = QPdfWriter(temporaire)
+        writer.setTitle(f"Devoirs - {classe}")
+        # Même résolution que les mesures de texte (QFontMetrics) : la mise en page tombe juste
+        writer.setResolution(round(QGuiApplication.primaryScreen().logicalDotsPerInchY()))
+        writer.setPageLayout(QPageLayout(QPageSize(QPageSize.A4), QPageLayout.Landscape, QMarginsF(0, 0, 0, 0)))
+        painter = QPainter(writer)
+        largeur, hauteur = writer.width(), writer.height()
+        nombre = _nombre_diapositives(largeur, hauteur, contenu)
+        for numero in range(nombre):
+            if numero:
+                writer.newPage()
+            _dessiner_page(painter, largeur, hauteur, classe, contenu, numero, nombre)
+        painter.end()
+        os.replace(temporaire, chemin)
+        fichiers.append(chemin)
+    else:
+        largeur, hauteur = TAILLE_PNG
+        nombre = _nombre_diapositives(largeur, hauteur, contenu)
+        for numero in range(nombre):
+            image = QImage(largeur, hauteur, QImage.Format_RGB32)
+            image.fill(QColor("#f0f0f0"))
+            painter = QPainter(image)
+            _dessiner_page(painter, largeur, hauteur, classe, contenu, numero, nombre)
+            painter.end()
+            chemin = f"{base}-{numero + 1}.png"
+            temporaire = chemin + ".tmp.png"
+            image.save(temporaire)
+            os.replace(temporaire, chemin)
+            fichiers.append(chemin)
+    return fichiers
+
+def _nombre_diapositives(largeur, hauteur, contenu):
+    """Nombre de diapositives d'une page de cette taille (la zone de la diapositive dépend de la présence du numéro de page)"""
+    haut = MARGE_PAGE // 2 + QFontMetrics(QFont("Arial", 28, QFont.Bold)).height() + 35
+    largeur_zone = largeur - 2 * MARGE_PAGE
+    nombre = len(mettre_en_page(contenu, largeur_zone, hauteur - haut - MARGE_PAGE // 2)[1])
+    if nombre > 1:
+        # Avec le numéro de page en pied, la zone est un peu plus basse
+        pied = QFontMetrics(QFont("Arial", 14)).height() + 10
+        nombre = len(mettre_en_page(contenu, largeur_zone, hauteur - haut - MARGE_PAGE // 2 - pied)[1])
+    return nombre
+
+def _jour(date):
+    """Numéro de jour d'une date "AAAA-MM-JJ" (None si aucune) ; ValueError si elle est invalide"""
+    if not date:
+        return None
+    jour = date_vers_ordinal(date)
+    if jour is None:
+        raise ValueError(f"Date invalide : {date} (format attendu : AAAA-MM-JJ)")
+    return jour
+
+def _supprimer_anciens(base, format):
+    """Retire les fichiers d'un export précédent de la classe (il pouvait avoir plus de diapositives)"""
+    dossier, nom = os.path.split(base)
+    motif = re.compile(re.escape(nom) + (r"\.pdf$" if format == "pdf" else r"-\d+\.png$"))
+    for fichier in os.listdir(dossier):
+        if motif.match(fichier):
+            os.remove(os.path.join(dossier, fichier))
+
+def exporter_projections(dossier, format="pdf", debut=None, fin=None, processus=None):
+    """Exporte la projection de chaque classe (devoirs du debut au fin inclus, "AAAA-MM-JJ") dans dossier.
+
+    Retourne {"exportees": [...], "inchangees": [...], "vides": [...]} (noms de classes).
+    """
+    if format not in ("pdf", "png"):
+        raise ValueError(f"Format inconnu : {format}")
+    jour_debut = _jour(debut)
+    jour_fin = _jour(fin)
+    os.makedirs(dossier, exist_ok=True)
+
+    chemin_manifeste = os.path.join(dossier, MANIFESTE)
+    try:
+        with open(chemin_manifeste, 'r', encoding='utf-8') as f:
+            manifeste = json.load(f)
+    except (OSError, ValueError):
+        manifeste = {}
+
+    bilan = {"exportees": [], "inchangees": [], "vides": []}
+    taches = []
+    noms_pris = set()
+    for classe in charger_classes():
+        devoirs = [devoir for devoir in devoirs_de_classe_par_date(classe)
+                   if (jour_debut is None or devoir.jour >= jour_debut) and (jour_fin is None or 0 < devoir.jour <= jour_fin)]
+        if not devoirs:
+            bilan["vides"].append(classe.nom)
+            continue
+        nom = _nom_fichier(classe.nom)
+        if nom in noms_pris:
+            nom = f"{nom}-{classe.id}"  # deux classes du même nom
+        noms_pris.add(nom)
+        tache = {"classe": classe.nom, "contenu": contenu_projection(devoirs), "format": format,
+                 "base": os.path.join(dossier, nom)}
+        empreinte = _empreinte(tache)
+        deja_exporte = (os.path.exists(tache["base"] + ".pdf") if format == "pdf"
+                        else os.path.exists(tache["base"] + "-1.png"))
+        cle = f"{nom}.{format}"
+        if manifeste.get(cle) == empreinte and deja_exporte:
+            bilan["inchangees"].append(classe.nom)
+            continue
+        _supprimer_anciens(tache["base"], format)
+        manifeste.pop(cle, None)
+        taches.append((cle, empreinte, tache))
+
+    if taches:
+        processus = processus or os.cpu_count() or 1
+        if processus == 1 or len(taches) == 1:
+            resultats = [_exporter_classe(tache) for _, _, tache in taches]
+        else:
+            # "spawn" : jamais de fork d'un processus où Qt tourne déjà
+            with ProcessPoolExecutor(max_workers=min(processus, len(taches)),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                resultats = list(pool.map(_exporter_classe, [tache for _, _, tache in taches]))
+        for (cle, empreinte, tache), _ in zip(taches, resultats):
+            manifeste[cle] = empreinte
+            bilan["exportees"].append(tache["classe"])
+        ecrire_json_atomique(chemin_manifeste, manifeste)
+    return bilan
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Exporte la projection des devoirs de chaque classe")
+    parser.add_argument("dossier", help="dossier de destination")
+    parser.add_argument("--format", choices=("pdf", "png"), default="pdf")
+    parser.add_argument("--du", dest="debut", help="première date incluse (AAAA-MM-JJ)")
+    parser.add_argument("--au", dest="fin", help="dernière date incluse (AAAA-MM-JJ)")
+    parser.add_argument("--processus", type=int, help="nombre de processus (par défaut, un par cœur)")
+    arguments = parser.parse_args()
+
+    for date in (arguments.debut, arguments.fin):
+        try:
+            _jour(date)
+        except ValueError as e:
+            parser.error(str(e))
+
+    _application()
+    bilan = exporter_projections(arguments.dossier, arguments.format, arguments.debut, arguments.fin, arguments.processus)
+    print(f"Exportées : {', '.join(bilan['exportees']) or 'aucune'}")
+    print(f"Inchangées : {', '.join(bilan['inchangees']) or 'aucune'}")
+    if bilan["vides"]:
+        print(f"Sans devoir sur la période : {', '.join(bilan['vides'])}")
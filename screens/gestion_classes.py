@@ -1,7 +1,8 @@
 # screens/gestion_classes.py - VERSION AMÉLIORÉE AVEC ÉDITION INLINE
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QLineEdit, QPushButton, 
-    QFrame, QLabel, QSpacerItem, QSizePolicy, QColorDialog, QScrollArea, QApplication
+    QFrame, QLabel, QSpacerItem, QSizePolicy, QColorDialog, QScrollArea, QApplication,
+    QMessageBox, QInputDialog
 )
 from PySide6.QtCore import Qt, QTimer, QEvent
 from PySide6.QtGui import QColor, QIntValidator
@@ -12,8 +13,12 @@ import os
 # Ajouter le dossier parent au chemin pour importer utils/gestion.py
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.gestion import charger_classes, sauvegarder_classes
-from models.Classe import Classe
+from utils.gestion import (
+    charger_classes, sauvegarder_classes, creer_classe, renommer_classe,
+    devoirs_de_classe, retirer_classe, restaurer_classe
+)
+from utils.historique import historique
+from screens.theme import cle_couleur, declarer_couleurs, repolir
 
 class ClassesWidget(QWidget):
     """Écran de gestion des classes — partie saisie + liste des classes"""
@@ -157,6 +162,8 @@ class ClassesWidget(QWidget):
         """Charge les classes depuis utils/gestion.py et les affiche"""
         classes = charger_classes()
         self.classes_list = classes
+        # Règles de style de toutes les couleurs, avant de créer les cartes
+        declarer_couleurs(classe.couleur for classe in classes)
 
         # Vider la liste
         for i in reversed(range(self.scroll_layout.count())):
@@ -185,20 +192,14 @@ class ClassesWidget(QWidget):
         
         effectif = int(effectif_text)
         
-        # Créer une nouvelle instance de Classe
-        nouvelle_classe = Classe(nom=nom, effectif=effectif, couleur=self.couleur_selectionnee)
-        
-        # Ajouter à la liste
-        self.classes_list.append(nouvelle_classe)
-        
-        # Sauvegarder dans le fichier JSON
-        sauvegarder_classes(self.classes_list)
-        
-        # Recharger l'affichage
-        self.charger_classes_from_utils()
+        # Créer une nouvelle instance de Classe (ou reprendre celle de devoirs orphelins du même nom)
+        nouvelle_classe = creer_classe(nom=nom, effectif=effectif, couleur=self.couleur_selectionnee)
         
-        # Rafraîchir la page des devoirs si elle existe
-        self.rafraichir_page_devoirs()
+        # Ajouter à la liste, sauvegarder et rafraîchir les écrans
+        position = len(self.classes_list)
+        self.inserer_classe(position, nouvelle_classe)
+        historique.enregistrer(f"Ajout de la classe {nom}", lambda: self.enlever_classe(nouvelle_classe),
+                               lambda: self.inserer_classe(position, nouvelle_classe), nouvelle_classe)
         
         # Réinitialiser les champs
         self.line_nom.clear()
@@ -219,14 +220,95 @@ class ClassesWidget(QWidget):
         """)
 
     def supprimer_classe(self, classe):
-        """Supprime une classe de la liste et sauvegarde"""
-        if classe in self.classes_list:
-            self.classes_list.remove(classe)
-            sauvegarder_classes(self.classes_list)
-            self.charger_classes_from_utils()
-            
-            # Rafraîchir la page des devoirs si elle existe
-            self.rafraichir_page_devoirs()
+        """Supprime une classe ; ses devoirs sont supprimés ou rattachés à une autre classe"""
+        if classe not in self.classes_list:
+            return
+
+        reassigner_a = None
+        nb_devoirs = len(devoirs_de_classe(classe))
+        if nb_devoirs:
+            autres_classes = [c for c in self.classes_list if c is not classe]
+            boite = QMessageBox(self)
+            boite.setIcon(QMessageBox.Warning)
+            boite.setWindowTitle("Supprimer la classe")
+            boite.setText(
+                f"La classe {classe.nom} a {nb_devoirs} devoir(s).\n"
+                "Que faire de ces devoirs ?"
+            )
+            btn_supprimer = boite.addButton("Les supprimer", QMessageBox.DestructiveRole)
+            btn_rattacher = None
+            if autres_classes:
+                btn_rattacher = boite.addButton("Les rattacher à une autre classe", QMessageBox.AcceptRole)
+            boite.addButton("Annuler", QMessageBox.RejectRole)
+            boite.exec()
+
+            choix = boite.clickedButton()
+            if btn_rattacher is not None and choix is btn_rattacher:
+                noms = [c.nom for c in autres_classes]
+                nom, ok = QInputDialog.getItem(self, "Rattacher les devoirs", "Nouvelle classe :", noms, 0, False)
+                if not ok:
+                    return
+                reassigner_a = autres_classes[noms.index(nom)]
+            elif choix is not btn_supprimer:
+                return
+
+        position = self.classes_list.index(classe)
+        elements = self.appliquer_suppression(classe, reassigner_a)
+        historique.enregistrer(
+            f"Suppression de la classe {classe.nom}",
+            lambda: self.annuler_suppression(classe, position, elements, reassigner_a),
+            lambda: self.appliquer_suppression(classe, reassigner_a),
+            elements
+        )
+
+    # ----- Modifications élémentaires (actions, annulation et rétablissement) -----
+
+    def inserer_classe(self, position, classe):
+        """Met une classe dans la liste à cette position, sauvegarde et rafraîchit les écrans"""
+        self.classes_list.insert(position, classe)
+        sauvegarder_classes(self.classes_list)
+        self.charger_classes_from_utils()
+        self.rafraichir_page_devoirs()
+
+    def enlever_classe(self, classe):
+        """Retire de la liste une classe qui vient d'être créée (elle n'a pas de devoirs à elle)"""
+        self.classes_list.remove(classe)
+        sauvegarder_classes(self.classes_list)
+        self.charger_classes_from_utils()
+        self.rafraichir_page_devoirs()
+
+    def appliquer_suppression(self, classe, reassigner_a):
+        """Supprime une classe (ses devoirs avec elle, ou rattachés à reassigner_a) ; retourne ses devoirs et leur position"""
+        elements = retirer_classe(classe, reassigner_a)
+        self.charger_classes_from_utils()
+
+        # Rafraîchir la page des devoirs si elle existe
+        self.rafraichir_page_devoirs()
+        return elements
+
+    def annuler_suppression(self, classe, position, elements, reassigner_a):
+        """Remet une classe supprimée à sa position, avec ses devoirs"""
+        restaurer_classe(classe, position, elements, reassignes=reassigner_a is not None)
+        self.charger_classes_from_utils()
+        self.rafraichir_page_devoirs()
+
+    def modifier_classe(self, classe, valeurs):
+        """Donne de nouvelles valeurs (nom, effectif, couleur) à une classe, sauvegarde et rafraîchit les écrans"""
+        for champ, valeur in valeurs.items():
+            if champ == "nom":
+                renommer_classe(classe, valeur)
+            else:
+                setattr(classe, champ, valeur)
+        sauvegarder_classes(self.classes_list)
+        self.charger_classes_from_utils()
+        self.rafraichir_page_devoirs()
+
+    def historiser_modification(self, classe, anciennes, nouvelles):
+        """Enregistre dans l'historique une modification de classe ({champ: valeur} avant et après)"""
+        if anciennes != nouvelles:
+            historique.enregistrer(f"Modification de la classe {classe.nom}",
+                                   lambda: self.modifier_classe(classe, anciennes),
+                                   lambda: self.modifier_classe(classe, nouvelles), (anciennes, nouvelles))
 
     def rafraichir_page_devoirs(self):
         """Rafraîchit la liste des classes dans la page des devoirs"""
@@ -238,6 +320,8 @@ class ClassesWidget(QWidget):
                     widget = self.main_window.page_devoirs.layout().itemAt(i).widget()
                     if widget and hasattr(widget, 'charger_classes_from_utils'):
                         widget.charger_classes_from_utils()
+                        # Les devoirs partagent les mêmes objets Classe : il suffit de redessiner
+                        widget.rafraichir_cartes()
                         break
 
 
@@ -250,51 +334,9 @@ class ClasseCard(QFrame):
         self.init_ui()
 
     def init_ui(self):
-        # Convertir la couleur de la classe en format CSS avec alpha (transparence)
-        color_map = {
-            "gris": "128, 128, 128",
-            "bleu": "0, 0, 255",
-            "vert": "0, 128, 0",
-            "rouge": "255, 0, 0",
-            "jaune": "255, 255, 0",
-            "orange": "255, 165, 0",
-            "violet": "128, 0, 128",
-            "rose": "255, 192, 203",
-            "noir": "0, 0, 0",
-            "blanc": "255, 255, 255",
-        }
-        
-        # Récupérer les valeurs RGB
-        couleur_classe = self.classe.couleur
-        if couleur_classe.startswith('#'):
-            # Convertir hex en RGB
-            hex_color = couleur_classe.lstrip('#')
-            r = int(hex_color[0:2], 16)
-            g = int(hex_color[2:4], 16)
-            b = int(hex_color[4:6], 16)
-            rgb_values = f"{r}, {g}, {b}"
-        else:
-            rgb_values = color_map.get(couleur_classe.lower(), "128, 128, 128")
-        
-        # Stocker pour le eventFilter
-        self.rgb_values = rgb_values
-        
-        # Style de la carte avec fond coloré (alpha = 0.15 pour une couleur douce)
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: rgba({rgb_values}, 0.15);
-                border-radius: 10px;
-                border: 1px solid rgba({rgb_values}, 0.3);
-                padding: 10px;
-                margin: 5px;
-            }}
-            QLabel {{
-                font-size: 14px;
-                color: #333;
-                padding: 5px;
-                background-color: transparent;
-            }}
-        """)
+        # Style donné par la feuille commune (screens/theme.py) selon la couleur et l'état de la carte
+        self.setProperty("couleur", cle_couleur(self.classe.couleur))
+        self.setProperty("etat", "normal")
 
         # Layout principal (vertical)
         layout = QVBoxLayout()
@@ -309,14 +351,14 @@ class ClasseCard(QFrame):
         # === NOM DE LA CLASSE (éditable) ===
         # Label pour affichage
         self.label_nom = QLabel(f"📚 {self.classe.nom}")
-        self.label_nom.setStyleSheet("font-weight: bold; font-size: 16px;")
+        self.label_nom.setObjectName("nom_classe")
         self.label_nom.setCursor(Qt.PointingHandCursor)
         self.label_nom.mousePressEvent = self.activer_edition_nom
         top_layout.addWidget(self.label_nom)
         
         # Champ d'édition (caché par défaut)
         self.line_edit_nom = QLineEdit(self.classe.nom)
-        self.line_edit_nom.setStyleSheet("font-weight: bold; font-size: 16px; background-color: white; padding: 5px;")
+        self.line_edit_nom.setObjectName("edition_nom_classe")
         self.line_edit_nom.hide()
         self.line_edit_nom.returnPressed.connect(self.sauvegarder_nom)
         self.line_edit_nom.editingFinished.connect(self.sauvegarder_nom)
@@ -325,14 +367,14 @@ class ClasseCard(QFrame):
         # === EFFECTIF (éditable) ===
         # Label pour affichage
         self.label_effectif = QLabel(f"👥 Effectif: {self.classe.effectif}")
-        self.label_effectif.setStyleSheet("font-size: 14px; color: #666;")
+        self.label_effectif.setObjectName("effectif_classe")
         self.label_effectif.setCursor(Qt.PointingHandCursor)
         self.label_effectif.mousePressEvent = self.activer_edition_effectif
         top_layout.addWidget(self.label_effectif)
         
         # Champ d'édition (caché par défaut)
         self.line_edit_effectif = QLineEdit(str(self.classe.effectif))
-        self.line_edit_effectif.setStyleSheet("font-size: 14px; background-color: white; padding: 5px;")
+        self.line_edit_effectif.setObjectName("edition_effectif_classe")
         self.line_edit_effectif.setFixedWidth(100)
         validator = QIntValidator(0, 999, self)
         self.line_edit_effectif.setValidator(validator)
@@ -345,17 +387,8 @@ class ClasseCard(QFrame):
         self.btn_changer_couleur = QPushButton("🎨")
         self.btn_changer_couleur.setFixedSize(35, 35)
         self.btn_changer_couleur.setToolTip("Changer la couleur")
-        self.btn_changer_couleur.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.classe.couleur};
-                border: 2px solid #ddd;
-                border-radius: 8px;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                border: 2px solid #999;
-            }}
-        """)
+        self.btn_changer_couleur.setObjectName("bouton_couleur_classe")
+        self.btn_changer_couleur.setProperty("couleur", cle_couleur(self.classe.couleur))
         self.btn_changer_couleur.clicked.connect(self.changer_couleur)
         top_layout.addWidget(self.btn_changer_couleur)
 
@@ -365,21 +398,7 @@ class ClasseCard(QFrame):
         # Bouton supprimer
         btn_supprimer = QPushButton("🗑️")
         btn_supprimer.setFixedSize(35, 35)
-        btn_supprimer.setStyleSheet("""
-            QPushButton {
-                background-color: white;
-                color: #dc3545;
-                border: 2px solid #dc3545;
-                border-radius: 8px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #ffe6e6;
-            }
-            QPushButton:pressed {
-                background-color: #ffcccc;
-            }
-        """)
+        btn_supprimer.setObjectName("supprimer_classe")
         btn_supprimer.clicked.connect(self.supprimer)
         top_layout.addWidget(btn_supprimer)
 
@@ -405,12 +424,14 @@ class ClasseCard(QFrame):
         nouveau_nom = self.line_edit_nom.text().strip()
         
         if nouveau_nom:
-            self.classe.nom = nouveau_nom
+            ancien_nom = self.classe.nom
+            renommer_classe(self.classe, nouveau_nom)
             self.label_nom.setText(f"📚 {nouveau_nom}")
             
             if self.parent_widget:
                 sauvegarder_classes(self.parent_widget.classes_list)
                 self.parent_widget.rafraichir_page_devoirs()
+                self.parent_widget.historiser_modification(self.classe, {"nom": ancien_nom}, {"nom": nouveau_nom})
         
         self.line_edit_nom.hide()
         self.label_nom.show()
@@ -429,11 +450,14 @@ class ClasseCard(QFrame):
         
         if nouveau_effectif_text:
             nouveau_effectif = int(nouveau_effectif_text)
+            ancien_effectif = self.classe.effectif
             self.classe.effectif = nouveau_effectif
             self.label_effectif.setText(f"👥 Effectif: {nouveau_effectif}")
             
             if self.parent_widget:
                 sauvegarder_classes(self.parent_widget.classes_list)
+                self.parent_widget.historiser_modification(self.classe, {"effectif": ancien_effectif},
+                                                           {"effectif": nouveau_effectif})
         
         self.line_edit_effectif.hide()
         self.label_effectif.show()
@@ -444,53 +468,24 @@ class ClasseCard(QFrame):
         
         if couleur.isValid():
             nouvelle_couleur = couleur.name()
+            ancienne_couleur = self.classe.couleur
             self.classe.couleur = nouvelle_couleur
             
-            # Mettre à jour le style du bouton couleur
-            self.btn_changer_couleur.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {nouvelle_couleur};
-                    border: 2px solid #ddd;
-                    border-radius: 8px;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    border: 2px solid #999;
-                }}
-            """)
-            
-            # Recalculer les valeurs RGB pour le style de la carte
-            hex_color = nouvelle_couleur.lstrip('#')
-            r = int(hex_color[0:2], 16)
-            g = int(hex_color[2:4], 16)
-            b = int(hex_color[4:6], 16)
-            self.rgb_values = f"{r}, {g}, {b}"
-            
-            # Mettre à jour le style de la carte
-            self.restaurer_style_normal()
-            
+            # Mettre à jour la couleur de la carte et du bouton couleur
+            declarer_couleurs([nouvelle_couleur])
+            self.setProperty("couleur", cle_couleur(nouvelle_couleur))
+            self.btn_changer_couleur.setProperty("couleur", cle_couleur(nouvelle_couleur))
+            repolir(self.btn_changer_couleur)
+
             # Sauvegarder
             if self.parent_widget:
                 sauvegarder_classes(self.parent_widget.classes_list)
                 self.parent_widget.rafraichir_page_devoirs()
+                self.parent_widget.historiser_modification(self.classe, {"couleur": ancienne_couleur},
+                                                           {"couleur": nouvelle_couleur})
             
             # Animation de feedback
-            self.setStyleSheet(f"""
-                QFrame {{
-                    background-color: rgba({self.rgb_values}, 0.35);
-                    border-radius: 10px;
-                    border: 2px solid rgba({self.rgb_values}, 0.7);
-                    padding: 10px;
-                    margin: 5px;
-                }}
-                QLabel {{
-                    font-size: 14px;
-                    color: #333;
-                    padding: 5px;
-                    background-color: transparent;
-                }}
-            """)
-            
+            self.definir_etat("flash")
             QTimer.singleShot(300, self.restaurer_style_normal)
 
     def supprimer(self):
@@ -498,44 +493,22 @@ class ClasseCard(QFrame):
         if self.parent_widget:
             self.parent_widget.supprimer_classe(self.classe)
 
+    def definir_etat(self, etat):
+        """Passe la carte dans un état de la feuille commune (normal, survol, flash)"""
+        self.setProperty("etat", etat)
+        # Les libellés ont aussi une bordure à la couleur de l'état
+        repolir(self, self.label_nom, self.label_effectif)
+
     def restaurer_style_normal(self):
         """Restaure le style normal avec la couleur de la classe"""
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: rgba({self.rgb_values}, 0.15);
-                border-radius: 10px;
-                border: 1px solid rgba({self.rgb_values}, 0.3);
-                padding: 10px;
-                margin: 5px;
-            }}
-            QLabel {{
-                font-size: 14px;
-                color: #333;
-                padding: 5px;
-                background-color: transparent;
-            }}
-        """)
+        self.definir_etat("normal")
 
     def eventFilter(self, obj, event):
         if obj == self:
             if event.type() == QEvent.Enter:
                 # Style au survol : couleur plus intense
-                self.setStyleSheet(f"""
-                    QFrame {{
-                        background-color: rgba({self.rgb_values}, 0.25);
-                        border-radius: 10px;
-                        border: 2px solid rgba({self.rgb_values}, 0.5);
-                        padding: 10px;
-                        margin: 5px;
-                    }}
-                    QLabel {{
-                        font-size: 14px;
-                        color: #333;
-                        padding: 5px;
-                        background-color: transparent;
-                    }}
-                """)
+                self.definir_etat("survol")
             elif event.type() == QEvent.Leave:
                 # Style normal
                 self.restaurer_style_normal()
-        return super().eventFilter(obj, event)
\ No newline at end of file
+        return super().eventFilter(obj, event)
@@ -1,34 +1,33 @@
 # screens/gestion_devoirs.py - VERSION AMÉLIORÉE
 from PySide6.QtWidgets import (
-    QWidget, QHBoxLayout, QVBoxLayout, QDateEdit, QComboBox,
-    QLineEdit, QPushButton, QFrame, QLabel, QSpacerItem, QSizePolicy, QScrollArea, QCheckBox, QApplication
+    QWidget, QHBoxLayout, QVBoxLayout, QDateEdit, QComboBox, QLineEdit, QPushButton, QLabel,
+    QApplication, QTableView, QHeaderView, QAbstractItemView, QStyledItemDelegate, QStyle,
+    QStyleOptionViewItem, QInputDialog, QMessageBox, QRubberBand
 )
-from PySide6.QtCore import Qt, QDate, QTimer, QEvent, QMimeData, QPoint, QRect, QPropertyAnimation, QEasingCurve, Property
-from PySide6.QtGui import QColor, QFont, QPalette, QDrag, QPixmap, QPainter, QPen
+from PySide6.QtCore import (
+    Qt, QDate, QTimer, QEvent, QMimeData, QPoint, QRect, QRectF, QSize,
+    QAbstractListModel, QAbstractProxyModel, QModelIndex, QItemSelection, QItemSelectionModel, Signal
+)
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen, QDrag, QPixmap, QKeySequence, QShortcut
 
 import sys
 import os
+from datetime import date as Date
+from itertools import compress
+from operator import attrgetter, itemgetter
 
 # Ajouter le dossier parent au chemin pour importer utils/gestion.py
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.gestion import charger_classes, charger_devoirs, sauvegarder_devoirs
-from models.Devoir import Devoir
-
-
-class DropIndicatorLine(QWidget):
-    """Ligne indicatrice simple qui ne perturbe pas le layout"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setFixedHeight(3)
-        self.setAttribute(Qt.WA_TransparentForMouseEvents)  # Ne capte pas les événements souris
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #4A90E2;
-                border-radius: 1px;
-            }
-        """)
-        self.hide()
+from utils.gestion import (
+    charger_classes, charger_devoirs, sauvegarder_ajout_devoir, sauvegarder_modification_devoir,
+    sauvegarder_suppression_devoir, sauvegarder_deplacement_devoir, sauvegarder_ajout_devoirs,
+    sauvegarder_modification_devoirs, sauvegarder_suppression_devoirs
+)
+from models.Devoir import Devoir, classer_devoirs, STATUTS_TERMINES
+from screens.theme import couleur_classe_qcolor, COULEURS_ECHEANCE
+from utils.historique import historique
+from utils.recherche import IndexRecherche
 
 
 class DevoirsWidget(QWidget):
@@ -37,9 +36,7 @@ class DevoirsWidget(QWidget):
         super().__init__(parent)
         self.classes_list = []
         self.devoirs_list = []
-        self.drop_indicator = None  # Ligne indicatrice
-        self.drop_target_index = -1  # Position cible pour le drop
-        self.current_drag_index = -1  # Index de la carte en cours de drag
+        self.index_recherche = None  # construit à la première recherche
         self.init_ui()
 
     def init_ui(self):
@@ -174,39 +171,89 @@ class DevoirsWidget(QWidget):
         self.btn_tri_manuel.setStyleSheet(style_btn_tri)
 
         tri_layout.addStretch()
+
+        # Recherche (contenu et classe, sans tenir compte des accents)
+        self.champ_recherche = QLineEdit()
+        self.champ_recherche.setPlaceholderText("🔍 Rechercher...")
+        self.champ_recherche.setClearButtonEnabled(True)
+        self.champ_recherche.setFixedSize(250, 35)
+        self.champ_recherche.textChanged.connect(self.rechercher)
+        # L'index est construit dès que le champ prend le focus, avant la première frappe
+        self.champ_recherche.installEventFilter(self)
+        tri_layout.addWidget(self.champ_recherche)
+
         main_layout.addLayout(tri_layout)
 
-        # Zone de scroll pour la liste des devoirs
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
+        # Actions sur la sélection (Maj+clic, Ctrl+clic, ou rectangle tiré depuis
+        # un espace hors des cartes pour sélectionner plusieurs devoirs ; Suppr supprime)
+        self.barre_selection = QWidget()
+        selection_layout = QHBoxLayout(self.barre_selection)
+        selection_layout.setSpacing(10)
+        selection_layout.setContentsMargins(0, 0, 0, 10)
+
+        self.label_selection = QLabel()
+        self.label_selection.setStyleSheet("font-size: 13px; font-weight: bold; color: #333;")
+        selection_layout.addWidget(self.label_selection)
+
+        for texte, action in (("Fait", lambda: self.marquer_selection("Fait")),
+                              ("Pas fait", lambda: self.marquer_selection("Pas fait")),
+                              ("Décaler...", self.decaler_selection),
+                              ("Classe...", self.changer_classe_selection),
+                              ("Supprimer", self.supprimer_selection)):
+            bouton = QPushButton(texte)
+            bouton.setFixedSize(100, 35)
+            bouton.setStyleSheet(style_btn_tri)
+            bouton.clicked.connect(action)
+            selection_layout.addWidget(bouton)
+
+        selection_layout.addStretch()
+        self.barre_selection.hide()
+        main_layout.addWidget(self.barre_selection)
+
+        # Liste des devoirs : un modèle dans l'ordre manuel, une couche de tri
+        # qui fixe l'ordre affiché, et un délégué qui dessine les cartes visibles
+        self.modele = DevoirsModel(self)
+        self.modele.devoir_modifie.connect(self.enregistrer_modification)
+        self.modele.deplacement_demande.connect(self.deplacer_devoir)
+        self.tri = DevoirsTriModel(self)
+        self.tri.setSourceModel(self.modele)
+
+        # Une QTableView à une colonne plutôt qu'une QListView : ses lignes de
+        # hauteur fixe sont gérées par l'en-tête vertical, si bien qu'ajouter,
+        # retirer ou déplacer une ligne ne relance pas la mise en page de
+        # toute la liste (la QListView repositionne chaque ligne).
+        self.vue = DevoirsVue()
+        self.vue.setModel(self.tri)
+        self.delegue = DevoirDelegate(self.vue)
+        self.delegue.suppression_demandee.connect(self.supprimer_devoir)
+        self.vue.setItemDelegate(self.delegue)
+        self.vue.horizontalHeader().hide()
+        self.vue.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.vue.verticalHeader().hide()
+        self.vue.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.vue.verticalHeader().setDefaultSectionSize(DevoirDelegate.HAUTEUR)
+        self.vue.setShowGrid(False)
+        self.vue.setWordWrap(False)
+        self.vue.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.vue.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.vue.setMouseTracking(True)  # survol des cartes
+        self.vue.setEditTriggers(QAbstractItemView.NoEditTriggers)  # l'édition s'ouvre d'un clic sur le contenu
+        self.vue.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.vue.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.vue.setDragDropMode(QAbstractItemView.DragDrop)
+        self.vue.setDefaultDropAction(Qt.MoveAction)
+        self.vue.setDropIndicatorShown(True)
+        self.vue.setStyleSheet("""
+            QTableView {
                 border: none;
                 background-color: transparent;
             }
         """)
-
-        # Conteneur pour la liste des devoirs
-        self.scroll_container = QWidget()
-        self.scroll_container.setAcceptDrops(True)  # Important pour le drop global
-        self.scroll_container.dragEnterEvent = self.container_drag_enter
-        self.scroll_container.dragMoveEvent = self.container_drag_move
-        self.scroll_container.dragLeaveEvent = self.container_drag_leave
-        self.scroll_container.dropEvent = self.container_drop
-        
-        self.scroll_layout = QVBoxLayout()
-        self.scroll_layout.setSpacing(10)
-        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_layout.setAlignment(Qt.AlignTop)
-        self.scroll_container.setLayout(self.scroll_layout)
-        
-        # Créer la ligne indicatrice (overlay qui ne perturbe pas le layout)
-        self.drop_indicator = DropIndicatorLine(self.scroll_container)
-
-        scroll_area.setWidget(self.scroll_container)
-        main_layout.addWidget(scroll_area)
+        main_layout.addWidget(self.vue)
+        self.vue.selectionModel().selectionChanged.connect(self.selection_modifiee)
+        self.tri.modelReset.connect(self.selection_modifiee)  # la sélection est vidée sans signal
+        raccourci = QShortcut(QKeySequence.Delete, self.vue, self.supprimer_selection)
+        raccourci.setContext(Qt.WidgetShortcut)
 
         self.setLayout(main_layout)
 
@@ -229,23 +276,7 @@ class DevoirsWidget(QWidget):
         """Charge les devoirs depuis utils/gestion.py et les affiche dans la liste personnalisée"""
         devoirs = charger_devoirs()
         self.devoirs_list = devoirs
-
-        # Vider la liste
-        for i in reversed(range(self.scroll_layout.count())):
-            item = self.scroll_layout.itemAt(i)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.spacerItem():
-                self.scroll_layout.removeItem(item)
-
-        # Ajouter chaque devoir comme une carte personnalisée
-        for devoir in devoirs:
-            card = DevoirCard(devoir, self)
-            self.scroll_layout.addWidget(card)
-
-        # Ajouter un espaceur à la fin
-        spacer = QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding)
-        self.scroll_layout.addItem(spacer)
+        self.afficher_devoirs(devoirs)
 
     def ajouter_devoir(self):
         """Ajoute un devoir à la liste et sauvegarde"""
@@ -266,17 +297,216 @@ class DevoirsWidget(QWidget):
             statut=statut
         )
         
-        self.devoirs_list.append(nouveau_devoir)
-        sauvegarder_devoirs(self.devoirs_list)
-        self.charger_devoirs_from_utils()
+        elements = [(len(self.devoirs_list), nouveau_devoir)]
+        self.inserer_devoirs(elements)
+        self.historiser_insertion("Ajout d'un devoir", elements)
         self.line_content.clear()
 
     def supprimer_devoir(self, devoir):
         """Supprime un devoir de la liste et sauvegarde"""
-        if devoir in self.devoirs_list:
-            self.devoirs_list.remove(devoir)
-            sauvegarder_devoirs(self.devoirs_list)
-            self.charger_devoirs_from_utils()
+        if devoir in self.devoirs_list:  # recherche par identifiant, sans parcourir la liste
+            elements = self.retirer_devoirs([devoir])
+            self.historiser_retrait("Suppression d'un devoir", elements)
+
+    def enregistrer_modification(self, devoir, anciennes):
+        """Enregistre la modification d'un devoir affiché (statut, contenu), dont anciennes donne les valeurs d'avant"""
+        index = self.devoirs_list.index(devoir)
+        sauvegarder_modification_devoir(self.devoirs_list, index)
+        if self.index_recherche is not None:
+            self.index_recherche.mettre_a_jour(devoir)
+        nouvelles = {champ: getattr(devoir, champ) for champ in anciennes}
+        self.historiser_modification("Modification d'un devoir", [(devoir, anciennes)], [(devoir, nouvelles)])
+
+    # ----- Modifications élémentaires -----
+    # Les actions, leur annulation et leur rétablissement passent toutes par
+    # ces méthodes : une écriture unitaire (ou une seule pour un lot) et une
+    # mise à jour des seules lignes concernées (une réinitialisation de la
+    # vue pour un lot d'ajouts ou de suppressions).
+
+    def inserer_devoirs(self, elements):
+        """Insère des devoirs dans l'ordre manuel ; elements : (position, devoir) par positions croissantes"""
+        for index, devoir in elements:
+            self.devoirs_list.insert(index, devoir)
+        if len(elements) == 1:
+            sauvegarder_ajout_devoir(self.devoirs_list, elements[0][0])
+        else:
+            sauvegarder_ajout_devoirs(self.devoirs_list, [index for index, _ in elements])
+        if self.index_recherche is not None:
+            for _, devoir in elements:
+                self.index_recherche.ajouter(devoir)
+                if self.tri.filtre is not None and self.index_recherche.correspond(self.champ_recherche.text(), devoir):
+                    self.tri.filtre.add(devoir.id)
+        if len(elements) == 1:
+            # Une seule ligne ajoutée : le tri la place à son rang dans l'ordre affiché
+            self.modele.inserer(*elements[0])
+        else:
+            self.modele.definir_devoirs(self.devoirs_list)
+
+    def retirer_devoirs(self, devoirs):
+        """Retire des devoirs de la liste ; retourne leurs (position, devoir) d'avant, par positions croissantes"""
+        elements = sorted(((self.devoirs_list.index(devoir), devoir) for devoir in devoirs), key=itemgetter(0))
+        if len(elements) == 1:
+            index, devoir = elements[0]
+            del self.devoirs_list[index]
+            sauvegarder_suppression_devoir(self.devoirs_list, devoir, index)
+        else:
+            self.devoirs_list.retirer_devoirs(devoirs)
+            sauvegarder_suppression_devoirs(self.devoirs_list, devoirs)
+        if self.index_recherche is not None:
+            for _, devoir in elements:
+                self.index_recherche.retirer(devoir)
+        if len(elements) == 1:
+            self.modele.retirer(elements[0][0])
+        else:
+            # Un seul rafraîchissement de la vue (le filtre de recherche, par identifiants, reste valable)
+            self.modele.definir_devoirs(self.devoirs_list)
+        return elements
+
+    def modifier_champs(self, changements):
+        """Donne de nouvelles valeurs à des champs de devoirs ; changements : (devoir, {champ: valeur})"""
+        for devoir, valeurs in changements:
+            for champ, valeur in valeurs.items():
+                if champ == "classe_objet":
+                    self.devoirs_list.changer_classe(devoir, valeur)  # garde l'index par classe à jour
+                elif champ == "date":
+                    self.devoirs_list.changer_date(devoir, valeur)  # garde l'index par date à jour
+                else:
+                    setattr(devoir, champ, valeur)
+        lignes = sorted(self.devoirs_list.index(devoir) for devoir, _ in changements)
+        if len(lignes) == 1:
+            sauvegarder_modification_devoir(self.devoirs_list, lignes[0])
+        else:
+            sauvegarder_modification_devoirs(self.devoirs_list, lignes)
+        if self.index_recherche is not None:
+            for devoir, valeurs in changements:
+                if "contenu" in valeurs:
+                    self.index_recherche.mettre_a_jour(devoir)
+        self.modele.actualiser(lignes)
+
+    def deplacer_ligne(self, source, destination):
+        """Déplace le devoir de la position source à la position destination de l'ordre manuel"""
+        self.devoirs_list.insert(destination, self.devoirs_list.pop(source))
+        # Sauvegarder (seul le devoir déplacé change de position)
+        sauvegarder_deplacement_devoir(self.devoirs_list, source, destination)
+        # Déplacer la seule ligne concernée
+        self.modele.deplacer(source, destination)
+
+    # ----- Historique (annuler / rétablir) -----
+
+    def historiser_insertion(self, libelle, elements):
+        """Enregistre dans l'historique l'insertion de elements ((position, devoir))"""
+        historique.enregistrer(libelle, lambda: self.retirer_devoirs([devoir for _, devoir in elements]),
+                               lambda: self.inserer_devoirs(elements), elements)
+
+    def historiser_retrait(self, libelle, elements):
+        """Enregistre dans l'historique le retrait de elements ((position, devoir) d'avant)"""
+        historique.enregistrer(libelle, lambda: self.inserer_devoirs(elements),
+                               lambda: self.retirer_devoirs([devoir for _, devoir in elements]), elements)
+
+    def historiser_modification(self, libelle, anciens, nouveaux):
+        """Enregistre dans l'historique une modification de champs ((devoir, {champ: valeur}) avant et après)"""
+        historique.enregistrer(libelle, lambda: self.modifier_champs(anciens),
+                               lambda: self.modifier_champs(nouveaux), (anciens, nouveaux))
+
+    # ----- Actions sur la sélection -----
+    # Chaque action modifie tous les devoirs sélectionnés en un passage, les
+    # enregistre en une seule écriture et ne prévient la vue qu'une fois.
+
+    def lignes_selectionnees(self):
+        """Lignes (dans l'ordre manuel, triées) des devoirs sélectionnés"""
+        # Par plages de lignes affichées : selectedRows() interrogerait le modèle ligne par ligne
+        plages = ((plage.top(), plage.bottom()) for plage in self.vue.selectionModel().selection())
+        return sorted(set().union(*(self.tri.lignes_source(haut, bas) for haut, bas in plages)))
+
+    def devoirs_selectionnes(self):
+        """Devoirs sélectionnés dans la liste (dans l'ordre manuel)"""
+        return [self.modele.devoirs[ligne] for ligne in self.lignes_selectionnees()]
+
+    def selection_modifiee(self):
+        """Affiche la barre d'actions quand plusieurs devoirs sont sélectionnés"""
+        nombre = sum(plage.height() for plage in self.vue.selectionModel().selection())
+        if nombre > 1:
+            self.label_selection.setText(f"{nombre} devoirs sélectionnés :")
+        self.barre_selection.setVisible(nombre > 1)
+
+    def modifier_selection(self, libelle, valeurs):
+        """Donne à chaque devoir sélectionné les valeurs valeurs(devoir) ({champ: valeur}, vide : inchangé)"""
+        nouveaux = [(devoir, valeurs(devoir)) for devoir in self.devoirs_selectionnes()]
+        nouveaux = [(devoir, champs) for devoir, champs in nouveaux if champs]
+        if not nouveaux:
+            return
+        anciens = [(devoir, {champ: getattr(devoir, champ) for champ in champs}) for devoir, champs in nouveaux]
+        self.modifier_champs(nouveaux)
+        self.historiser_modification(libelle, anciens, nouveaux)
+
+    def marquer_selection(self, statut):
+        """Donne ce statut aux devoirs sélectionnés"""
+        self.modifier_selection(f"Statut « {statut} »", lambda devoir: {"statut": statut})
+
+    def decaler_selection(self):
+        """Décale la date des devoirs sélectionnés d'un nombre de jours demandé"""
+        jours, ok = QInputDialog.getInt(self, "Décaler les devoirs", "Nombre de jours (négatif pour avancer) :",
+                                        7, -365, 365)
+        if not ok or not jours:
+            return
+        def decaler(devoir):
+            if not devoir.jour:  # date illisible : laissée telle quelle
+                return {}
+            return {"date": Date.fromordinal(devoir.jour + jours).isoformat()}
+        self.modifier_selection("Décalage des dates", decaler)
+
+    def changer_classe_selection(self):
+        """Rattache les devoirs sélectionnés à une autre classe"""
+        if not self.classes_list:
+            return
+        nom, ok = QInputDialog.getItem(self, "Changer de classe", "Nouvelle classe :",
+                                       [classe.nom for classe in self.classes_list], 0, False)
+        if not ok:
+            return
+        classe = next(classe for classe in self.classes_list if classe.nom == nom)
+        self.modifier_selection("Changement de classe", lambda devoir: {"classe_objet": classe})
+
+    def supprimer_selection(self):
+        """Supprime les devoirs sélectionnés (après confirmation s'il y en a plusieurs)"""
+        devoirs = self.devoirs_selectionnes()
+        if not devoirs:
+            return
+        if len(devoirs) > 1:
+            reponse = QMessageBox.question(self, "Supprimer les devoirs",
+                                           f"Supprimer les {len(devoirs)} devoirs sélectionnés ?",
+                                           QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reponse != QMessageBox.Yes:
+                return
+        elements = self.retirer_devoirs(devoirs)
+        self.historiser_retrait(f"Suppression de {len(devoirs)} devoirs" if len(devoirs) > 1
+                                else "Suppression d'un devoir", elements)
+
+    def eventFilter(self, obj, event):
+        if obj is self.champ_recherche and event.type() == QEvent.FocusIn:
+            self.preparer_recherche()
+        return super().eventFilter(obj, event)
+
+    def preparer_recherche(self):
+        """Construit l'index de recherche s'il n'existe pas encore"""
+        if self.index_recherche is None:
+            self.index_recherche = IndexRecherche(self.devoirs_list)
+        return self.index_recherche
+
+    def preparer_recherche_par_tranches(self):
+        """Construit l'index de recherche par tranches (générateur, pour le préchargement)"""
+        if self.index_recherche is not None:
+            return
+        index = IndexRecherche(self.devoirs_list, differe=True)
+        yield from index.indexer_par_tranches()
+        # Entre-temps, une recherche a pu construire son propre index, ou la liste a pu être remplacée
+        if self.index_recherche is None and index.devoirs is self.devoirs_list:
+            self.index_recherche = index
+
+    def rechercher(self, texte):
+        """N'affiche que les devoirs qui correspondent à la recherche (tous si elle est vide)"""
+        ids = self.preparer_recherche().rechercher(texte) if texte.strip() else None
+        if ids is not None or self.tri.filtre is not None:
+            self.tri.filtrer(ids)
 
     def trier_par_date(self):
         """Trie les devoirs par date (tri visuel uniquement, non sauvegardé)"""
@@ -288,11 +518,10 @@ class DevoirsWidget(QWidget):
             self.trier_manuel()
             return
         
-        devoirs_tries = sorted(self.devoirs_list, key=lambda d: d.date)
-        self.afficher_devoirs(devoirs_tries)
+        self.appliquer_tri(("date",))
 
     def trier_par_classe(self):
-        """Trie les devoirs par classe (tri visuel uniquement, non sauvegardé)"""
+        """Trie les devoirs par classe, puis par date (tri visuel uniquement, non sauvegardé)"""
         self.btn_tri_date.setChecked(False)
         self.btn_tri_manuel.setChecked(False)
         
@@ -301,538 +530,775 @@ class DevoirsWidget(QWidget):
             self.trier_manuel()
             return
         
-        devoirs_tries = sorted(self.devoirs_list, key=lambda d: d.classe_objet.nom)
-        self.afficher_devoirs(devoirs_tries)
+        self.appliquer_tri(("classe", "date"))
 
     def trier_manuel(self):
         """Revient à l'ordre manuel (celui du fichier JSON)"""
         self.btn_tri_date.setChecked(False)
         self.btn_tri_classe.setChecked(False)
         self.btn_tri_manuel.setChecked(True)
-        self.charger_devoirs_from_utils()
+        # La liste en mémoire est déjà dans l'ordre manuel : inutile de relire le fichier
+        self.appliquer_tri(())
+
+    def appliquer_tri(self, criteres):
+        """Réordonne les lignes affichées selon les critères de CRITERES_TRI (() : ordre manuel)"""
+        self.tri.trier(criteres)
+        # Réordonner à la souris n'a de sens que dans l'ordre manuel
+        self.vue.setDragEnabled(not criteres)
+
+    def rafraichir_cartes(self):
+        """Redessine les cartes dans l'ordre affiché (classes modifiées ou supprimées), sans relire les données"""
+        self.afficher_devoirs(self.devoirs_list)
 
     def afficher_devoirs(self, devoirs):
-        """Affiche une liste de devoirs (sans sauvegarder)"""
-        # Vider la liste
-        for i in reversed(range(self.scroll_layout.count())):
-            item = self.scroll_layout.itemAt(i)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.spacerItem():
-                self.scroll_layout.removeItem(item)
-
-        # Ajouter chaque devoir comme une carte personnalisée
-        for devoir in devoirs:
-            card = DevoirCard(devoir, self)
-            self.scroll_layout.addWidget(card)
-
-        # Ajouter un espaceur à la fin
-        spacer = QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding)
-        self.scroll_layout.addItem(spacer)
+        """Affiche une liste de devoirs dans l'ordre manuel, triée ensuite selon le tri choisi (sans sauvegarder)"""
+        self.index_recherche = None  # à reconstruire pour la nouvelle liste
+        self.modele.definir_devoirs(devoirs)
+        if self.champ_recherche.text().strip():
+            self.rechercher(self.champ_recherche.text())
 
     def ouvrir_projection(self):
         """Ouvre la page de projection"""
-        from screens.gestion_projection import ProjectionWidget
-        
         if hasattr(self, 'parent') and self.parent():
             main_window = self.parent()
             while main_window.parent():
                 main_window = main_window.parent()
-            
-            page_projection = ProjectionWidget(main_window=main_window)
-            page_complete = main_window.create_page_with_back_button(
-                page_projection, 
-                "Projection"
-            )
-            main_window.stacked_widget.addWidget(page_complete)
-            main_window.stacked_widget.setCurrentWidget(page_complete)
-
-    def show_drop_indicator(self, y_position):
-        """Affiche la ligne indicatrice à la position Y donnée"""
-        if self.drop_indicator:
-            self.drop_indicator.move(0, y_position)
-            self.drop_indicator.setFixedWidth(self.scroll_container.width())
-            self.drop_indicator.show()
-            self.drop_indicator.raise_()  # Mettre au premier plan
-
-    def hide_drop_indicator(self):
-        """Cache la ligne indicatrice"""
-        if self.drop_indicator:
-            self.drop_indicator.hide()
-
-    def get_drop_position(self, y_pos):
-        """Calcule la position Y où afficher la ligne et l'index de drop"""
-        local_y = y_pos
-        
-        # Chercher entre quelles cartes on doit insérer
-        for i in range(self.scroll_layout.count()):
-            item = self.scroll_layout.itemAt(i)
-            if item.widget() and isinstance(item.widget(), DevoirCard):
-                widget = item.widget()
-                widget_y = widget.y()
-                widget_height = widget.height()
-                widget_center = widget_y + widget_height / 2
-                
-                # Si on est au-dessus du centre, insérer avant
-                if local_y < widget_center:
-                    self.drop_target_index = i
-                    return widget_y - 5  # Position de la ligne juste au-dessus
-        
-        # Si on arrive ici, insérer à la fin
-        # Trouver la dernière carte
-        for i in reversed(range(self.scroll_layout.count())):
-            item = self.scroll_layout.itemAt(i)
-            if item.widget() and isinstance(item.widget(), DevoirCard):
-                widget = item.widget()
-                self.drop_target_index = i + 1
-                return widget.y() + widget.height() + 5  # Position après la dernière carte
-        
-        # Aucune carte trouvée
-        self.drop_target_index = 0
-        return 0
-
-    def container_drag_enter(self, event):
-        """Gère l'entrée du drag dans le conteneur"""
-        if event.mimeData().hasText():
-            event.acceptProposedAction()
-
-    def container_drag_move(self, event):
-        """Gère le mouvement du drag dans le conteneur"""
-        if event.mimeData().hasText():
-            # Calculer la position de drop
-            local_pos = event.position().toPoint()
-            y_position = self.get_drop_position(local_pos.y())
-            
-            # Afficher la ligne indicatrice
-            self.show_drop_indicator(y_position)
-            
-            event.acceptProposedAction()
-
-    def container_drag_leave(self, event):
-        """Gère la sortie du drag du conteneur"""
-        self.hide_drop_indicator()
-        self.drop_target_index = -1
-
-    def container_drop(self, event):
-        """Gère le drop dans le conteneur"""
-        if event.mimeData().hasText():
-            source_index = int(event.mimeData().text())
-            
-            # Cacher l'indicateur
-            self.hide_drop_indicator()
-            
-            if self.drop_target_index < 0:
-                # Pas de position cible, abandon
-                event.acceptProposedAction()
-                return
-            
-            # Calculer le vrai index dans devoirs_list
-            # Compter combien de DevoirCard il y a avant la position cible
-            real_target_index = 0
-            for i in range(self.drop_target_index):
-                item = self.scroll_layout.itemAt(i)
-                if item.widget() and isinstance(item.widget(), DevoirCard):
-                    real_target_index += 1
-            
-            if source_index != real_target_index:
-                # Réorganiser la liste
-                devoir_deplace = self.devoirs_list.pop(source_index)
-                
-                # Ajuster l'index si nécessaire
-                if real_target_index > source_index:
-                    real_target_index -= 1
-                
-                self.devoirs_list.insert(real_target_index, devoir_deplace)
-                
-                # Sauvegarder
-                sauvegarder_devoirs(self.devoirs_list)
-                
-                # Recharger
-                self.charger_devoirs_from_utils()
-            
-            self.drop_target_index = -1
-            event.acceptProposedAction()
-
-
-class DevoirCard(QFrame):
-    """Widget personnalisé pour afficher un devoir sous forme de carte - VERSION AMÉLIORÉE"""
-    def __init__(self, devoir, parent_widget=None):
-        super().__init__()
-        self.devoir = devoir
-        self.parent_widget = parent_widget
-        self.setAcceptDrops(False)  # IMPORTANT : ne pas accepter les drops sur les cartes individuelles !
-        self.drag_start_position = None
-        self.is_being_dragged = False
-        self.init_ui()
 
-    def init_ui(self):
-        # Convertir la couleur de la classe
-        color_map = {
-            "gris": "128, 128, 128",
-            "bleu": "0, 0, 255",
-            "vert": "0, 128, 0",
-            "rouge": "255, 0, 0",
-            "jaune": "255, 255, 0",
-            "orange": "255, 165, 0",
-            "violet": "128, 0, 128",
-            "rose": "255, 192, 203",
-            "noir": "0, 0, 0",
-            "blanc": "255, 255, 255",
-        }
-        
-        couleur_classe = self.devoir.classe_objet.couleur
-        if couleur_classe.startswith('#'):
-            hex_color = couleur_classe.lstrip('#')
-            r = int(hex_color[0:2], 16)
-            g = int(hex_color[2:4], 16)
-            b = int(hex_color[4:6], 16)
-            rgb_values = f"{r}, {g}, {b}"
-        else:
-            rgb_values = color_map.get(couleur_classe.lower(), "128, 128, 128")
-        
-        self.rgb_values = rgb_values  # Stocker pour réutilisation
-        
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: rgba({rgb_values}, 0.15);
-                border-radius: 10px;
-                border: 1px solid rgba({rgb_values}, 0.3);
-                padding: 10px;
-                margin: 5px;
-            }}
-            QLabel {{
-                font-size: 14px;
-                color: #333;
-                padding: 5px;
-                background-color: transparent;
-            }}
-        """)
+            # Une seule page de sélection, réutilisée d'une ouverture à l'autre
+            main_window.show_selection_projection()
 
-        # Layout principal
-        layout = QVBoxLayout()
-        layout.setSpacing(0)
-        layout.setContentsMargins(0, 0, 0, 0)
+    def deplacer_devoir(self, id_devoir, devoir_cible):
+        """Place le devoir id_devoir juste avant devoir_cible (à la fin si None) dans l'ordre manuel"""
+        devoir_deplace = self.devoirs_list.devoir_par_id(id_devoir)
+        if devoir_deplace is None or devoir_cible is devoir_deplace:
+            return
 
-        # Ligne principale
-        top_layout = QHBoxLayout()
-        top_layout.setSpacing(10)
-        top_layout.setContentsMargins(5, 5, 5, 5)
+        # Index dans devoirs_list, retrouvés par identifiant sans parcourir la liste
+        source_index = self.devoirs_list.index(devoir_deplace)
+        if devoir_cible is None:
+            real_target_index = len(self.devoirs_list)
+        else:
+            real_target_index = self.devoirs_list.index(devoir_cible)
 
-        # Case à cocher
-        self.checkbox = QCheckBox()
-        self.checkbox.setFixedSize(30, 30)
-        self.checkbox.setStyleSheet("""
-            QCheckBox::indicator {
-                width: 25px;
-                height: 25px;
-                border-radius: 5px;
-                border: 2px solid #4A90E2;
-            }
-            QCheckBox::indicator:unchecked {
-                background-color: white;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #28a745;
-                border-color: #28a745;
-            }
-        """)
-        if self.devoir.statut in ["Fait", "Terminé"]:
-            self.checkbox.setChecked(True)
-        self.checkbox.stateChanged.connect(self.changer_statut)
-        top_layout.addWidget(self.checkbox)
+        # Ajuster l'index si nécessaire
+        if real_target_index > source_index:
+            real_target_index -= 1
+        if real_target_index == source_index:
+            return
 
-        # Classe
-        label_classe = QLabel(f"📚 {self.devoir.classe_objet.nom}")
-        label_classe.setStyleSheet("font-weight: bold; font-size: 14px;")
-        top_layout.addWidget(label_classe)
+        self.deplacer_ligne(source_index, real_target_index)
+        historique.enregistrer("Déplacement d'un devoir", lambda: self.deplacer_ligne(real_target_index, source_index),
+                               lambda: self.deplacer_ligne(source_index, real_target_index),
+                               (source_index, real_target_index))
 
-        # Date
-        date_affichage = self.devoir.date
-        try:
-            from datetime import datetime
-            date_obj = datetime.strptime(self.devoir.date, "%Y-%m-%d")
-            date_affichage = date_obj.strftime("%d-%m-%Y")
-        except:
-            pass
-        
-        label_date = QLabel(f"📅 {date_affichage}")
-        label_date.setStyleSheet("font-size: 13px; color: #666;")
-        top_layout.addWidget(label_date)
 
-        # Contenu
-        self.label_contenu = QLabel(self.devoir.contenu)
-        self.label_contenu.setWordWrap(True)
-        self.label_contenu.setStyleSheet("font-size: 14px; color: #333;")
-        self.label_contenu.setCursor(Qt.PointingHandCursor)
-        self.label_contenu.mousePressEvent = self.activer_edition_contenu
-        top_layout.addWidget(self.label_contenu, 1)
-        
-        # Champ d'édition
-        self.line_edit_contenu = QLineEdit(self.devoir.contenu)
-        self.line_edit_contenu.setStyleSheet("font-size: 14px; color: #333;")
-        self.line_edit_contenu.hide()
-        self.line_edit_contenu.returnPressed.connect(self.sauvegarder_contenu)
-        self.line_edit_contenu.editingFinished.connect(self.sauvegarder_contenu)
-        top_layout.addWidget(self.line_edit_contenu, 1)
+class DevoirsModel(QAbstractListModel):
+    """Devoirs de la liste dans l'ordre manuel, avec leur état d'échéance (l'ordre affiché est celui de DevoirsTriModel)"""
+    RoleDevoir = Qt.UserRole + 1
+    RoleEtat = Qt.UserRole + 2
 
-        # Statut
-        self.label_statut = QLabel(self.devoir.statut)
-        self.label_statut.setObjectName("statut")
-        if self.devoir.statut == "Terminé" or self.devoir.statut == "Fait":
-            self.label_statut.setStyleSheet("font-weight: bold; padding: 5px 10px; border-radius: 5px; background-color: #28a745; color: white;")
-        elif self.devoir.statut == "En cours":
-            self.label_statut.setStyleSheet("font-weight: bold; padding: 5px 10px; border-radius: 5px; background-color: #ffc107; color: #333;")
+    devoir_modifie = Signal(object, object)  # devoir dont le contenu ou le statut a changé depuis la liste, anciennes valeurs
+    deplacement_demande = Signal(int, object)  # id du devoir déposé, devoir devant lequel l'insérer (None = à la fin)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.devoirs = []
+        self.etats = []
+
+    def definir_devoirs(self, devoirs):
+        """Remplace les devoirs affichés (états d'échéance calculés en une fois)"""
+        self.beginResetModel()
+        self.devoirs = list(devoirs)
+        self.etats = classer_devoirs(self.devoirs)
+        self.endResetModel()
+
+    def inserer(self, ligne, devoir):
+        """Affiche un nouveau devoir à la ligne donnée"""
+        self.beginInsertRows(QModelIndex(), ligne, ligne)
+        self.devoirs.insert(ligne, devoir)
+        self.etats.insert(ligne, classer_devoirs([devoir])[0])
+        self.endInsertRows()
+
+    def retirer(self, ligne):
+        """Retire la ligne d'un devoir supprimé"""
+        self.beginRemoveRows(QModelIndex(), ligne, ligne)
+        del self.devoirs[ligne]
+        del self.etats[ligne]
+        self.endRemoveRows()
+
+    def actualiser(self, lignes):
+        """Prévient la vue, en une fois, que les devoirs de ces lignes (triées) ont été modifiés"""
+        if not lignes:
+            return
+        for ligne, etat in zip(lignes, classer_devoirs([self.devoirs[ligne] for ligne in lignes])):
+            self.etats[ligne] = etat
+        self.dataChanged.emit(self.index(lignes[0]), self.index(lignes[-1]))
+
+    def deplacer(self, source, destination):
+        """Déplace une ligne pour qu'elle se retrouve à la position destination"""
+        # Qt attend la position d'insertion avant le retrait de la ligne
+        if not self.beginMoveRows(QModelIndex(), source, source, QModelIndex(),
+                                  destination + 1 if destination > source else destination):
+            return
+        self.devoirs.insert(destination, self.devoirs.pop(source))
+        self.etats.insert(destination, self.etats.pop(source))
+        self.endMoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.devoirs)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        devoir = self.devoirs[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole):
+            return devoir.contenu
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if devoir.statut in STATUTS_TERMINES else Qt.Unchecked
+        if role == self.RoleDevoir:
+            return devoir
+        if role == self.RoleEtat:
+            return self.etats[index.row()]
+        return None
+
+    def setData(self, index, valeur, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        devoir = self.devoirs[index.row()]
+        if role == Qt.EditRole:
+            contenu = valeur.strip()
+            if not contenu or contenu == devoir.contenu:
+                return False
+            anciennes = {"contenu": devoir.contenu}
+            devoir.contenu = contenu
+        elif role == Qt.CheckStateRole:
+            anciennes = {"statut": devoir.statut}
+            devoir.statut = "Fait" if Qt.CheckState(valeur) == Qt.Checked else "Pas fait"
+            self.etats[index.row()] = classer_devoirs([devoir])[0]
         else:
-            self.label_statut.setStyleSheet("font-weight: bold; padding: 5px 10px; border-radius: 5px; background-color: #dc3545; color: white;")
+            return False
+        self.dataChanged.emit(index, index)
+        self.devoir_modifie.emit(devoir, anciennes)
+        return True
 
-        top_layout.addWidget(self.label_statut)
+    FLAGS_CARTE = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemIsDragEnabled
 
-        # Bouton supprimer
-        btn_supprimer = QPushButton("🗑️")
-        btn_supprimer.setFixedSize(35, 35)
-        btn_supprimer.setStyleSheet("""
-            QPushButton {
-                background-color: white;
-                color: #dc3545;
-                border: 2px solid #dc3545;
-                border-radius: 8px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #ffe6e6;
-            }
-            QPushButton:pressed {
-                background-color: #ffcccc;
-            }
-        """)
-        btn_supprimer.clicked.connect(self.supprimer)
-        top_layout.addWidget(btn_supprimer)
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled  # on dépose entre les cartes, jamais sur une carte
+        return self.FLAGS_CARTE
 
-        layout.addLayout(top_layout)
-        self.setLayout(layout)
+    def mimeTypes(self):
+        return ["text/plain"]
 
-        self.setMouseTracking(True)
-        self.installEventFilter(self)
+    def mimeData(self, indexes):
+        mime_data = QMimeData()
+        # Stocker l'identifiant du devoir (stable même si la liste est triée)
+        mime_data.setText(str(self.devoirs[indexes[0].row()].id))
+        return mime_data
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if not data.hasText() or not data.text().isdigit():
+            return False
+        cible = self.devoirs[row] if 0 <= row < len(self.devoirs) else None
+        self.deplacement_demande.emit(int(data.text()), cible)
+        # Le déplacement est fait par DevoirsWidget : la vue n'a pas de lignes à retirer
+        return False
+
+class DevoirsVue(QTableView):
+    """Vue de la liste des devoirs, dont le glisser-déposer montre l'aperçu de la carte déplacée.
+
+    Le point de dépôt est trouvé par la vue elle-même : les lignes ayant
+    toutes la même hauteur, l'en-tête vertical retrouve la ligne sous le
+    curseur sans parcourir la liste. Un appui hors des cartes (marges,
+    espace vide) ouvre un rectangle de sélection : glisser sur une carte
+    la déplace.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.position_appui = QPoint()
+        self.elastique = None  # rectangle de sélection en cours
+        self.ancre_elastique = 0  # ordonnée de l'appui, dans la liste entière
+        self.selection_initiale = QItemSelection()  # gardée avec Ctrl
 
     def mousePressEvent(self, event):
-        """Démarre le drag & drop"""
-        if event.button() == Qt.LeftButton:
-            widget_under_mouse = QApplication.widgetAt(event.globalPosition().toPoint())
-            if widget_under_mouse in [self.checkbox, self.label_contenu, self.line_edit_contenu]:
-                super().mousePressEvent(event)
-                return
-            if isinstance(widget_under_mouse, QPushButton):
-                super().mousePressEvent(event)
-                return
-                
-            self.drag_start_position = event.pos()
+        self.position_appui = event.position().toPoint()
+        index = self.indexAt(self.position_appui)
+        hors_carte = (not index.isValid() or
+                      not self.itemDelegate().zones(self.visualRect(index))["carte"].contains(self.position_appui))
+        if event.button() == Qt.LeftButton and hors_carte:
+            self.ancre_elastique = self.position_appui.y() + self.verticalOffset()
+            self.selection_initiale = (self.selectionModel().selection()
+                                       if event.modifiers() & Qt.ControlModifier else QItemSelection())
+            self.elastique = QRubberBand(QRubberBand.Rectangle, self.viewport())
+            self.elastique.setGeometry(QRect(self.position_appui, QSize()))
+            self.elastique.show()
+            self.selectionModel().select(self.selection_initiale, QItemSelectionModel.ClearAndSelect)
+            return
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event):
-        """Gère le déplacement pendant le drag - VERSION AMÉLIORÉE"""
-        if not (event.buttons() & Qt.LeftButton):
+        if self.elastique is None:
+            return super().mouseMoveEvent(event)
+        position = event.position().toPoint()
+        debut = QPoint(self.position_appui.x(), self.ancre_elastique - self.verticalOffset())
+        self.elastique.setGeometry(QRect(debut, position).normalized())
+        # Lignes de hauteur fixe : celles couvertes se déduisent des ordonnées
+        haut, bas = sorted((self.ancre_elastique, position.y() + self.verticalOffset()))
+        hauteur = self.verticalHeader().defaultSectionSize()
+        premiere, derniere = max(haut // hauteur, 0), min(bas // hauteur, self.model().rowCount() - 1)
+        selection = QItemSelection(self.selection_initiale)
+        if premiere <= derniere:
+            selection.merge(QItemSelection(self.model().index(premiere, 0), self.model().index(derniere, 0)),
+                            QItemSelectionModel.Select)
+        self.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+
+    def mouseReleaseEvent(self, event):
+        if self.elastique is None:
+            return super().mouseReleaseEvent(event)
+        self.elastique.hide()
+        self.elastique.deleteLater()
+        self.elastique = None
+
+    def startDrag(self, actions):
+        index = self.currentIndex()  # la carte sous l'appui, même si d'autres sont sélectionnées
+        if not index.isValid():
             return
-        if self.drag_start_position is None:
+        delegue = self.itemDelegate()
+        rect = self.visualRect(index)
+
+        drag = QDrag(self)
+        drag.setMimeData(self.model().mimeData([index]))
+        drag.setPixmap(delegue.apercu_glisser(index, rect.size()))
+        drag.setHotSpot(self.position_appui - rect.topLeft() + QPoint(delegue.MARGE_OMBRE, delegue.MARGE_OMBRE))
+
+        # La carte déplacée reste en place, estompée, jusqu'au dépôt
+        delegue.glisse_id = index.data(DevoirsModel.RoleDevoir).id
+        self.viewport().update()
+        drag.exec(Qt.MoveAction)
+        delegue.glisse_id = None
+        self.viewport().update()
+
+
+# Critères de tri de la liste ; un tri composé les enchaîne, ex. ("classe", "date")
+CRITERES_TRI = {
+    "date": lambda devoir: devoir.jour,
+    "classe": lambda devoir: devoir.classe_objet.nom,
+}
+# Colonnes tenues par DevoirsTriModel : les clés de tri, et l'identifiant pour le filtre
+_COLONNES = dict(CRITERES_TRI, id=attrgetter("id"))
+
+
+class DevoirsTriModel(QAbstractProxyModel):
+    """Ordre d'affichage (trié et/ou filtré) des lignes de DevoirsModel.
+
+    Sans tri ni filtre, les lignes affichées sont celles de la source. Sinon,
+    on tient la correspondance ligne affichée -> ligne source : changer de
+    tri réordonne les lignes en place (layoutChanged) sans recréer la vue.
+    Les clés de chaque critère sont calculées une fois et gardées dans une
+    colonne alignée sur les lignes source, tenue à jour aux ajouts, retraits
+    et déplacements ; l'ordre obtenu pour chaque tri est gardé tant que la
+    liste ne change pas. Un devoir ajouté est placé à son rang par recherche
+    dichotomique.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.criteres = ()
+        self.filtre = None  # identifiants des devoirs à afficher (None : tous)
+        self._colonnes = {}  # critère -> clé de chaque ligne source
+        self._ordres = {}  # critères -> correspondance déjà calculée (liste inchangée depuis)
+        self._lignes = None  # ligne affichée -> ligne source (None : mêmes lignes que la source)
+
+    def setSourceModel(self, source):
+        super().setSourceModel(source)
+        source.rowsAboutToBeInserted.connect(self._avant_insertion)
+        source.rowsInserted.connect(self._apres_insertion)
+        source.rowsAboutToBeRemoved.connect(self._avant_retrait)
+        source.rowsRemoved.connect(self._apres_retrait)
+        source.rowsAboutToBeMoved.connect(self._avant_deplacement)
+        source.rowsMoved.connect(self._apres_deplacement)
+        source.modelAboutToBeReset.connect(self.beginResetModel)
+        source.modelReset.connect(self._apres_reinitialisation)
+        source.dataChanged.connect(self._donnees_modifiees)
+
+    # ----- Tri et filtre -----
+
+    def trier(self, criteres):
+        """Réordonne les lignes selon les critères de CRITERES_TRI (() : ordre de la source)"""
+        criteres = tuple(criteres)
+        if criteres == self.criteres:
             return
-        
-        # Distance de déclenchement réduite pour plus de réactivité  
-        if (event.pos() - self.drag_start_position).manhattanLength() < 10:
+        if self._lignes is not None:
+            self._ordres[self.criteres] = self._lignes
+        self.criteres = criteres
+        lignes = self._ordres.pop(criteres, None)
+        self._reordonner(lignes if lignes is not None else self._calculer_lignes())
+
+    def filtrer(self, filtre):
+        """N'affiche que les devoirs dont l'identifiant est dans l'ensemble filtre (None : tous)"""
+        if filtre is not None and self.filtre is not None and self._lignes is not None and filtre <= self.filtre:
+            # Filtre plus restrictif (recherche qui s'allonge) : on garde les lignes
+            # déjà triées qui passent encore, sans reparcourir toute la liste
+            ids = map(self._colonne("id").__getitem__, self._lignes)
+            lignes = list(compress(self._lignes, map(filtre.__contains__, ids)))
+        else:
+            lignes = None
+        self.beginResetModel()
+        self.filtre = filtre
+        self._ordres.clear()
+        self._lignes = lignes if lignes is not None else self._calculer_lignes()
+        self.endResetModel()
+
+    def invalider(self):
+        """Oublie les clés en cache et retrie (après un changement qui touche les clés, ex. nom de classe)"""
+        self._colonnes.clear()
+        self._ordres.clear()
+        if self.criteres:
+            self._reordonner(self._calculer_lignes())
+
+    def _colonne(self, critere):
+        """Clé du critère pour chaque ligne source, calculée au premier tri qui l'utilise"""
+        colonne = self._colonnes.get(critere)
+        if colonne is None:
+            colonne = self._colonnes[critere] = list(map(_COLONNES[critere], self.sourceModel().devoirs))
+        return colonne
+
+    def _cle(self, ligne_source):
+        return tuple(self._colonne(critere)[ligne_source] for critere in self.criteres) + (ligne_source,)
+
+    def _calculer_lignes(self):
+        devoirs = self.sourceModel().devoirs
+        if not self.criteres and self.filtre is None:
+            return None
+        if self.filtre is None:
+            lignes = list(range(len(devoirs)))
+        else:
+            lignes = list(compress(range(len(devoirs)), map(self.filtre.__contains__, self._colonne("id"))))
+        # Tris stables successifs, du dernier critère au premier : à clé
+        # égale, l'ordre du critère suivant puis l'ordre manuel sont conservés
+        for critere in reversed(self.criteres):
+            lignes.sort(key=self._colonne(critere).__getitem__)
+        return lignes
+
+    def _reordonner(self, lignes):
+        """Remplace l'ordre affiché (même nombre de lignes) en gardant sélection et ligne courante"""
+        self.layoutAboutToBeChanged.emit()
+        anciens = self.persistentIndexList()
+        sources = [self.mapToSource(index).row() for index in anciens]
+        self._lignes = lignes
+        if lignes is None:
+            positions = None
+        elif len(sources) > 16:
+            # Une sélection étendue est suivie ligne par ligne : table inverse
+            # plutôt qu'une recherche par index suivi
+            positions = dict(zip(lignes, range(len(lignes))))
+        else:
+            positions = {source: self._position(source) for source in sources}
+        nouveaux = []
+        for source in sources:
+            ligne = source if positions is None else positions.get(source)
+            nouveaux.append(QModelIndex() if ligne is None or source < 0 else self.createIndex(ligne, 0))
+        self.changePersistentIndexList(anciens, nouveaux)
+        self.layoutChanged.emit()
+
+    def lignes_source(self, premiere, derniere):
+        """Lignes source des lignes affichées premiere à derniere"""
+        if self._lignes is None:
+            return range(premiere, derniere + 1)
+        return self._lignes[premiere:derniere + 1]
+
+    def _position(self, ligne_source):
+        """Ligne affichée d'une ligne source (None si elle est filtrée)"""
+        if self._lignes is None:
+            return ligne_source
+        try:
+            return self._lignes.index(ligne_source)  # parcours en C, pour quelques lignes à la fois
+        except ValueError:
+            return None
+
+    # ----- Suivi des modifications de la source -----
+
+    def _avant_insertion(self, parent, premiere, derniere):
+        if self._lignes is None:
+            self.beginInsertRows(QModelIndex(), premiere, derniere)
+
+    def _apres_insertion(self, parent, premiere, derniere):
+        self._ordres.clear()
+        devoirs = self.sourceModel().devoirs
+        nouveaux = devoirs[premiere:derniere + 1]
+        for critere, colonne in self._colonnes.items():
+            colonne[premiere:premiere] = map(_COLONNES[critere], nouveaux)
+        if self._lignes is None:
+            self.endInsertRows()
+            return
+        nombre = derniere - premiere + 1
+        if premiere < len(devoirs) - nombre:
+            self._lignes = [l + nombre if l >= premiere else l for l in self._lignes]
+        for ligne_source in range(premiere, derniere + 1):
+            if self.filtre is not None and devoirs[ligne_source].id not in self.filtre:
+                continue
+            # Recherche dichotomique sur (clés, ligne source), l'ordre du tri stable
+            cle = self._cle(ligne_source)
+            debut, fin = 0, len(self._lignes)
+            while debut < fin:
+                milieu = (debut + fin) // 2
+                if cle < self._cle(self._lignes[milieu]):
+                    fin = milieu
+                else:
+                    debut = milieu + 1
+            self.beginInsertRows(QModelIndex(), debut, debut)
+            self._lignes.insert(debut, ligne_source)
+            self.endInsertRows()
+
+    def _avant_retrait(self, parent, premiere, derniere):
+        if self._lignes is None:
+            self.beginRemoveRows(QModelIndex(), premiere, derniere)
+            return
+        # Lignes affichées à retirer, par blocs contigus en partant de la fin
+        lignes = sorted((p for p in map(self._position, range(premiere, derniere + 1)) if p is not None), reverse=True)
+        while lignes:
+            fin = debut = lignes.pop(0)
+            while lignes and lignes[0] == debut - 1:
+                debut = lignes.pop(0)
+            self.beginRemoveRows(QModelIndex(), debut, fin)
+            del self._lignes[debut:fin + 1]
+            self.endRemoveRows()
+
+    def _apres_retrait(self, parent, premiere, derniere):
+        self._ordres.clear()
+        for colonne in self._colonnes.values():
+            del colonne[premiere:derniere + 1]
+        if self._lignes is None:
+            self.endRemoveRows()
             return
+        nombre = derniere - premiere + 1
+        self._lignes = [l - nombre if l > derniere else l for l in self._lignes]
+
+    def _avant_deplacement(self, parent, premiere, derniere, parent_destination, destination):
+        if self._lignes is None:
+            self.beginMoveRows(QModelIndex(), premiere, derniere, QModelIndex(), destination)
+
+    def _apres_deplacement(self, parent, premiere, derniere, parent_destination, destination):
+        self._ordres.clear()
+        # destination est la position d'insertion avant le retrait des lignes
+        if destination > derniere:
+            destination -= derniere - premiere + 1
+        for colonne in self._colonnes.values():
+            bloc = colonne[premiere:derniere + 1]
+            del colonne[premiere:derniere + 1]
+            colonne[destination:destination] = bloc
+        if self._lignes is None:
+            self.endMoveRows()
+        else:
+            # Les numéros de ligne source ont changé : on recalcule la correspondance
+            self._reordonner(self._calculer_lignes())
+
+    def _apres_reinitialisation(self):
+        self._colonnes.clear()
+        self._ordres.clear()
+        self._lignes = self._calculer_lignes()
+        self.endResetModel()
+
+    def _donnees_modifiees(self, haut, bas, roles=()):
+        premiere, derniere = haut.row(), bas.row()
+        # Les clés de ces lignes ont pu changer (date ou classe modifiées en lot)
+        devoirs = self.sourceModel().devoirs[premiere:derniere + 1]
+        cles_modifiees = False
+        for critere, colonne in self._colonnes.items():
+            cles = list(map(_COLONNES[critere], devoirs))
+            if cles != colonne[premiere:derniere + 1]:
+                colonne[premiere:derniere + 1] = cles
+                self._ordres.clear()
+                cles_modifiees = cles_modifiees or critere in self.criteres
+        if cles_modifiees:
+            self._reordonner(self._calculer_lignes())
+        if self._lignes is None:
+            self.dataChanged.emit(self.index(premiere), self.index(derniere), roles)
+        elif premiere == derniere:
+            index = self.mapFromSource(haut)
+            if index.isValid():
+                self.dataChanged.emit(index, index, roles)
+        elif self._lignes:
+            # Lignes dispersées dans l'ordre affiché : un seul signal pour toutes
+            self.dataChanged.emit(self.index(0), self.index(len(self._lignes) - 1), roles)
+
+    # ----- Correspondance avec la source -----
+
+    def index(self, ligne, colonne=0, parent=QModelIndex()):
+        if parent.isValid() or colonne != 0 or not 0 <= ligne < self.rowCount():
+            return QModelIndex()
+        return self.createIndex(ligne, colonne)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()  # parent QObject
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.sourceModel().rowCount() if self._lignes is None else len(self._lignes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def mapToSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        ligne = index.row() if self._lignes is None else self._lignes[index.row()]
+        return self.sourceModel().index(ligne, 0)
+
+    def mapFromSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        ligne = self._position(index.row())
+        return QModelIndex() if ligne is None else self.createIndex(ligne, 0)
+
+
+class DevoirDelegate(QStyledItemDelegate):
+    """Dessine chaque devoir comme une carte, à la demande (seules les lignes visibles coûtent).
+
+    Un clic sur la case change le statut, sur le contenu ouvre l'édition,
+    sur la corbeille supprime le devoir ; ailleurs, il sélectionne la carte
+    et copie le contenu (Maj/Ctrl+clic : sélection seulement).
+    """
+    HAUTEUR = 62
+    MARGE_OMBRE = 8  # marge autour de l'aperçu de glisser-déposer, pour l'ombre portée
+    APERCUS_MAX = 32  # aperçus de glisser-déposer gardés en cache
+
+    suppression_demandee = Signal(object)
+
+    def __init__(self, vue):
+        super().__init__(vue)
+        self.vue = vue
+        self.copie_id = None  # devoir dont le contenu vient d'être copié (surbrillance)
+        self.appui = None  # (ligne, zone) du dernier appui de souris
+        self.glisse_id = None  # devoir en cours de glisser-déposer (carte estompée)
+        self._apercus = {}  # id du devoir -> (signature de la carte, aperçu de glisser-déposer)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.HAUTEUR)
+
+    def zones(self, rect):
+        """Découpe la carte de la ligne rect en zones (dessin et clics)"""
+        carte = rect.adjusted(5, 5, -5, -5)
+        milieu = carte.center().y()
+        x = carte.left() + 10
+        case = QRect(x, milieu - 12, 25, 25)
+        classe = QRect(case.right() + 10, carte.top(), 110, carte.height())
+        date = QRect(classe.right() + 5, carte.top(), 120, carte.height())
+        supprimer = QRect(carte.right() - 10 - 35, milieu - 17, 35, 35)
+        statut = QRect(supprimer.left() - 10 - 90, milieu - 14, 90, 28)
+        contenu = QRect(date.right() + 10, carte.top() + 5, statut.left() - date.right() - 20, carte.height() - 10)
+        return {"carte": carte, "case": case, "classe": classe, "date": date,
+                "contenu": contenu, "statut": statut, "supprimer": supprimer}
+
+    def zone_touchee(self, rect, position):
+        zones = self.zones(rect)
+        for nom in ("case", "supprimer", "contenu"):
+            if zones[nom].contains(position):
+                return nom
+        return "carte"
+
+    def paint(self, painter, option, index):
+        devoir = index.data(DevoirsModel.RoleDevoir)
+        etat = index.data(DevoirsModel.RoleEtat)
+        zones = self.zones(option.rect)
+        survol = bool(option.state & QStyle.State_MouseOver)
+        selectionne = bool(option.state & QStyle.State_Selected)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
 
-        # Marquer comme en cours de déplacement
-        self.is_being_dragged = True
-        
-        # Informer le parent du début du drag
-        if self.parent_widget:
-            self.parent_widget.current_drag_index = self.parent_widget.devoirs_list.index(self.devoir)
-        
-        # Créer le drag
-        drag = QDrag(self)
-        mime_data = QMimeData()
-        
-        # Stocker l'index de cette carte
-        index = self.parent_widget.devoirs_list.index(self.devoir)
-        mime_data.setText(str(index))
-        drag.setMimeData(mime_data)
-        
-        # Créer une silhouette améliorée avec ombre portée
-        pixmap = self.create_drag_pixmap()
-        drag.setPixmap(pixmap)
-        drag.setHotSpot(event.pos())
-
-        # Rendre semi-transparent pendant le drag
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: rgba({self.rgb_values}, 0.05);
-                border-radius: 10px;
-                border: 2px dashed rgba({self.rgb_values}, 0.3);
-                padding: 10px;
-                margin: 5px;
-            }}
-            QLabel {{
-                font-size: 14px;
-                color: #999;
-                padding: 5px;
-                background-color: transparent;
-            }}
-        """)
+        # Fond de la carte, à la couleur de la classe
+        if devoir.id == self.copie_id:
+            fond = QColor(33, 150, 243, 64)
+            bordure = QPen(QColor("#2196F3"), 2)
+        elif devoir.id == self.glisse_id:
+            couleur = couleur_classe_qcolor(devoir.classe_objet.couleur)
+            fond = QColor(couleur)
+            fond.setAlphaF(0.05)
+            couleur_bordure = QColor(couleur)
+            couleur_bordure.setAlphaF(0.3)
+            bordure = QPen(couleur_bordure, 2, Qt.DashLine)
+        else:
+            couleur = couleur_classe_qcolor(devoir.classe_objet.couleur)
+            fond = QColor(couleur)
+            fond.setAlphaF(0.25 if survol else 0.15)
+            couleur_bordure = QColor(couleur)
+            couleur_bordure.setAlphaF(0.5 if survol else 0.3)
+            bordure = QPen(couleur_bordure, 2 if survol else 1)
+            if selectionne:
+                bordure = QPen(QColor("#4A90E2"), 2)
+        painter.setPen(bordure)
+        painter.setBrush(fond)
+        painter.drawRoundedRect(QRectF(zones["carte"]), 10, 10)
+        if devoir.id == self.glisse_id:
+            painter.setOpacity(0.4)
 
-        # Exécuter le drag
-        result = drag.exec(Qt.MoveAction)
-        
-        # Restaurer l'apparence normale
-        self.is_being_dragged = False
-        if self.parent_widget:
-            self.parent_widget.current_drag_index = -1
-            self.parent_widget.hide_drop_indicator()
-        self.restaurer_style_normal()
-
-    def create_drag_pixmap(self):
-        """Crée un pixmap amélioré pour le drag avec ombre portée"""
-        # Taille avec marge pour l'ombre
-        shadow_offset = 8
-        pixmap_width = self.width() + shadow_offset * 2
-        pixmap_height = self.height() + shadow_offset * 2
-        
-        pixmap = QPixmap(pixmap_width, pixmap_height)
+        # Case à cocher
+        fait = devoir.statut in STATUTS_TERMINES
+        painter.setPen(QPen(QColor("#28a745" if fait else "#4A90E2"), 2))
+        painter.setBrush(QColor("#28a745") if fait else QColor("white"))
+        painter.drawRoundedRect(QRectF(zones["case"]), 5, 5)
+        if fait:
+            painter.setPen(QPen(QColor("white"), 3))
+            case = zones["case"]
+            painter.drawPolyline([QPoint(case.left() + 6, case.center().y()),
+                                  QPoint(case.left() + 11, case.bottom() - 7),
+                                  QPoint(case.right() - 5, case.top() + 7)])
+
+        police = QFont(option.font)
+        police.setPixelSize(14)
+        police_gras = QFont(police)
+        police_gras.setBold(True)
+
+        # Classe
+        painter.setFont(police_gras)
+        painter.setPen(QColor("#333"))
+        texte = QFontMetrics(police_gras).elidedText(f"📚 {devoir.classe_objet.nom}", Qt.ElideRight, zones["classe"].width())
+        painter.drawText(zones["classe"], Qt.AlignVCenter | Qt.AlignLeft, texte)
+
+        # Date, colorée selon l'état d'échéance
+        couleur_date = COULEURS_ECHEANCE.get(etat)
+        police_date = QFont(police_gras if couleur_date else police)
+        police_date.setPixelSize(13)
+        painter.setFont(police_date)
+        painter.setPen(QColor(couleur_date or "#666"))
+        painter.drawText(zones["date"], Qt.AlignVCenter | Qt.AlignLeft, f"📅 {devoir.date_formatee('%d-%m-%Y')}")
+
+        # Contenu
+        painter.setFont(police)
+        painter.setPen(QColor("#333"))
+        texte = QFontMetrics(police).elidedText(devoir.contenu, Qt.ElideRight, zones["contenu"].width())
+        painter.drawText(zones["contenu"], Qt.AlignVCenter | Qt.AlignLeft, texte)
+
+        # Statut
+        if fait:
+            fond_statut, texte_statut = QColor("#28a745"), QColor("white")
+        elif devoir.statut == "En cours":
+            fond_statut, texte_statut = QColor("#ffc107"), QColor("#333")
+        else:
+            fond_statut, texte_statut = QColor("#dc3545"), QColor("white")
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(fond_statut)
+        painter.drawRoundedRect(QRectF(zones["statut"]), 5, 5)
+        painter.setFont(police_gras)
+        painter.setPen(texte_statut)
+        painter.drawText(zones["statut"], Qt.AlignCenter, devoir.statut)
+
+        # Bouton supprimer
+        painter.setPen(QPen(QColor("#dc3545"), 2))
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(QRectF(zones["supprimer"]), 8, 8)
+        painter.setFont(police)
+        painter.drawText(zones["supprimer"], Qt.AlignCenter, "🗑️")
+
+        painter.restore()
+
+    def apercu_glisser(self, index, taille):
+        """Aperçu de la carte pour le glisser-déposer (avec ombre portée), refait seulement si la carte a changé"""
+        devoir = index.data(DevoirsModel.RoleDevoir)
+        etat = index.data(DevoirsModel.RoleEtat)
+        signature = (taille.width(), taille.height(), devoir.contenu, devoir.statut, devoir.jour,
+                     devoir.classe_objet.nom, devoir.classe_objet.couleur, etat)
+        en_cache = self._apercus.pop(devoir.id, None)
+        if en_cache is not None and en_cache[0] == signature:
+            self._apercus[devoir.id] = en_cache  # remis en fin : le plus récemment utilisé
+            return en_cache[1]
+
+        marge = self.MARGE_OMBRE
+        rect = QRect(marge, marge, taille.width(), taille.height())
+        pixmap = QPixmap(taille.width() + 2 * marge, taille.height() + 2 * marge)
         pixmap.fill(Qt.transparent)
-        
         painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Dessiner l'ombre portée
-        shadow_rect = QRect(shadow_offset + 4, shadow_offset + 4, self.width(), self.height())
+
+        # Ombre portée
+        carte = self.zones(rect)["carte"]
         painter.setPen(Qt.NoPen)
         painter.setBrush(QColor(0, 0, 0, 60))
-        painter.drawRoundedRect(shadow_rect, 10, 10)
-        
-        # Dessiner la carte elle-même avec une légère transparence
+        painter.drawRoundedRect(QRectF(carte.translated(4, 4)), 10, 10)
+
+        # La carte elle-même, légèrement transparente
+        option = QStyleOptionViewItem()
+        self.initStyleOption(option, index)
+        option.rect = rect
+        option.state &= ~QStyle.State_MouseOver
         painter.setOpacity(0.85)
-        self.render(painter, QPoint(shadow_offset, shadow_offset))
-        
-        # Ajouter une bordure bleue pour indiquer le drag
+        glisse_id, self.glisse_id = self.glisse_id, None
+        self.paint(painter, option, index)
+        self.glisse_id = glisse_id
+
+        # Bordure bleue du glisser-déposer
         painter.setOpacity(1.0)
         painter.setPen(QPen(QColor(74, 144, 226), 3))
         painter.setBrush(Qt.NoBrush)
-        card_rect = QRect(shadow_offset, shadow_offset, self.width(), self.height())
-        painter.drawRoundedRect(card_rect, 10, 10)
-        
+        painter.drawRoundedRect(QRectF(carte), 10, 10)
         painter.end()
+
+        self._apercus[devoir.id] = (signature, pixmap)
+        if len(self._apercus) > self.APERCUS_MAX:
+            del self._apercus[next(iter(self._apercus))]
         return pixmap
 
-    def mouseReleaseEvent(self, event):
-        """Fin du drag"""
-        self.drag_start_position = None
-        super().mouseReleaseEvent(event)
-
-    def supprimer(self):
-        """Supprime ce devoir"""
-        if self.parent_widget:
-            self.parent_widget.supprimer_devoir(self.devoir)
-
-    def changer_statut(self, state):
-        """Change le statut du devoir en fonction de l'état de la case à cocher"""
-        if state == 2:
-            self.devoir.statut = "Fait"
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        zone = self.zone_touchee(option.rect, event.position().toPoint())
+        if event.type() == QEvent.MouseButtonPress:
+            self.appui = (index.row(), zone)
+            # Un appui sur la carte elle-même peut démarrer un glisser-déposer
+            return zone != "carte"
+
+        if self.appui != (index.row(), zone):
+            return False
+        self.appui = None
+        devoir = index.data(DevoirsModel.RoleDevoir)
+        if zone == "case":
+            fait = index.data(Qt.CheckStateRole) == Qt.Checked
+            model.setData(index, Qt.Unchecked if fait else Qt.Checked, Qt.CheckStateRole)
+        elif zone == "supprimer":
+            self.suppression_demandee.emit(devoir)
+        elif zone == "contenu":
+            self.vue.edit(index)
         else:
-            self.devoir.statut = "Pas fait"
-        
-        self.mettre_a_jour_affichage_statut()
-        
-        if self.parent_widget:
-            sauvegarder_devoirs(self.parent_widget.devoirs_list)
-
-    def activer_edition_contenu(self, event):
-        """Active le mode édition du contenu"""
-        self.label_contenu.hide()
-        self.line_edit_contenu.setText(self.devoir.contenu)
-        self.line_edit_contenu.show()
-        self.line_edit_contenu.setFocus()
-        self.line_edit_contenu.selectAll()
-
-    def copier_contenu(self):
+            # Maj/Ctrl+clic : seulement la sélection ; la vue la termine au relâchement
+            if not event.modifiers() & (Qt.ShiftModifier | Qt.ControlModifier):
+                self.copier_contenu(devoir)
+            return False
+        return True
+
+    def copier_contenu(self, devoir):
         """Copie le contenu du devoir dans le presse-papier"""
-        clipboard = QApplication.clipboard()
-        clipboard.setText(self.devoir.contenu)
-        
-        # Animation de feedback
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: rgba(33, 150, 243, 0.25);
-                border-radius: 10px;
-                border: 2px solid #2196F3;
-                padding: 10px;
-                margin: 5px;
-            }}
-        """)
-        
-        QTimer.singleShot(200, self.restaurer_style_normal)
+        QApplication.clipboard().setText(devoir.contenu)
 
-    def sauvegarder_contenu(self):
-        """Sauvegarde le contenu modifié"""
-        nouveau_contenu = self.line_edit_contenu.text().strip()
-        
-        if nouveau_contenu:
-            self.devoir.contenu = nouveau_contenu
-            self.label_contenu.setText(nouveau_contenu)
-            
-            if self.parent_widget:
-                sauvegarder_devoirs(self.parent_widget.devoirs_list)
-        
-        self.line_edit_contenu.hide()
-        self.label_contenu.show()
-
-    def mettre_a_jour_affichage_statut(self):
-        """Met à jour l'affichage du label de statut"""
-        self.label_statut.setText(self.devoir.statut)
-        if self.devoir.statut == "Fait":
-            self.label_statut.setStyleSheet("font-weight: bold; padding: 5px 10px; border-radius: 5px; background-color: #28a745; color: white;")
-        else:
-            self.label_statut.setStyleSheet("font-weight: bold; padding: 5px 10px; border-radius: 5px; background-color: #dc3545; color: white;")
-
-    def restaurer_style_normal(self):
-        """Restaure le style normal avec la couleur de la classe"""
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: rgba({self.rgb_values}, 0.15);
-                border-radius: 10px;
-                border: 1px solid rgba({self.rgb_values}, 0.3);
-                padding: 10px;
-                margin: 5px;
-            }}
-            QLabel {{
-                font-size: 14px;
-                color: #333;
-                padding: 5px;
-                background-color: transparent;
-            }}
-        """)
+        # Surbrillance de confirmation
+        self.copie_id = devoir.id
+        self.vue.viewport().update()
+        QTimer.singleShot(200, self.effacer_copie)
 
-    def eventFilter(self, obj, event):
-        if obj == self:
-            if event.type() == QEvent.MouseButtonPress:
-                widget_under_mouse = QApplication.widgetAt(event.globalPosition().toPoint())
-                if widget_under_mouse not in [self.checkbox, self.label_contenu, self.line_edit_contenu]:
-                    if not isinstance(widget_under_mouse, QPushButton):
-                        self.copier_contenu()
-            elif event.type() == QEvent.Enter:
-                self.setStyleSheet(f"""
-                    QFrame {{
-                        background-color: rgba({self.rgb_values}, 0.25);
-                        border-radius: 10px;
-                        border: 2px solid rgba({self.rgb_values}, 0.5);
-                        padding: 10px;
-                        margin: 5px;
-                    }}
-                    QLabel {{
-                        font-size: 14px;
-                        color: #333;
-                        padding: 5px;
-                        background-color: transparent;
-                    }}
-                """)
-            elif event.type() == QEvent.Leave:
-                if not self.is_being_dragged:
-                    self.restaurer_style_normal()
-        return super().eventFilter(obj, event)
\ No newline at end of file
+    def effacer_copie(self):
+        self.copie_id = None
+        self.vue.viewport().update()
+
+    def createEditor(self, parent, option, index):
+        editeur = QLineEdit(parent)
+        editeur.setStyleSheet("font-size: 14px; color: #333;")
+        return editeur
+
+    def setEditorData(self, editeur, index):
+        editeur.setText(index.data(Qt.EditRole))
+        editeur.selectAll()
+
+    def setModelData(self, editeur, model, index):
+        model.setData(index, editeur.text(), Qt.EditRole)
+
+    def updateEditorGeometry(self, editeur, option, index):
+        editeur.setGeometry(self.zones(option.rect)["contenu"])
@@ -9,13 +9,19 @@ from PySide6.QtGui import QFont
 import sys
 import os
 import json
-import shutil
 from datetime import datetime
 
 # Ajouter le dossier parent au chemin
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.gestion import charger_classes, charger_devoirs, sauvegarder_classes, sauvegarder_devoirs, CLASSES_FILE, DEVOIRS_FILE
+from utils.gestion import (
+    charger_classes, charger_devoirs, sauvegarder_classes, sauvegarder_devoirs, renommer_classe,
+    classes_depuis_donnees, devoirs_depuis_donnees, verifier_donnees, instantane_classes, restaurer_classes, DATA_DIR
+)
+from utils.historique import historique
+from utils.stockage import classe_vers_dict, devoir_vers_dict
+from utils.persistance import vider_ecritures
+from utils.fichiers import ecrire_json_atomique
 
 # Import du gestionnaire de configuration
 from utils.config_manager import get_lien_ent, set_lien_ent
@@ -275,22 +281,8 @@ class ParametresWidget(QWidget):
             devoirs = charger_devoirs()
             
             # Convertir en dictionnaires
-            classes_data = []
-            for classe in classes:
-                classes_data.append({
-                    "nom": classe.nom,
-                    "effectif": classe.effectif,
-                    "couleur": classe.couleur
-                })
-            
-            devoirs_data = []
-            for devoir in devoirs:
-                devoirs_data.append({
-                    "contenu": devoir.contenu,
-                    "classe_nom": devoir.classe_objet.nom,
-                    "date": devoir.date,
-                    "statut": devoir.statut
-                })
+            classes_data = [classe_vers_dict(classe) for classe in classes]
+            devoirs_data = [devoir_vers_dict(devoir) for devoir in devoirs]
             
             # Créer le fichier d'export
             export_data = {
@@ -301,8 +293,7 @@ class ParametresWidget(QWidget):
             }
             
             # Sauvegarder
-            with open(fichier, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            ecrire_json_atomique(fichier, export_data)
             
             QMessageBox.information(
                 self,
@@ -350,22 +341,33 @@ class ParametresWidget(QWidget):
             if "classes" not in import_data or "devoirs" not in import_data:
                 raise ValueError("Format de fichier invalide")
             
-            # Créer une sauvegarde des données actuelles
-            backup_dir = os.path.join(os.path.dirname(CLASSES_FILE), 'backup')
-            os.makedirs(backup_dir, exist_ok=True)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            
-            if os.path.exists(CLASSES_FILE):
-                shutil.copy(CLASSES_FILE, os.path.join(backup_dir, f'classes_backup_{timestamp}.json'))
-            if os.path.exists(DEVOIRS_FILE):
-                shutil.copy(DEVOIRS_FILE, os.path.join(backup_dir, f'devoirs_backup_{timestamp}.json'))
-            
-            # Écrire les nouvelles données
-            with open(CLASSES_FILE, 'w', encoding='utf-8') as f:
-                json.dump(import_data["classes"], f, ensure_ascii=False, indent=2)
-            
-            with open(DEVOIRS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(import_data["devoirs"], f, ensure_ascii=False, indent=2)
+            # Créer une sauvegarde des données actuelles, avant toute modification
+            backup_dir = self.sauvegarder_copie('backup')
+
+            # Données actuelles, pour pouvoir annuler l'import (les classes de
+            # même identifiant sont mises à jour sur place par l'import)
+            anciennes = (self.etat_classes(charger_classes()), list(charger_devoirs()))
+
+            # Valider tout le fichier sur des objets à part : rien n'est modifié s'il est invalide
+            verifier_donnees(import_data["classes"], import_data["devoirs"])
+
+            # Reconstruire les objets dans le dépôt, puis écrire les nouvelles données ;
+            # en cas d'échec, les classes et les listes reprennent leur état d'avant l'import
+            etat = instantane_classes()
+            try:
+                classes = classes_depuis_donnees(import_data["classes"])
+                devoirs = devoirs_depuis_donnees(import_data["devoirs"], classes)
+                sauvegarder_classes(classes)
+                sauvegarder_devoirs(devoirs)
+                vider_ecritures()  # Les données importées doivent être sur le disque avant de confirmer
+            except Exception:
+                restaurer_classes(etat)
+                sauvegarder_classes([classe for classe, _ in anciennes[0]])
+                sauvegarder_devoirs(anciennes[1])
+                raise
+            nouvelles = (self.etat_classes(classes), devoirs)
+            historique.enregistrer("Import de données", lambda: self.remplacer_donnees(*anciennes),
+                                   lambda: self.remplacer_donnees(*nouvelles), anciennes)
             
             QMessageBox.information(
                 self,
@@ -408,24 +410,18 @@ class ParametresWidget(QWidget):
         
         try:
             # Créer une sauvegarde avant suppression
-            backup_dir = os.path.join(os.path.dirname(CLASSES_FILE), 'backup')
-            os.makedirs(backup_dir, exist_ok=True)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup_dir = self.sauvegarder_copie('avant_reset')
+            anciennes = (self.etat_classes(charger_classes()), list(charger_devoirs()))
             
-            if os.path.exists(CLASSES_FILE):
-                shutil.copy(CLASSES_FILE, os.path.join(backup_dir, f'classes_avant_reset_{timestamp}.json'))
-            if os.path.exists(DEVOIRS_FILE):
-                shutil.copy(DEVOIRS_FILE, os.path.join(backup_dir, f'devoirs_avant_reset_{timestamp}.json'))
-            
-            # Réinitialiser les fichiers
-            with open(CLASSES_FILE, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
-            
-            with open(DEVOIRS_FILE, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+            # Réinitialiser les données
+            sauvegarder_classes([])
+            sauvegarder_devoirs([])
+            historique.enregistrer("Réinitialisation des données", lambda: self.remplacer_donnees(*anciennes),
+                                   lambda: self.remplacer_donnees([], []), anciennes)
             
             # Réinitialiser le lien personnalisé
             set_lien_ent("", "")
+            vider_ecritures()
             
             # Mettre à jour la page d'accueil si elle existe
             if self.main_window and hasattr(self.main_window, 'page_accueil'):
@@ -447,6 +443,41 @@ class ParametresWidget(QWidget):
                 f"Une erreur est survenue :\n{str(e)}"
             )
 
+    @staticmethod
+    def etat_classes(classes):
+        """Classes avec la valeur de leurs champs : (classe, {champ: valeur})"""
+        return [(c, {"nom": c.nom, "effectif": c.effectif, "couleur": c.couleur}) for c in classes]
+
+    def remplacer_donnees(self, classes, devoirs):
+        """Remplace toutes les données (annulation ou rétablissement d'un import) ; classes : voir etat_classes()"""
+        for classe, valeurs in classes:
+            renommer_classe(classe, valeurs["nom"])
+            classe.effectif = valeurs["effectif"]
+            classe.couleur = valeurs["couleur"]
+        sauvegarder_classes([classe for classe, _ in classes])
+        sauvegarder_devoirs(devoirs)
+        self.rafraichir_pages()
+
+    def sauvegarder_copie(self, suffixe):
+        """Copie les données actuelles dans data/backup/ (quel que soit le stockage) et retourne le dossier"""
+        backup_dir = os.path.join(DATA_DIR, 'backup')
+        os.makedirs(backup_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        classes = charger_classes()
+        devoirs = charger_devoirs()
+        
+        ecrire_json_atomique(
+            os.path.join(backup_dir, f'classes_{suffixe}_{timestamp}.json'),
+            [classe_vers_dict(c) for c in classes]
+        )
+        ecrire_json_atomique(
+            os.path.join(backup_dir, f'devoirs_{suffixe}_{timestamp}.json'),
+            [devoir_vers_dict(d) for d in devoirs]
+        )
+        
+        return backup_dir
+
     def rafraichir_pages(self):
         """Rafraîchit toutes les pages pour recharger les données"""
         if self.main_window:
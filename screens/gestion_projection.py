@@ -1,18 +1,22 @@
 # screens/gestion_projection.py
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-    QComboBox, QCheckBox, QFrame, QScrollArea, QSpacerItem, QSizePolicy
+    QComboBox, QFrame, QSizePolicy,
+    QTableView, QHeaderView, QAbstractItemView, QStyledItemDelegate
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QEvent, QRect, QRectF, QPoint, QSize, QTimer, QAbstractListModel, QModelIndex, Signal
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen, QPixmap, QKeySequence, QShortcut
 
 import sys
 import os
+from itertools import compress
 
 # Ajouter le dossier parent au chemin
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.gestion import charger_classes, charger_devoirs
+from utils.gestion import charger_classes, devoirs_de_classe_par_date
+from models.Devoir import classer_devoirs
+from screens.theme import COULEURS_ECHEANCE
 
 class ProjectionWidget(QWidget):
     """Écran de sélection des devoirs à projeter"""
@@ -21,7 +25,6 @@ class ProjectionWidget(QWidget):
         self.main_window = main_window
         self.classes_list = []
         self.devoirs_list = []
-        self.devoirs_checkboxes = []  # Liste des (checkbox, devoir)
         self.init_ui()
 
     def init_ui(self):
@@ -89,27 +92,37 @@ class ProjectionWidget(QWidget):
         buttons_layout.addStretch()
         main_layout.addLayout(buttons_layout)
 
-        # Zone scrollable pour les devoirs
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
+        # Liste des devoirs : une QTableView à une colonne et à lignes de hauteur
+        # fixe, dessinées à la demande (seules les lignes visibles coûtent)
+        self.modele = SelectionDevoirsModel(self)
+        self.vue = QTableView()
+        self.vue.setModel(self.modele)
+        self.vue.setItemDelegate(SelectionDevoirDelegate(self.vue))
+        self.vue.horizontalHeader().hide()
+        self.vue.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.vue.verticalHeader().hide()
+        self.vue.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.vue.verticalHeader().setDefaultSectionSize(SelectionDevoirDelegate.HAUTEUR)
+        self.vue.setShowGrid(False)
+        self.vue.setWordWrap(False)
+        self.vue.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.vue.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.vue.setSelectionMode(QAbstractItemView.NoSelection)
+        self.vue.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.vue.setStyleSheet("""
+            QTableView {
                 border: 1px solid #ddd;
                 border-radius: 5px;
                 background-color: white;
             }
         """)
+        main_layout.addWidget(self.vue)
 
-        self.scroll_widget = QWidget()
-        self.scroll_layout = QVBoxLayout()
-        self.scroll_layout.setSpacing(10)
-        self.scroll_layout.setContentsMargins(10, 10, 10, 10)
-        self.scroll_layout.setAlignment(Qt.AlignTop)
-        self.scroll_widget.setLayout(self.scroll_layout)
-        scroll_area.setWidget(self.scroll_widget)
-
-        main_layout.addWidget(scroll_area)
+        self.label_vide = QLabel("Aucun devoir pour cette classe")
+        self.label_vide.setAlignment(Qt.AlignCenter)
+        self.label_vide.setStyleSheet("color: #999; font-style: italic; padding: 20px;")
+        self.label_vide.hide()
+        main_layout.addWidget(self.label_vide)
 
         # Bouton Afficher
         btn_afficher = QPushButton("Afficher la projection")
@@ -153,91 +166,29 @@ class ProjectionWidget(QWidget):
         if self.combo_classe.currentIndex() == -1:
             return
 
-        # Vider la liste
-        for i in reversed(range(self.scroll_layout.count())):
-            item = self.scroll_layout.itemAt(i)
-            if item.widget():
-                item.widget().deleteLater()
-
-        self.devoirs_checkboxes.clear()
-
         # Récupérer la classe sélectionnée
-        classe_nom = self.combo_classe.currentText()
-        
-        # Charger tous les devoirs
-        tous_devoirs = charger_devoirs()
-        
-        # Filtrer par classe et trier par date
-        devoirs_classe = [d for d in tous_devoirs if d.classe_objet.nom == classe_nom]
-        devoirs_classe.sort(key=lambda d: d.date)
-
-        if not devoirs_classe:
-            label_vide = QLabel("Aucun devoir pour cette classe")
-            label_vide.setAlignment(Qt.AlignCenter)
-            label_vide.setStyleSheet("color: #999; font-style: italic; padding: 20px;")
-            self.scroll_layout.addWidget(label_vide)
-            return
+        classe = self.classes_list[self.combo_classe.currentIndex()]
 
-        # Afficher les devoirs avec checkbox
-        for devoir in devoirs_classe:
-            item_widget = QWidget()
-            item_layout = QHBoxLayout()
-            item_layout.setContentsMargins(5, 5, 5, 5)
-
-            # Checkbox
-            checkbox = QCheckBox()
-            checkbox.setChecked(True)  # Tout sélectionné par défaut
-            item_layout.addWidget(checkbox)
-
-            # Date
-            from datetime import datetime
-            try:
-                date_obj = datetime.strptime(devoir.date, "%Y-%m-%d")
-                date_affichage = date_obj.strftime("%d/%m/%Y")
-            except:
-                date_affichage = devoir.date
-
-            date_label = QLabel(date_affichage)
-            date_label.setFont(QFont("Arial", 11, QFont.Bold))
-            date_label.setStyleSheet("color: #4A90E2;")
-            date_label.setFixedWidth(100)
-            item_layout.addWidget(date_label)
-
-            # Contenu
-            contenu_label = QLabel(devoir.contenu)
-            contenu_label.setWordWrap(True)
-            contenu_label.setFont(QFont("Arial", 11))
-            item_layout.addWidget(contenu_label, 1)
-
-            item_widget.setLayout(item_layout)
-            item_widget.setStyleSheet("""
-                QWidget {
-                    background-color: #f8f9fa;
-                    border-radius: 5px;
-                    padding: 5px;
-                }
-            """)
+        # Devoirs de la classe, déjà triés par date (index par classe du dépôt : ni relecture ni tri)
+        devoirs_classe = devoirs_de_classe_par_date(classe)
 
-            self.scroll_layout.addWidget(item_widget)
-            self.devoirs_checkboxes.append((checkbox, devoir))
+        # Tous cochés par défaut ; un seul rafraîchissement de la liste
+        self.modele.definir_devoirs(devoirs_classe)
+        self.vue.setVisible(bool(devoirs_classe))
+        self.label_vide.setVisible(not devoirs_classe)
 
     def tout_selectionner(self):
         """Sélectionne tous les devoirs"""
-        for checkbox, _ in self.devoirs_checkboxes:
-            checkbox.setChecked(True)
+        self.modele.cocher_tout(True)
 
     def tout_deselectionner(self):
         """Désélectionne tous les devoirs"""
-        for checkbox, _ in self.devoirs_checkboxes:
-            checkbox.setChecked(False)
+        self.modele.cocher_tout(False)
 
     def afficher_projection(self):
         """Affiche la page de projection avec les devoirs sélectionnés"""
         # Récupérer les devoirs sélectionnés
-        devoirs_selectionnes = [
-            devoir for checkbox, devoir in self.devoirs_checkboxes 
-            if checkbox.isChecked()
-        ]
+        devoirs_selectionnes = self.modele.devoirs_coches()
 
         if not devoirs_selectionnes:
             from PySide6.QtWidgets import QMessageBox
@@ -248,41 +199,423 @@ class ProjectionWidget(QWidget):
             )
             return
 
-        # Créer et afficher la page de projection
+        # Afficher la page de projection (gérée par la fenêtre principale, qui la réutilise)
         classe_nom = self.combo_classe.currentText()
-        page_projection = PageProjection(devoirs_selectionnes, classe_nom, self.main_window)
-        
-        # Ajouter au stack si main_window existe
         if self.main_window:
-            # Créer une page avec bouton retour
-            page_complete = self.main_window.create_page_with_back_button(
-                page_projection, 
-                f"Projection - {classe_nom}"
-            )
-            self.main_window.stacked_widget.addWidget(page_complete)
-            self.main_window.stacked_widget.setCurrentWidget(page_complete)
+            self.main_window.show_projection(devoirs_selectionnes, classe_nom)
+
+
+class SelectionDevoirsModel(QAbstractListModel):
+    """Devoirs d'une classe à cocher pour la projection.
+
+    Les cases cochées tiennent dans un seul entier utilisé comme champ de
+    bits (bit i = ligne i) : tout cocher, tout décocher ou cocher une plage
+    ne touche qu'un entier et ne prévient la vue qu'une fois.
+    """
+    RoleDevoir = Qt.UserRole + 1
+    RoleEtat = Qt.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.devoirs = []
+        self.etats = []
+        self.coches = 0
+
+    def definir_devoirs(self, devoirs):
+        """Remplace les devoirs affichés, tous cochés (états d'échéance calculés en une fois)"""
+        self.beginResetModel()
+        self.devoirs = list(devoirs)
+        self.etats = classer_devoirs(self.devoirs)
+        self.coches = (1 << len(self.devoirs)) - 1
+        self.endResetModel()
+
+    def est_coche(self, ligne):
+        return self.coches >> ligne & 1
+
+    def cocher_plage(self, debut, fin, coche):
+        """Coche (ou décoche) les lignes de debut à fin incluses"""
+        if debut > fin or not self.devoirs:
+            return
+        masque = ((1 << (fin - debut + 1)) - 1) << debut
+        self.coches = self.coches | masque if coche else self.coches & ~masque
+        self.dataChanged.emit(self.index(debut), self.index(fin), [Qt.CheckStateRole])
+
+    def cocher_tout(self, coche):
+        self.cocher_plage(0, len(self.devoirs) - 1, coche)
+
+    def devoirs_coches(self):
+        """Devoirs cochés, dans l'ordre de la liste"""
+        bits = bin(self.coches)[:1:-1]  # bit de poids faible (ligne 0) en premier
+        return list(compress(self.devoirs, (bit == "1" for bit in bits)))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.devoirs)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        devoir = self.devoirs[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return devoir.contenu
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.est_coche(index.row()) else Qt.Unchecked
+        if role == self.RoleDevoir:
+            return devoir
+        if role == self.RoleEtat:
+            return self.etats[index.row()]
+        return None
+
+    def setData(self, index, valeur, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        ligne = index.row()
+        self.cocher_plage(ligne, ligne, Qt.CheckState(valeur) == Qt.Checked)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+
+class SelectionDevoirDelegate(QStyledItemDelegate):
+    """Dessine chaque devoir (case, date, contenu) à la demande.
+
+    Un clic sur la ligne coche ou décoche le devoir ; Maj+clic donne le même
+    état à toutes les lignes depuis le dernier clic. Espace coche ou décoche
+    la ligne courante.
+    """
+    HAUTEUR = 44
+
+    def __init__(self, vue):
+        super().__init__(vue)
+        self.vue = vue
+        self.ancre = None  # ligne du dernier clic, origine des plages
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.HAUTEUR)
+
+    def zones(self, rect):
+        """Découpe la ligne rect en zones"""
+        fond = rect.adjusted(5, 3, -5, -3)
+        milieu = fond.center().y()
+        case = QRect(fond.left() + 10, milieu - 10, 20, 20)
+        date = QRect(case.right() + 12, fond.top(), 100, fond.height())
+        contenu = QRect(date.right() + 10, fond.top(), fond.right() - date.right() - 20, fond.height())
+        return {"fond": fond, "case": case, "date": date, "contenu": contenu}
+
+    def paint(self, painter, option, index):
+        devoir = index.data(SelectionDevoirsModel.RoleDevoir)
+        etat = index.data(SelectionDevoirsModel.RoleEtat)
+        coche = index.data(Qt.CheckStateRole) == Qt.Checked
+        zones = self.zones(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#f8f9fa"))
+        painter.drawRoundedRect(QRectF(zones["fond"]), 5, 5)
+
+        # Case à cocher
+        case = zones["case"]
+        painter.setPen(QPen(QColor("#4A90E2"), 2))
+        painter.setBrush(QColor("#4A90E2") if coche else QColor("white"))
+        painter.drawRoundedRect(QRectF(case), 4, 4)
+        if coche:
+            painter.setPen(QPen(QColor("white"), 2))
+            painter.drawPolyline([QPoint(case.left() + 5, case.center().y()),
+                                  QPoint(case.left() + 9, case.bottom() - 5),
+                                  QPoint(case.right() - 4, case.top() + 5)])
+
+        # Date, colorée selon l'état d'échéance
+        police = QFont("Arial", 11)
+        police_gras = QFont(police)
+        police_gras.setBold(True)
+        painter.setFont(police_gras)
+        painter.setPen(QColor(COULEURS_ECHEANCE.get(etat, "#4A90E2")))
+        painter.drawText(zones["date"], Qt.AlignVCenter | Qt.AlignLeft, devoir.date_formatee("%d/%m/%Y"))
+
+        # Contenu
+        painter.setFont(police)
+        painter.setPen(QColor("#333"))
+        texte = QFontMetrics(police).elidedText(devoir.contenu, Qt.ElideRight, zones["contenu"].width())
+        painter.drawText(zones["contenu"], Qt.AlignVCenter | Qt.AlignLeft, texte)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            ligne = index.row()
+            if event.modifiers() & Qt.ShiftModifier and self.ancre is not None and self.ancre < model.rowCount():
+                # Plage depuis le dernier clic, à l'état de la ligne de ce clic
+                model.cocher_plage(min(self.ancre, ligne), max(self.ancre, ligne), model.est_coche(self.ancre))
+            else:
+                model.cocher_plage(ligne, ligne, not model.est_coche(ligne))
+                self.ancre = ligne
+            return True
+        if event.type() == QEvent.MouseButtonDblClick:
+            return True  # le second clic coche ou décoche à son tour, comme une case
+        if event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Space, Qt.Key_Select):
+            ligne = index.row()
+            model.cocher_plage(ligne, ligne, not model.est_coche(ligne))
+            self.ancre = ligne
+            return True
+        return False
+
+
+# ----- Mise en page de la projection -----
+# La taille des textes est la plus grande qui fasse tenir tous les devoirs
+# sur une diapositive (recherche dichotomique entre TAILLE_MIN et
+# TAILLE_MAX). En dessous de TAILLE_MIN, illisible du fond de la salle, les
+# séances sont réparties sur plusieurs diapositives. Les mesures de texte,
+# les mises en page et les images des diapositives sont gardées en cache,
+# indexées par le contenu projeté : revenir à une diapositive ou à une
+# classe déjà projetée ne mesure ni ne redessine rien.
+
+TAILLE_MAX = 28  # points : taille des devoirs quand la place ne manque pas
+TAILLE_MIN = 16
+RAPPORT_TITRE = 32 / 28  # l'en-tête de séance est un peu plus grand que les devoirs
+MARGE_GROUPE = 20  # marge intérieure du cadre d'une séance (pixels)
+ESPACE_GROUPES = 20
+ESPACE_LIGNES = 8
+SEPARATION = 12  # entre l'en-tête d'une séance et ses devoirs (trait compris)
+RETRAIT = 10  # retrait des devoirs sous l'en-tête
+MESURES_MAX = 20000
+MISES_EN_PAGE_MAX = 64
+RENDUS_MAX = 12  # images de diapositives gardées (quelques Mo chacune)
+
+_polices = {}  # (taille, gras) -> (QFont, QFontMetrics)
+_hauteurs = {}  # (taille, gras, largeur, texte) -> hauteur du texte replié à cette largeur
+_mises_en_page = {}  # (contenu, largeur, hauteur) -> (taille, diapositives)
+_rendus = {}  # (contenu, largeur, hauteur, ratio, numéro) -> QPixmap
+
+def contenu_projection(devoirs):
+    """Contenu projeté : ((date, contenus), ...) par séance, dans l'ordre des devoirs (sert aussi de clé aux caches)"""
+    devoirs_par_date = {}
+    for devoir in devoirs:
+        devoirs_par_date.setdefault(devoir.date_formatee("%d/%m/%Y"), []).append(devoir.contenu)
+    return tuple((date, tuple(contenus)) for date, contenus in devoirs_par_date.items())
+
+def _police(taille, gras=False):
+    cle = (taille, gras)
+    police = _polices.get(cle)
+    if police is None:
+        font = QFont("Arial", taille)
+        font.setBold(gras)
+        police = _polices[cle] = (font, QFontMetrics(font))
+    return police
+
+def _hauteur_texte(texte, taille, gras, largeur):
+    """Hauteur du texte replié à cette largeur (mesurée une seule fois)"""
+    cle = (taille, gras, largeur, texte)
+    hauteur = _hauteurs.get(cle)
+    if hauteur is None:
+        if len(_hauteurs) >= MESURES_MAX:
+            _hauteurs.clear()
+        metriques = _police(taille, gras)[1]
+        hauteur = _hauteurs[cle] = metriques.boundingRect(QRect(0, 0, largeur, 0), Qt.TextWordWrap, texte).height()
+    return hauteur
+
+def _taille_titre(taille):
+    return round(taille * RAPPORT_TITRE)
+
+def _hauteur_titre(titre, taille, largeur):
+    """Hauteur d'un cadre de séance vide : marges, en-tête et trait"""
+    return 2 * MARGE_GROUPE + _hauteur_texte(titre, _taille_titre(taille), True, largeur - 2 * MARGE_GROUPE) + SEPARATION
+
+def _hauteur_devoir(contenu, taille, largeur):
+    return _hauteur_texte(f"• {contenu}", taille, False, largeur - 2 * MARGE_GROUPE - RETRAIT)
+
+def _decouper(groupes, taille, largeur, hauteur, limite=None):
+    """Répartit les séances (date, contenus) en diapositives à cette taille de texte.
+
+    Chaque diapositive est une liste de (titre, contenus) ; une séance trop
+    longue continue sur la diapositive suivante. Retourne None dès qu'il
+    faudrait plus de limite diapositives.
+    """
+    diapositives = []
+    morceaux = []  # diapositive en cours
+    y = 0  # hauteur déjà occupée sur la diapositive en cours
+    for date, contenus in groupes:
+        titre = f"Séance du {date}"
+        courant = []
+        occupe = _hauteur_titre(titre, taille, largeur)
+        for contenu in contenus:
+            ligne = _hauteur_devoir(contenu, taille, largeur) + (ESPACE_LIGNES if courant else 0)
+            if y + occupe + ligne > hauteur and (morceaux or courant):
+                # Diapositive pleine : la séance reprend sur la suivante
+                if courant:
+                    morceaux.append((titre, courant))
+                    titre = f"Séance du {date} (suite)"
+                diapositives.append(morceaux)
+                if limite is not None and len(diapositives) >= limite:
+                    return None
+                morceaux, courant, y = [], [], 0
+                occupe = _hauteur_titre(titre, taille, largeur)
+                ligne = _hauteur_devoir(contenu, taille, largeur)
+            courant.append(contenu)
+            occupe += ligne
+        morceaux.append((titre, courant))
+        y += occupe + ESPACE_GROUPES
+    diapositives.append(morceaux)
+    return diapositives
+
+def mettre_en_page(contenu, largeur, hauteur):
+    """Retourne (taille du texte, diapositives) pour projeter contenu ((date, contenus) par séance) dans largeur x hauteur"""
+    cle = (contenu, largeur, hauteur)
+    mise_en_page = _mises_en_page.pop(cle, None)
+    if mise_en_page is None:
+        def tient(taille):
+            return _decouper(contenu, taille, largeur, hauteur, limite=1) is not None
+
+        if tient(TAILLE_MAX):
+            taille = TAILLE_MAX
+        elif not tient(TAILLE_MIN):
+            taille = TAILLE_MIN
+        else:
+            # tient(bas) et pas tient(haut)
+            bas, haut = TAILLE_MIN, TAILLE_MAX
+            while haut - bas > 1:
+                milieu = (bas + haut) // 2
+                if tient(milieu):
+                    bas = milieu
+                else:
+                    haut = milieu
+            taille = bas
+        mise_en_page = (taille, _decouper(contenu, taille, largeur, hauteur))
+        if len(_mises_en_page) >= MISES_EN_PAGE_MAX:
+            del _mises_en_page[next(iter(_mises_en_page))]  # la moins récemment utilisée
+    _mises_en_page[cle] = mise_en_page  # remise en fin : la plus récemment utilisée
+    return mise_en_page
+
+def _dessiner_seances(painter, morceaux, taille, largeur):
+    """Dessine les séances d'une diapositive, chacune dans son cadre"""
+    largeur_titre = largeur - 2 * MARGE_GROUPE
+    largeur_devoir = largeur_titre - RETRAIT
+    police_titre = _police(_taille_titre(taille), True)[0]
+    police_devoir = _police(taille)[0]
+    y = 0
+    for titre, contenus in morceaux:
+        hauteur_en_tete = _hauteur_texte(titre, _taille_titre(taille), True, largeur_titre)
+        hauteurs = [_hauteur_devoir(contenu, taille, largeur) for contenu in contenus]
+        hauteur = 2 * MARGE_GROUPE + hauteur_en_tete + SEPARATION + sum(hauteurs) + ESPACE_LIGNES * max(len(hauteurs) - 1, 0)
+
+        painter.setPen(QPen(QColor("#4A90E2"), 2))
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(QRectF(1, y + 1, largeur - 2, hauteur - 2), 10, 10)
+
+        x = MARGE_GROUPE
+        ligne = y + MARGE_GROUPE
+        painter.setFont(police_titre)
+        painter.drawText(QRect(x, ligne, largeur_titre, hauteur_en_tete), Qt.TextWordWrap, titre)
+        ligne += hauteur_en_tete + SEPARATION // 2
+        painter.setPen(QPen(QColor("#4A90E2"), 1))
+        painter.drawLine(x, ligne, largeur - MARGE_GROUPE, ligne)
+        ligne += SEPARATION - SEPARATION // 2
+
+        painter.setFont(police_devoir)
+        painter.setPen(QColor("#2c3e50"))
+        for contenu, hauteur_devoir in zip(contenus, hauteurs):
+            painter.drawText(QRect(x + RETRAIT, ligne, largeur_devoir, hauteur_devoir), Qt.TextWordWrap, f"• {contenu}")
+            ligne += hauteur_devoir + ESPACE_LIGNES
+        y += hauteur + ESPACE_GROUPES
+
+def dessiner_diapositive(painter, contenu, largeur, hauteur, numero):
+    """Dessine, à l'origine du painter, la diapositive numero de contenu mis en page dans largeur x hauteur"""
+    taille, diapositives = mettre_en_page(contenu, largeur, hauteur)
+    _dessiner_seances(painter, diapositives[numero], taille, largeur)
+
+def rendu_diapositive(contenu, largeur, hauteur, ratio, numero):
+    """Image de la diapositive numero (dessinée une seule fois tant qu'elle reste en cache)"""
+    cle = (contenu, largeur, hauteur, ratio, numero)
+    pixmap = _rendus.pop(cle, None)
+    if pixmap is None:
+        pixmap = QPixmap(round(largeur * ratio), round(hauteur * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        dessiner_diapositive(painter, contenu, largeur, hauteur, numero)
+        painter.end()
+        if len(_rendus) >= RENDUS_MAX:
+            del _rendus[next(iter(_rendus))]
+    _rendus[cle] = pixmap
+    return pixmap
+
+
+class ToileProjection(QWidget):
+    """Affiche une diapositive de la projection (image en cache, mise à l'échelle du widget)"""
+    pagination_modifiee = Signal(int, int)  # numéro de la diapositive affichée, nombre de diapositives
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.contenu = ()
+        self.numero = 0
+        self.nombre = 1
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def definir_contenu(self, contenu):
+        """Projette un nouveau contenu ((date, contenus) par séance), à partir de la première diapositive"""
+        self.contenu = contenu
+        self.numero = 0
+        self.actualiser()
+
+    def actualiser(self):
+        """Refait la pagination pour la taille actuelle (en cache si déjà calculée)"""
+        if self.width() > 0 and self.height() > 0:
+            self.nombre = len(mettre_en_page(self.contenu, self.width(), self.height())[1])
+        self.numero = min(self.numero, self.nombre - 1)
+        self.pagination_modifiee.emit(self.numero, self.nombre)
+        self.update()
+
+    def aller_a(self, numero):
+        numero = max(0, min(numero, self.nombre - 1))
+        if numero != self.numero:
+            self.numero = numero
+            self.pagination_modifiee.emit(self.numero, self.nombre)
+            self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.actualiser()
+
+    def paintEvent(self, event):
+        if not self.contenu or self.width() <= 0 or self.height() <= 0:
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, rendu_diapositive(self.contenu, self.width(), self.height(),
+                                                   self.devicePixelRatioF(), self.numero))
+        painter.end()
+        if self.numero + 1 < self.nombre:
+            # Préparer la diapositive suivante pendant que celle-ci est projetée
+            QTimer.singleShot(0, self.preparer_suivante)
+
+    def preparer_suivante(self):
+        if self.contenu and self.numero + 1 < self.nombre:
+            rendu_diapositive(self.contenu, self.width(), self.height(), self.devicePixelRatioF(), self.numero + 1)
 
 
 class PageProjection(QWidget):
-    """Page d'affichage pour la projection"""
+    """Page d'affichage pour la projection (flèches, Page préc./suiv. : diapositive précédente ou suivante)"""
     def __init__(self, devoirs, classe_nom, main_window=None):
         super().__init__()
-        self.devoirs = devoirs
-        self.classe_nom = classe_nom
         self.main_window = main_window
         self.init_ui()
+        self.definir_devoirs(devoirs, classe_nom)
 
     def init_ui(self):
         layout = QVBoxLayout()
-        layout.setSpacing(30)
+        layout.setSpacing(20)
         layout.setContentsMargins(50, 30, 50, 30)
 
         # Titre avec nom de classe
-        titre = QLabel(f"Devoirs - {self.classe_nom}")
-        titre.setFont(QFont("Arial", 28, QFont.Bold))
-        titre.setAlignment(Qt.AlignCenter)
-        titre.setStyleSheet("color: #2c3e50; padding: 20px;")
-        layout.addWidget(titre)
+        self.titre = QLabel()
+        self.titre.setFont(QFont("Arial", 28, QFont.Bold))
+        self.titre.setAlignment(Qt.AlignCenter)
+        self.titre.setStyleSheet("color: #2c3e50; padding: 20px;")
+        layout.addWidget(self.titre)
 
         # Ligne de séparation
         separator = QFrame()
@@ -291,84 +624,75 @@ class PageProjection(QWidget):
         separator.setFixedHeight(2)
         layout.addWidget(separator)
 
-        # Zone scrollable pour les devoirs
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-        """)
-
-        scroll_widget = QWidget()
-        scroll_layout = QVBoxLayout()
-        scroll_layout.setSpacing(20)
-        scroll_layout.setContentsMargins(20, 20, 20, 20)
-        scroll_layout.setAlignment(Qt.AlignTop)
-
-        # Grouper les devoirs par date
-        from datetime import datetime
-        devoirs_par_date = {}
-        for devoir in self.devoirs:
-            try:
-                date_obj = datetime.strptime(devoir.date, "%Y-%m-%d")
-                date_affichage = date_obj.strftime("%d/%m/%Y")
-            except:
-                date_affichage = devoir.date
-            
-            if date_affichage not in devoirs_par_date:
-                devoirs_par_date[date_affichage] = []
-            devoirs_par_date[date_affichage].append(devoir)
-
-        # Afficher par date
-        for date_affichage, devoirs_date in devoirs_par_date.items():
-            # Groupe de date
-            groupe_widget = QFrame()
-            groupe_widget.setStyleSheet("""
-                QFrame {
-                    background-color: white;
-                    border: 2px solid #4A90E2;
-                    border-radius: 10px;
-                    padding: 15px;
-                    margin: 5px;
+        # Diapositive en cours
+        self.toile = ToileProjection()
+        self.toile.pagination_modifiee.connect(self.pagination_modifiee)
+        layout.addWidget(self.toile, 1)
+
+        # Navigation entre diapositives (masquée s'il n'y en a qu'une)
+        self.navigation = QWidget()
+        navigation_layout = QHBoxLayout()
+        navigation_layout.setContentsMargins(0, 0, 0, 0)
+        navigation_layout.addStretch()
+        self.btn_precedente = QPushButton("◀")
+        self.btn_suivante = QPushButton("▶")
+        self.label_page = QLabel()
+        self.label_page.setFont(QFont("Arial", 14))
+        for bouton in (self.btn_precedente, self.btn_suivante):
+            bouton.setFixedSize(50, 35)
+            bouton.setFocusPolicy(Qt.NoFocus)
+            bouton.setStyleSheet("""
+                QPushButton {
+                    background-color: #4A90E2;
+                    color: white;
+                    border-radius: 8px;
+                    font-size: 14px;
+                }
+                QPushButton:hover {
+                    background-color: #357ABD;
+                }
+                QPushButton:disabled {
+                    background-color: #b0c8e8;
                 }
             """)
-            
-            groupe_layout = QVBoxLayout()
-            groupe_layout.setSpacing(8)
-            groupe_layout.setContentsMargins(10, 10, 10, 10)
-            
-            # En-tête de date
-            date_header = QLabel(f"Séance du {date_affichage}")
-            date_header.setFont(QFont("Arial", 32, QFont.Bold))
-            date_header.setStyleSheet("color: #4A90E2; border: none; padding-bottom: 5px;")
-            groupe_layout.addWidget(date_header)
-            
-            # Ligne de séparation
-            separator_date = QFrame()
-            separator_date.setFrameShape(QFrame.HLine)
-            separator_date.setStyleSheet("background-color: #4A90E2; border: none;")
-            separator_date.setFixedHeight(1)
-            groupe_layout.addWidget(separator_date)
-            
-            # Espacement
-            groupe_layout.addSpacing(5)
-
-            # Liste des devoirs pour cette date
-            for devoir in devoirs_date:
-                contenu_label = QLabel(f"• {devoir.contenu}")
-                contenu_label.setWordWrap(True)
-                contenu_label.setFont(QFont("Arial", 28))
-                contenu_label.setStyleSheet("color: #2c3e50; border: none; padding: 3px 0px 3px 10px;")
-                groupe_layout.addWidget(contenu_label)
-            
-            groupe_widget.setLayout(groupe_layout)
-            scroll_layout.addWidget(groupe_widget)
-
-        scroll_widget.setLayout(scroll_layout)
-        scroll_area.setWidget(scroll_widget)
-        layout.addWidget(scroll_area)
-
-        self.setLayout(layout)
\ No newline at end of file
+        self.btn_precedente.clicked.connect(self.diapositive_precedente)
+        self.btn_suivante.clicked.connect(self.diapositive_suivante)
+        navigation_layout.addWidget(self.btn_precedente)
+        navigation_layout.addWidget(self.label_page)
+        navigation_layout.addWidget(self.btn_suivante)
+        navigation_layout.addStretch()
+        self.navigation.setLayout(navigation_layout)
+        layout.addWidget(self.navigation)
+
+        # Télécommandes de projection : elles envoient Page préc./suiv. ou les flèches
+        self.setFocusPolicy(Qt.StrongFocus)
+        for touches, action in (((Qt.Key_Right, Qt.Key_PageDown, Qt.Key_Space), self.diapositive_suivante),
+                                ((Qt.Key_Left, Qt.Key_PageUp, Qt.Key_Backspace), self.diapositive_precedente)):
+            for touche in touches:
+                QShortcut(QKeySequence(touche), self, action, context=Qt.WidgetWithChildrenShortcut)
+
+        self.setLayout(layout)
+
+    def definir_devoirs(self, devoirs, classe_nom):
+        """Projette ces devoirs (regroupés par séance, dans l'ordre donné)"""
+        self.devoirs = devoirs
+        self.classe_nom = classe_nom
+        self.titre.setText(f"Devoirs - {classe_nom}")
+
+        self.toile.definir_contenu(contenu_projection(devoirs))
+
+    def pagination_modifiee(self, numero, nombre):
+        self.navigation.setVisible(nombre > 1)
+        self.label_page.setText(f"{numero + 1} / {nombre}")
+        self.btn_precedente.setEnabled(numero > 0)
+        self.btn_suivante.setEnabled(numero + 1 < nombre)
+
+    def diapositive_suivante(self):
+        self.toile.aller_a(self.toile.numero + 1)
+
+    def diapositive_precedente(self):
+        self.toile.aller_a(self.toile.numero - 1)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.setFocus()  # pour les touches de la télécommande
@@ -0,0 +1,154 @@
+# screens/theme.py
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QColor
+
+from models.Devoir import AUJOURD_HUI, EN_RETARD
+
+# Couleurs de classe désignées par leur nom (les autres sont en "#rrggbb")
+COULEURS_NOMMEES = {
+    "gris": "128, 128, 128",
+    "bleu": "0, 0, 255",
+    "vert": "0, 128, 0",
+    "rouge": "255, 0, 0",
+    "jaune": "255, 255, 0",
+    "orange": "255, 165, 0",
+    "violet": "128, 0, 128",
+    "rose": "255, 192, 203",
+    "noir": "0, 0, 0",
+    "blanc": "255, 255, 255",
+}
+_couleurs_qcolor = {}
+
+def couleur_classe_qcolor(couleur):
+    """Retourne la QColor d'une couleur de classe ("#rrggbb" ou nom), mise en cache"""
+    qcolor = _couleurs_qcolor.get(couleur)
+    if qcolor is None:
+        if couleur.startswith('#'):
+            qcolor = QColor(couleur)
+        else:
+            r, g, b = (int(v) for v in COULEURS_NOMMEES.get(couleur.lower(), "128, 128, 128").split(","))
+            qcolor = QColor(r, g, b)
+        if not qcolor.isValid():
+            qcolor = QColor(128, 128, 128)
+        _couleurs_qcolor[couleur] = qcolor
+    return qcolor
+
+def cle_couleur(couleur):
+    """Valeur de la propriété "couleur" d'un widget pour une couleur de classe ("rrggbb")"""
+    return couleur_classe_qcolor(couleur).name()[1:]
+
+
+# ----- Feuille de style commune -----
+# Les cartes ne portent pas de feuille de style à elles : elles reçoivent des
+# propriétés dynamiques (couleur, etat) et la feuille de l'application, lue
+# une seule fois par Qt, choisit les règles. Changer d'état revient à changer
+# une propriété et à repolir le widget (voir repolir()).
+
+FEUILLE_BASE = """
+ClasseCard {
+    border-radius: 10px;
+    padding: 10px;
+    margin: 5px;
+}
+ClasseCard QLabel {
+    font-size: 14px;
+    color: #333;
+    padding: 5px;
+    margin: 5px;
+    border-radius: 10px;
+    background-color: transparent;
+}
+QLabel#nom_classe {
+    font-weight: bold;
+    font-size: 16px;
+}
+QLabel#effectif_classe {
+    font-size: 14px;
+    color: #666;
+}
+QLineEdit#edition_nom_classe {
+    font-weight: bold;
+    font-size: 16px;
+    background-color: white;
+    padding: 5px;
+}
+QLineEdit#edition_effectif_classe {
+    font-size: 14px;
+    background-color: white;
+    padding: 5px;
+}
+QPushButton#bouton_couleur_classe {
+    border: 2px solid #ddd;
+    border-radius: 8px;
+    font-size: 14px;
+}
+QPushButton#bouton_couleur_classe:hover {
+    border: 2px solid #999;
+}
+QPushButton#supprimer_classe {
+    background-color: white;
+    color: #dc3545;
+    border: 2px solid #dc3545;
+    border-radius: 8px;
+    font-size: 14px;
+}
+QPushButton#supprimer_classe:hover {
+    background-color: #ffe6e6;
+}
+QPushButton#supprimer_classe:pressed {
+    background-color: #ffcccc;
+}
+"""
+
+# État d'une carte -> (opacité du fond, épaisseur et opacité de la bordure)
+ETATS_CARTE = {
+    "normal": (0.15, 1, 0.3),
+    "survol": (0.25, 2, 0.5),
+    "flash": (0.35, 2, 0.7),
+}
+
+# Couleur de la date selon l'état d'échéance (les autres états gardent le gris par défaut)
+COULEURS_ECHEANCE = {
+    EN_RETARD: "#dc3545",
+    AUJOURD_HUI: "#fd7e14",
+}
+
+_couleurs_feuille = []  # couleurs ("rrggbb") qui ont leurs règles dans la feuille
+_feuille_installee = False
+
+def regles_couleur(cle):
+    """Règles de la feuille commune pour une couleur de classe"""
+    qcolor = QColor(f"#{cle}")
+    rgb = f"{qcolor.red()}, {qcolor.green()}, {qcolor.blue()}"
+    regles = [f'QPushButton#bouton_couleur_classe[couleur="{cle}"] {{ background-color: #{cle}; }}']
+    for etat, (fond, epaisseur, opacite) in ETATS_CARTE.items():
+        carte = f'ClasseCard[couleur="{cle}"][etat="{etat}"]'
+        regles.append(f"{carte} {{ background-color: rgba({rgb}, {fond}); }}")
+        regles.append(f"{carte}, {carte} QLabel {{ border: {epaisseur}px solid rgba({rgb}, {opacite}); }}")
+    return "\n".join(regles)
+
+def declarer_couleurs(couleurs):
+    """Ajoute à la feuille commune les règles des couleurs de classe qui n'y sont pas encore.
+
+    La feuille n'est réinstallée (ce qui repolit toute l'application) que si
+    une couleur est nouvelle : on déclare donc toutes les couleurs d'un coup
+    avant de créer les cartes.
+    """
+    global _feuille_installee
+    nouvelles = False
+    for couleur in couleurs:
+        cle = cle_couleur(couleur)
+        if cle not in _couleurs_feuille:
+            _couleurs_feuille.append(cle)
+            nouvelles = True
+    if nouvelles or not _feuille_installee:
+        feuille = FEUILLE_BASE + "\n".join(regles_couleur(cle) for cle in _couleurs_feuille)
+        QApplication.instance().setStyleSheet(feuille)
+        _feuille_installee = True
+
+def repolir(*widgets):
+    """Réapplique la feuille commune après un changement de propriété"""
+    for widget in widgets:
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
@@ -0,0 +1,85 @@
+# tests/test_classes_orphelines.py
+"""Une classe orpheline (connue seulement de ses devoirs) garde son identifiant d'une session à l'autre.
+
+Chaque session est un processus à part, sur une copie des données dans un dossier temporaire :
+
+    python tests/test_classes_orphelines.py
+    python -m pytest tests/test_classes_orphelines.py
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ("json", "journal", "sqlite")
+
+# Prépare le dépôt d'une session sur le dossier et le backend donnés (argv[1], argv[2])
+DEBUT_SESSION = """
+import sys
+import utils.gestion as gestion
+from utils.stockage import creer_stockage
+from utils.persistance import vider_ecritures
+gestion.DATA_DIR = sys.argv[1]
+gestion._stockage = creer_stockage(sys.argv[2], sys.argv[1])
+"""
+
+# Session 1 : un ancien fichier (devoirs connus par le nom de leur classe) ; la classe 3°Z n'existe plus
+SESSION_ANCIEN_FICHIER = DEBUT_SESSION + """
+gestion.charger_devoirs()
+vider_ecritures()
+"""
+
+# Session 2 : une classe est créée avant tout chargement des devoirs (page des classes ouverte en premier)
+SESSION_NOUVELLE_CLASSE = DEBUT_SESSION + """
+classes = gestion.charger_classes()
+classes.append(gestion.creer_classe("Nouvelle", 20, "gris"))
+gestion.sauvegarder_classes(classes)
+vider_ecritures()
+"""
+
+# Session 3 : chaque devoir doit être rattaché à sa classe d'origine
+SESSION_RELECTURE = DEBUT_SESSION + """
+import json
+print(json.dumps({devoir.contenu: devoir.classe_objet.nom for devoir in gestion.charger_devoirs()}))
+"""
+
+
+def _session(code, dossier, backend):
+    resultat = subprocess.run([sys.executable, "-c", code, dossier, backend], cwd=RACINE,
+                              capture_output=True, text=True, timeout=120)
+    assert resultat.returncode == 0, resultat.stderr
+    return resultat.stdout
+
+
+def verifier_backend(backend):
+    with tempfile.TemporaryDirectory() as dossier:
+        with open(os.path.join(dossier, "classes.json"), "w", encoding="utf-8") as f:
+            json.dump([{"id": 1, "nom": "6°A", "effectif": 25, "couleur": "gris"}], f)
+        with open(os.path.join(dossier, "devoirs.json"), "w", encoding="utf-8") as f:
+            json.dump([
+                {"contenu": "Exercice 1", "classe_nom": "6°A", "date": "2026-03-02", "statut": "Pas fait"},
+                {"contenu": "Exercice 2", "classe_nom": "3°Z", "date": "2026-03-03", "statut": "Pas fait"},
+            ], f)
+
+        _session(SESSION_ANCIEN_FICHIER, dossier, backend)
+        _session(SESSION_NOUVELLE_CLASSE, dossier, backend)
+        rattachements = json.loads(_session(SESSION_RELECTURE, dossier, backend).splitlines()[-1])
+        assert rattachements == {"Exercice 1": "6°A", "Exercice 2": "3°Z"}, (backend, rattachements)
+
+
+def test_json():
+    verifier_backend("json")
+
+def test_journal():
+    verifier_backend("journal")
+
+def test_sqlite():
+    verifier_backend("sqlite")
+
+
+if __name__ == "__main__":
+    for backend in BACKENDS:
+        verifier_backend(backend)
+        print(f"{backend} : OK")
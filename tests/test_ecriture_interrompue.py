@@ -0,0 +1,128 @@
+# tests/test_ecriture_interrompue.py
+"""Un processus qui sauvegarde sans arrêt ses devoirs est tué (SIGKILL) à un instant aléatoire,
+ou se tue lui-même après avoir écrit une partie aléatoire d'un fichier.
+
+devoirs.json doit toujours être une version complète (l'ancienne ou la nouvelle), jamais
+un fichier tronqué ou un mélange des deux, et le stockage suivant nettoie les temporaires.
+
+    python tests/test_ecriture_interrompue.py [nombre d'essais]
+    python -m pytest tests/test_ecriture_interrompue.py
+"""
+import glob
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+NOMBRE_DEVOIRS = 5000
+ESSAIS = 20
+
+# Écrivain : chaque version remplace le contenu de tous les devoirs par "v<version> ...",
+# sauvegardée par la file d'écriture différée comme dans l'application
+ECRIVAIN = """
+import itertools, os, signal, sys, time
+import utils.fichiers as fichiers
+import utils.gestion as gestion
+from models.Devoir import Devoir
+from models.ListeDevoirs import ListeDevoirs
+from utils.stockage import creer_stockage
+from utils.persistance import vider_ecritures
+dossier, nombre, fraction = sys.argv[1], int(sys.argv[2]), float(sys.argv[3])
+gestion.DATA_DIR = dossier
+gestion._stockage = creer_stockage("json", dossier)
+classes = gestion.charger_classes()
+classes.append(gestion.creer_classe("6°A", 25, "gris"))
+gestion.sauvegarder_classes(classes)
+devoirs = ListeDevoirs(Devoir(f"v0 devoir {i}", classes[0], "2026-03-02") for i in range(nombre))
+gestion.sauvegarder_devoirs(devoirs)
+vider_ecritures()
+print("pret", flush=True)
+
+# Fichier qui n'écrit qu'une fraction de ce qu'on lui donne, puis tue le processus
+class EcritureCoupee:
+    def __init__(self, fichier):
+        self.fichier = fichier
+    def __enter__(self):
+        return self
+    def __exit__(self, *args):
+        return self.fichier.__exit__(*args)
+    def write(self, contenu):
+        self.fichier.write(contenu[:int(len(contenu) * fraction)])
+        self.fichier.flush()
+        os.kill(os.getpid(), getattr(signal, "SIGKILL", signal.SIGTERM))
+    def __getattr__(self, nom):
+        return getattr(self.fichier, nom)
+
+if fraction >= 0:
+    fdopen = os.fdopen
+    fichiers.os.fdopen = lambda *args, **kwargs: EcritureCoupee(fdopen(*args, **kwargs))
+for version in itertools.count(1):
+    for i, devoir in enumerate(devoirs):
+        devoir.contenu = f"v{version} devoir {i}"
+    gestion.sauvegarder_devoirs(devoirs)
+    vider_ecritures()  # écritures enchaînées : le processus est souvent tué en pleine écriture
+"""
+
+
+def _versions(chemin):
+    """Versions présentes dans devoirs.json (une seule si le fichier est cohérent)"""
+    with open(chemin, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert len(data) == NOMBRE_DEVOIRS, f"{len(data)} devoirs au lieu de {NOMBRE_DEVOIRS}"
+    return {item["contenu"].split(" ", 1)[0] for item in data}
+
+
+def essai(dossier, delai, fraction=-1):
+    """Lance l'écrivain, le tue après delai secondes (ou le laisse se tuer après avoir écrit fraction
+    du fichier suivant), vérifie le fichier ; True si une écriture a été interrompue"""
+    ecrivain = subprocess.Popen([sys.executable, "-c", ECRIVAIN, dossier, str(NOMBRE_DEVOIRS), str(fraction)], cwd=RACINE,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        assert ecrivain.stdout.readline().strip() == "pret", ecrivain.stderr.read()
+        time.sleep(delai)
+    finally:
+        ecrivain.kill()
+        ecrivain.wait()
+
+    chemin = os.path.join(dossier, "devoirs.json")
+    interrompue = bool(glob.glob(os.path.join(dossier, ".devoirs.json.*.tmp")))
+    versions = _versions(chemin)
+    assert len(versions) == 1, f"mélange de versions : {sorted(versions)}"
+
+    # Au démarrage suivant, le stockage retire les temporaires et relit la même version
+    from utils.stockage import StockageJSON
+    stockage = StockageJSON(dossier)
+    assert not glob.glob(os.path.join(dossier, ".devoirs.json.*.tmp"))
+    assert {item["contenu"].split(" ", 1)[0] for item in stockage.charger_devoirs()} == versions
+    return interrompue
+
+
+def verifier(essais=ESSAIS, graine=None):
+    aleatoire = random.Random(graine)
+    interrompues = 0
+    for numero in range(essais):
+        with tempfile.TemporaryDirectory() as dossier:
+            if numero % 2:
+                # Arrêt en plein fichier : seule l'ancienne version (v0) peut être sur le disque
+                assert essai(dossier, 0.5, aleatoire.random()), "l'écriture aurait dû être interrompue"
+                assert _versions(os.path.join(dossier, "devoirs.json")) == {"v0"}
+                interrompues += 1
+            else:
+                interrompues += essai(dossier, aleatoire.uniform(0.0, 1.5))
+    return interrompues
+
+
+def test_ecriture_interrompue():
+    verifier()
+
+
+if __name__ == "__main__":
+    essais = int(sys.argv[1]) if len(sys.argv) > 1 else ESSAIS
+    interrompues = verifier(essais)
+    print(f"{essais} essais : fichier toujours complet ({interrompues} tués en pleine écriture)")
@@ -0,0 +1,108 @@
+# tests/test_memoire_projection.py
+"""Ouvre 500 projections depuis AccueilWindow (sans affichage) : la mémoire doit rester stable.
+
+La fenêtre ne garde pas plus de PAGES_PROJECTION_MAX pages de projection, les caches
+de mise en page et d'images ne dépassent pas leur limite, et la mémoire du processus
+ne croît plus une fois ces caches remplis. Les données sont dans un dossier temporaire.
+
+    python tests/test_memoire_projection.py [nombre de projections]
+    python -m pytest tests/test_memoire_projection.py
+"""
+import gc
+import os
+import random
+import sys
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+PROJECTIONS = 500
+CROISSANCE_MAX = 40  # Mo tolérés entre la 50e projection et la dernière
+
+def _memoire():
+    """Mémoire résidente du processus en Mo (None si /proc n'est pas disponible)"""
+    try:
+        with open("/proc/self/status") as f:
+            for ligne in f:
+                if ligne.startswith("VmRSS"):
+                    return int(ligne.split()[1]) // 1024
+    except OSError:
+        return None
+
+
+def verifier(projections=PROJECTIONS):
+    from PySide6.QtCore import QCoreApplication, QEvent
+    from PySide6.QtWidgets import QApplication
+    application = QApplication.instance() or QApplication([])
+
+    import utils.gestion as gestion
+    from models.Devoir import Devoir
+    from models.ListeDevoirs import ListeDevoirs
+    from utils.persistance import vider_ecritures
+    from utils.stockage import creer_stockage
+
+    with tempfile.TemporaryDirectory() as dossier:
+        gestion.DATA_DIR = dossier
+        gestion._stockage = creer_stockage("json", dossier)
+        gestion.depot = gestion.Depot()
+        classes = [gestion.creer_classe(f"Classe {i}", 25, "gris") for i in range(12)]
+        gestion.sauvegarder_classes(classes)
+        aleatoire = random.Random(7)
+        gestion.sauvegarder_devoirs(ListeDevoirs(
+            Devoir(f"Exercice {i} " + "relire la leçon " * (i % 3), aleatoire.choice(classes),
+                   f"2026-0{1 + i % 3}-{10 + i % 12}")
+            for i in range(400)
+        ))
+        vider_ecritures()
+
+        from screens import gestion_projection
+        from screens.accueil import AccueilWindow
+        fenetre = AccueilWindow()
+        fenetre.resize(1280, 800)
+        fenetre.show()
+
+        memoire_reference = None
+        for numero in range(projections):
+            fenetre.show_selection_projection()
+            selection = fenetre.selection_projection
+            selection.combo_classe.setCurrentIndex(numero % len(classes))
+            modele = selection.modele
+            modele.cocher_tout(False)
+            modele.cocher_plage(0, aleatoire.randrange(1, modele.rowCount()), True)
+            selection.afficher_projection()
+            application.processEvents()
+            fenetre.stacked_widget.currentWidget().repaint()
+            fenetre.show_accueil()
+            application.processEvents()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+            gc.collect()
+
+            assert len(fenetre.pages_projection) <= AccueilWindow.PAGES_PROJECTION_MAX
+            # Accueil, sélection, projections gardées, et au plus les pages classes/devoirs/paramètres
+            assert fenetre.stacked_widget.count() <= 2 + AccueilWindow.PAGES_PROJECTION_MAX + 3
+            assert len(gestion_projection._rendus) <= gestion_projection.RENDUS_MAX
+            assert len(gestion_projection._mises_en_page) <= gestion_projection.MISES_EN_PAGE_MAX
+            assert len(gestion_projection._hauteurs) <= gestion_projection.MESURES_MAX
+
+            if numero == 49:
+                memoire_reference = _memoire()
+        memoire_finale = _memoire()
+        fenetre.close()
+        fenetre.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    if memoire_reference is not None and memoire_finale is not None:
+        assert memoire_finale - memoire_reference <= CROISSANCE_MAX, (memoire_reference, memoire_finale)
+    return memoire_reference, memoire_finale
+
+
+def test_memoire_projection():
+    verifier()
+
+
+if __name__ == "__main__":
+    projections = int(sys.argv[1]) if len(sys.argv) > 1 else PROJECTIONS
+    reference, finale = verifier(projections)
+    print(f"{projections} projections : {reference} Mo après 50, {finale} Mo à la fin")
@@ -0,0 +1,163 @@
+# tests/test_tri_recherche.py
+"""Mesure les modifications, le tri et la recherche de l'écran des devoirs sur de grandes listes.
+
+Pour chaque taille de liste, DevoirsWidget (sans affichage, données dans un dossier
+temporaire) ajoute, supprime et déplace des devoirs, trie par date puis par classe
+(DevoirsTriModel) et filtre par une recherche tapée lettre à lettre (IndexRecherche).
+Le temps d'un ajout, d'une suppression ou d'un déplacement ne doit pas dépendre de la
+taille de la liste ; l'ordre et le filtre affichés sont comparés à un calcul direct.
+
+    python tests/test_tri_recherche.py [taille ...]
+    python -m pytest tests/test_tri_recherche.py
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+TAILLES = (1000, 10000, 50000)
+REPETITIONS = 40
+RECHERCHE = "exercice 12"
+# Une modification sur la plus grande liste peut prendre au plus FACTEUR_MAX fois
+# le temps mesuré sur la plus petite, plus MARGE_MAX ms (bruit de mesure, écriture disque)
+FACTEUR_MAX = 3
+MARGE_MAX = 10
+
+
+def _chrono(action):
+    """Durée de action() en ms, événements en attente compris"""
+    from PySide6.QtWidgets import QApplication
+    debut = time.perf_counter()
+    action()
+    QApplication.processEvents()
+    return (time.perf_counter() - debut) * 1000
+
+
+def _mediane(action, repetitions=REPETITIONS):
+    return statistics.median(_chrono(action) for _ in range(repetitions))
+
+
+def _affiches(widget):
+    """Devoirs dans l'ordre où la vue les affiche"""
+    from PySide6.QtCore import Qt
+    tri = widget.tri
+    return [tri.index(ligne, 0).data(Qt.UserRole + 1) for ligne in range(tri.rowCount())]
+
+
+def _mesurer(taille, backend, aleatoire):
+    """Mesures (en ms) sur une liste de taille devoirs"""
+    from PySide6.QtCore import QMimeData, Qt, QModelIndex
+
+    import utils.gestion as gestion
+    from models.Devoir import Devoir
+    from models.ListeDevoirs import ListeDevoirs
+    from screens.gestion_devoirs import DevoirsWidget
+    from utils.persistance import vider_ecritures
+    from utils.recherche import normaliser
+    from utils.stockage import creer_stockage
+
+    with tempfile.TemporaryDirectory() as dossier:
+        gestion.DATA_DIR = dossier
+        gestion._stockage = creer_stockage(backend, dossier)
+        gestion.depot = gestion.Depot()
+        classes = [gestion.creer_classe(f"Classe {i}", 25, "gris") for i in range(12)]
+        gestion.sauvegarder_classes(classes)
+        gestion.sauvegarder_devoirs(ListeDevoirs(
+            Devoir(f"Exercice {i} page {aleatoire.randrange(300)}", aleatoire.choice(classes),
+                   f"2026-{1 + i % 9:02d}-{1 + i % 28:02d}")
+            for i in range(taille)
+        ))
+        vider_ecritures()
+        widget = DevoirsWidget()
+        widget.resize(1200, 800)
+        widget.show()
+        mesures = {}
+
+        def ajout():
+            widget.line_content.setText(f"Nouveau devoir {aleatoire.randrange(1000)}")
+            widget.ajouter_devoir()
+
+        def suppression():
+            devoirs = widget.devoirs_list
+            widget.supprimer_devoir(devoirs[aleatoire.randrange(len(devoirs))])
+
+        def deplacement():
+            # Comme un glisser-déposer dans la vue, en passant par le modèle
+            devoirs = widget.devoirs_list
+            deplace = devoirs[aleatoire.randrange(len(devoirs))]
+            cible = aleatoire.randrange(len(devoirs))
+            donnees = QMimeData()
+            donnees.setText(str(deplace.id))
+            widget.modele.dropMimeData(donnees, Qt.MoveAction, cible, 0, QModelIndex())
+
+        # Ordre manuel
+        mesures["ajout"] = _mediane(ajout)
+        mesures["suppression"] = _mediane(suppression)
+        mesures["déplacement"] = _mediane(deplacement)
+        assert _affiches(widget) == list(widget.devoirs_list)
+
+        # Tri par date, puis modifications dans cet ordre
+        mesures["tri date"] = _chrono(lambda: widget.appliquer_tri(("date",)))
+        mesures["ajout (date)"] = _mediane(ajout)
+        mesures["suppression (date)"] = _mediane(suppression)
+        assert _affiches(widget) == sorted(widget.devoirs_list, key=lambda devoir: devoir.jour)
+
+        # Tri par classe puis date
+        mesures["tri classe"] = _chrono(lambda: widget.appliquer_tri(("classe", "date")))
+        affiches = _affiches(widget)
+        assert len(affiches) == len(widget.devoirs_list)
+        cles = [(devoir.classe_objet.nom, devoir.jour) for devoir in affiches]
+        assert cles == sorted(cles)
+
+        # Recherche tapée lettre à lettre, puis effacée
+        mesures["index recherche"] = _chrono(widget.preparer_recherche)
+        frappes = [_chrono(lambda: widget.rechercher(RECHERCHE[:longueur]))
+                   for longueur in range(1, len(RECHERCHE) + 1)]
+        mesures["frappe (max)"] = max(frappes)
+        attendus = [devoir for devoir in affiches
+                    if all(mot in normaliser(f"{devoir.contenu} {devoir.classe_objet.nom}")
+                           for mot in RECHERCHE.split())]
+        assert _affiches(widget) == attendus
+        mesures["recherche effacée"] = _chrono(lambda: widget.rechercher(""))
+        assert len(_affiches(widget)) == len(widget.devoirs_list)
+
+        widget.appliquer_tri(())
+        vider_ecritures()
+        widget.close()
+        widget.deleteLater()
+    return mesures
+
+
+def verifier(tailles=TAILLES, backend="json", afficher=False):
+    from PySide6.QtCore import QCoreApplication, QEvent
+    from PySide6.QtWidgets import QApplication
+    application = QApplication.instance() or QApplication([])
+
+    aleatoire = random.Random(12)
+    resultats = {}
+    for taille in tailles:
+        resultats[taille] = _mesurer(taille, backend, aleatoire)
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        if afficher:
+            print(f"{taille:>6} devoirs : " + ", ".join(f"{nom} {duree:.1f} ms"
+                                                     for nom, duree in resultats[taille].items()), flush=True)
+
+    petite, grande = resultats[min(tailles)], resultats[max(tailles)]
+    for operation in ("ajout", "suppression", "déplacement", "ajout (date)", "suppression (date)"):
+        assert grande[operation] <= FACTEUR_MAX * petite[operation] + MARGE_MAX, (operation, petite[operation], grande[operation])
+    return resultats
+
+
+def test_tri_recherche():
+    verifier()
+
+
+if __name__ == "__main__":
+    tailles = tuple(int(taille) for taille in sys.argv[1:]) or TAILLES
+    verifier(tailles, afficher=True)
@@ -2,6 +2,12 @@
 import json
 import os
 import sys
+import copy
+import itertools
+import threading
+
+from utils.fichiers import ecrire_json_atomique
+from utils.persistance import planifier_ecriture
 
 def get_config_path():
     """Retourne le chemin vers le fichier de configuration"""
@@ -12,14 +18,25 @@ def get_config_path():
         # Mode développement
         application_path = os.path.dirname(os.path.dirname(__file__))
     
+    # Pas de création du dossier à l'import : l'écriture de la configuration s'en charge
     data_path = os.path.join(application_path, 'data')
-    os.makedirs(data_path, exist_ok=True)
     return os.path.join(data_path, 'config.json')
 
 CONFIG_FILE = get_config_path()
 
+# Dernière configuration sauvegardée, tant qu'elle n'est pas encore écrite sur le disque :
+# les lectures la retournent sans attendre la file d'écriture (ni les écritures de données)
+_verrou = threading.Lock()
+_numeros = itertools.count(1)
+_en_attente = None  # (numéro, configuration)
+
 def charger_config():
     """Charge la configuration depuis le fichier JSON"""
+    with _verrou:
+        en_attente = _en_attente
+    if en_attente is not None:
+        return copy.deepcopy(en_attente[1])
+    
     if not os.path.exists(CONFIG_FILE):
         # Configuration par défaut (vide)
         return {
@@ -42,11 +59,20 @@ def charger_config():
         }
 
 def sauvegarder_config(config):
-    """Sauvegarde la configuration dans le fichier JSON"""
-    os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-    
-    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+    """Sauvegarde la configuration dans le fichier JSON (en arrière-plan)"""
+    global _en_attente
+    config = copy.deepcopy(config)
+    with _verrou:
+        _en_attente = (next(_numeros), config)
+        numero = _en_attente[0]
+    planifier_ecriture(_ecrire_config, numero, config, cle="config")
+
+def _ecrire_config(numero, config):
+    global _en_attente
+    ecrire_json_atomique(CONFIG_FILE, config)
+    with _verrou:
+        if _en_attente is not None and _en_attente[0] == numero:
+            _en_attente = None  # le fichier est à jour : les lectures y retournent
 
 def get_lien_ent():
     """Retourne le lien ENT (url et texte)"""
@@ -56,6 +82,21 @@ def get_lien_ent():
         "texte": ""
     })
 
+def get_type_stockage():
+    """Retourne le backend de stockage des données ("json", "journal" ou "sqlite")"""
+    config = charger_config()
+    return config.get("stockage", "json")
+
+def get_taille_historique():
+    """Retourne la mémoire maximale de l'historique annuler/rétablir, en octets (réglée en Mo)"""
+    config = charger_config()
+    return int(float(config.get("historique_mo", 16)) * 1024 * 1024)
+
+def get_prechargement():
+    """Indique si les écrans et les données sont préparés en arrière-plan après le démarrage (à couper si la mémoire manque)"""
+    config = charger_config()
+    return bool(config.get("prechargement", True))
+
 def set_lien_ent(url, texte):
     """Définit le lien ENT"""
     config = charger_config()
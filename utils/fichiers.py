@@ -0,0 +1,92 @@
+# utils/fichiers.py
+import glob
+import json
+import os
+import stat
+import tempfile
+from datetime import datetime
+
+
+def ecrire_atomique(chemin, contenu):
+    """Écrit contenu (bytes) dans chemin sans jamais laisser de fichier à moitié écrit.
+
+    On écrit dans un fichier temporaire du même dossier, on force l'écriture
+    sur le disque (fsync), puis on le renomme par-dessus la cible : après un
+    arrêt brutal, on trouve soit l'ancien fichier complet, soit le nouveau.
+    """
+    dossier = os.path.dirname(chemin) or '.'
+    os.makedirs(dossier, exist_ok=True)
+    fd, temporaire = tempfile.mkstemp(dir=dossier, prefix='.' + os.path.basename(chemin) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(contenu)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(chemin):
+            # mkstemp crée le fichier en 0600 : garder les droits de l'ancien fichier
+            os.chmod(temporaire, stat.S_IMODE(os.stat(chemin).st_mode))
+        os.replace(temporaire, chemin)
+    except BaseException:
+        try:
+            os.remove(temporaire)
+        except OSError:
+            pass
+        raise
+    _synchroniser_dossier(dossier)
+
+def _synchroniser_dossier(dossier):
+    """Rend le renommage durable (POSIX uniquement, sans effet sous Windows)"""
+    if os.name != 'posix':
+        return
+    fd = os.open(dossier, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def ecrire_json_atomique(chemin, data):
+    """Sérialise data en JSON lisible et l'écrit de façon atomique ; retourne les octets écrits"""
+    contenu = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    ecrire_atomique(chemin, contenu)
+    return contenu
+
+def fichier_json_valide(chemin):
+    """Indique si chemin contient un JSON complet et lisible"""
+    try:
+        with open(chemin, 'rb') as f:
+            json.loads(f.read().decode('utf-8'))
+        return True
+    except (OSError, ValueError):
+        return False
+
+def restaurer_si_corrompu(chemin, dossier_sauvegardes, prefixe):
+    """Remplace un fichier JSON tronqué par la plus récente copie lisible de data/backup/.
+
+    Le fichier endommagé est conservé à côté (suffixe .corrompu_<date>).
+    Retourne le chemin de la copie utilisée, ou None si rien n'a été restauré.
+    """
+    # Fichiers temporaires laissés par une écriture interrompue
+    dossier = os.path.dirname(chemin)
+    for temporaire in glob.glob(os.path.join(dossier, '.' + os.path.basename(chemin) + '.*.tmp')):
+        try:
+            os.remove(temporaire)
+        except OSError:
+            pass
+
+    if not os.path.exists(chemin) or fichier_json_valide(chemin):
+        return None
+
+    horodatage = datetime.now().strftime('%Y%m%d_%H%M%S')
+    os.replace(chemin, f"{chemin}.corrompu_{horodatage}")
+
+    candidats = glob.glob(os.path.join(dossier_sauvegardes, f'{prefixe}_*.json'))
+    candidats.sort(key=os.path.getmtime, reverse=True)
+    for candidat in candidats:
+        if fichier_json_valide(candidat):
+            with open(candidat, 'rb') as f:
+                ecrire_atomique(chemin, f.read())
+            print(f"{chemin} était endommagé : restauré depuis {candidat}")
+            return candidat
+
+    print(f"{chemin} était endommagé et aucune sauvegarde lisible n'a été trouvée")
+    return None
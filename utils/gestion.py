@@ -1,10 +1,14 @@
 # utils/gestion.py
-import json
 import os
 import sys
-from datetime import datetime
+from operator import itemgetter
 from models.Classe import Classe
 from models.Devoir import Devoir
+from models.ListeDevoirs import ListeDevoirs
+from utils.config_manager import get_type_stockage
+from utils.historique import historique
+from utils.persistance import planifier_ecriture, vider_ecritures
+from utils.stockage import creer_stockage
 
 # Fonction pour obtenir le bon chemin, que ce soit en développement ou en .exe
 def get_data_path():
@@ -16,98 +20,412 @@ def get_data_path():
         # Mode développement : chemin relatif classique
         application_path = os.path.dirname(os.path.dirname(__file__))
     
-    data_path = os.path.join(application_path, 'data')
-    os.makedirs(data_path, exist_ok=True)  # Créer le dossier s'il n'existe pas
-    return data_path
+    # Le dossier n'est créé qu'au premier accès au stockage (get_stockage), pas à l'import
+    return os.path.join(application_path, 'data')
 
 # Utiliser la fonction pour définir les chemins
 DATA_DIR = get_data_path()
 CLASSES_FILE = os.path.join(DATA_DIR, 'classes.json')
 DEVOIRS_FILE = os.path.join(DATA_DIR, 'devoirs.json')
 
-def charger_classes():
-    """Charge les classes depuis le fichier JSON et retourne une liste d'instances de Classe"""
-    if not os.path.exists(CLASSES_FILE):
-        return []  # Retourne une liste vide si le fichier n'existe pas
+_stockage = None
+
+def get_stockage():
+    """Retourne le backend de stockage configuré (JSON par défaut)"""
+    global _stockage
+    if _stockage is None:
+        os.makedirs(DATA_DIR, exist_ok=True)  # Créer le dossier s'il n'existe pas
+        _stockage = creer_stockage(get_type_stockage(), DATA_DIR)
+    return _stockage
 
-    with open(CLASSES_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def classes_depuis_donnees(data, cible=None):
+    """Retourne les instances de Classe décrites par des dictionnaires (une seule instance par identifiant).
 
-    # Reconstruire les instances de Classe
+    Les classes sont celles du dépôt partagé, mises à jour sur place, sauf si un autre Depot est donné en cible.
+    """
+    depot_cible = cible if cible is not None else depot
     classes = []
+    ids_vus = set()
     for item in data:
-        classe = Classe(
+        id_classe = item.get("id")
+        if id_classe in ids_vus:
+            id_classe = depot_cible.nouvel_id_classe()  # identifiant en double : la seconde classe en reçoit un neuf
+        classe = depot_cible.classe(
             nom=item["nom"],
             effectif=item["effectif"],
-            couleur=item.get("couleur", "gris")  # valeur par défaut si absent
+            couleur=item.get("couleur", "gris"),  # valeur par défaut si absent
+            id=id_classe
         )
+        ids_vus.add(classe.id)
         classes.append(classe)
-
     return classes
 
-def sauvegarder_classes(classes):
-    """Sauvegarde une liste d'instances de Classe dans un fichier JSON"""
-    # Convertir chaque instance en dictionnaire
-    data = []
-    for classe in classes:
-        data.append({
-            "nom": classe.nom,
-            "effectif": classe.effectif,
-            "couleur": classe.couleur
-        })
-
-    # Créer le dossier data s'il n'existe pas
-    os.makedirs(os.path.dirname(CLASSES_FILE), exist_ok=True)
-
-    # Sauvegarder dans le fichier
-    with open(CLASSES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def charger_devoirs():
-    """Charge les devoirs depuis le fichier JSON et retourne une liste d'instances de Devoir"""
-    if not os.path.exists(DEVOIRS_FILE):
-        return []  # Retourne une liste vide si le fichier n'existe pas
-
-    with open(DEVOIRS_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Charger les classes pour les lier aux devoirs
-    classes = charger_classes()  # Appel à charger_classes() ici → pas besoin de passer en paramètre
-    classes_dict = {classe.nom: classe for classe in classes}  # dictionnaire nom -> objet
+def devoirs_depuis_donnees(data, classes, cible=None):
+    """Reconstruit une ListeDevoirs à partir de dictionnaires, liés aux classes données (orphelines : voir classes_depuis_donnees)"""
+    depot_cible = cible if cible is not None else depot
+    classes_par_id = {classe.id: classe for classe in classes}  # dictionnaire id -> objet
+    classes_par_nom = {classe.nom: classe for classe in reversed(classes)}  # anciens fichiers (premier nom retenu)
 
-    # Reconstruire les instances de Devoir
-    devoirs = []
+    devoirs = ListeDevoirs()
     for item in data:
-        classe_objet = classes_dict.get(item["classe_nom"])  # récupère l'objet Classe par nom
+        classe_id = item.get("classe_id")
+        if classe_id is not None:
+            classe_objet = classes_par_id.get(classe_id)
+        else:
+            # Ancien fichier : le devoir ne connaît que le nom de sa classe
+            classe_objet = classes_par_nom.get(item["classe_nom"])
+            devoirs.ids_attribues = True
         if not classe_objet:
-            # Si la classe n'existe pas, on la crée temporairement avec une couleur par défaut
-            classe_objet = Classe(nom=item["classe_nom"], effectif=0, couleur="gris")
+            # Si la classe n'existe pas, une seule instance grise est partagée par tous ses devoirs
+            classe_objet = depot_cible.classe_orpheline(item.get("classe_nom", "Inconnue"), classe_id)
 
         devoir = Devoir(
             contenu=item["contenu"],
             classe_objet=classe_objet,
             date=item["date"],
-            statut=item["statut"]
+            statut=item["statut"],
+            id=item.get("id")
         )
         devoirs.append(devoir)
-
     return devoirs
 
+class Depot:
+    """Classes et devoirs chargés en mémoire, partagés par tous les écrans.
+
+    Les listes retournées sont celles du dépôt : un écran qui les modifie
+    puis les sauvegarde garde le dépôt à jour. Le stockage n'est relu que si
+    sa date de modification ou sa taille a changé depuis notre dernière
+    lecture ou écriture (modification extérieure, import...). Une relecture
+    met à jour ces listes sur place.
+
+    Chaque classe n'existe qu'en un exemplaire (classes_par_id) : la carte
+    de la classe, la liste déroulante et tous ses devoirs partagent le même
+    objet, si bien qu'un changement de nom ou de couleur est vu partout.
+    Les devoirs sont enregistrés avec l'identifiant de leur classe : un
+    renommage ne réécrit que les classes. classes_par_nom ne sert qu'aux
+    anciens fichiers et aux devoirs orphelins, connus par leur seul nom.
+    """
+    def __init__(self):
+        self.classes = None
+        self.devoirs = None
+        self.signatures = {"classes": None, "devoirs": None}
+        self.classes_par_id = {}
+        self.classes_par_nom = {}
+        self.prochain_id_classe = 1
+        self.ids_devoirs_reserves = False  # True une fois pris en compte les classe_id des devoirs enregistrés
+
+    def nouvel_id_classe(self):
+        """Réserve un identifiant de classe inutilisé, y compris par les devoirs enregistrés"""
+        if not self.ids_devoirs_reserves:
+            # Devoirs pas encore chargés : l'identifiant d'une classe orpheline n'est connu que
+            # d'eux, il ne doit pas être redonné à une nouvelle classe
+            self.ids_devoirs_reserves = True
+            ids = [item.get("classe_id") for item in get_stockage().charger_devoirs()]
+            self.prochain_id_classe = max([self.prochain_id_classe] + [i + 1 for i in ids if isinstance(i, int)])
+        id_classe = self.prochain_id_classe
+        self.prochain_id_classe += 1
+        return id_classe
+
+    def _enregistrer(self, classe):
+        if classe.id is None:
+            classe.id = self.nouvel_id_classe()
+        self.classes_par_id[classe.id] = classe
+        self.classes_par_nom.setdefault(classe.nom, classe)
+        self.prochain_id_classe = max(self.prochain_id_classe, classe.id + 1)
+        return classe
+
+    def classe(self, nom, effectif=0, couleur="gris", id=None):
+        """Retourne l'unique instance de Classe de cet identifiant (à défaut de ce nom), créée ou mise à jour"""
+        if id is not None:
+            classe = self.classes_par_id.get(id)
+        else:
+            classe = self.classes_par_nom.get(nom)
+        if classe is None:
+            return self._enregistrer(Classe(nom=nom, effectif=effectif, couleur=couleur, id=id))
+        if classe.nom != nom:
+            self.renommer_classe(classe, nom)
+        classe.modifier_effectif(effectif)
+        classe.modifier_couleur(couleur)
+        return classe
+
+    def nouvelle_classe(self, nom, effectif, couleur):
+        """Crée une classe (ou redonne vie à celle de devoirs orphelins du même nom)"""
+        classe = self.classes_par_nom.get(nom)
+        if classe is None or (self.classes is not None and any(c is classe for c in self.classes)):
+            return self._enregistrer(Classe(nom=nom, effectif=effectif, couleur=couleur))
+        classe.modifier_effectif(effectif)
+        classe.modifier_couleur(couleur)
+        return classe
+
+    def classe_orpheline(self, nom, id=None):
+        """Retourne l'instance d'une classe absente de la liste (grise à sa première apparition)"""
+        classe = self.classes_par_id.get(id) if id is not None else self.classes_par_nom.get(nom)
+        if classe is None:
+            classe = self._enregistrer(Classe(nom=nom, effectif=0, couleur="gris", id=id))
+        return classe
+
+    def renommer_classe(self, classe, nouveau_nom):
+        """Renomme une classe en gardant l'index par nom cohérent"""
+        if self.classes_par_nom.get(classe.nom) is classe:
+            del self.classes_par_nom[classe.nom]
+        classe.nom = nouveau_nom
+        self.classes_par_nom[nouveau_nom] = classe
+
+    def oublier_classe(self, classe):
+        """Retire des index une classe supprimée"""
+        if self.classes_par_id.get(classe.id) is classe:
+            del self.classes_par_id[classe.id]
+        if self.classes_par_nom.get(classe.nom) is classe:
+            del self.classes_par_nom[classe.nom]
+
+    def reprendre_classe(self, classe):
+        """Remet dans les index une classe supprimée puis restaurée (même identifiant)"""
+        self._enregistrer(classe)
+
+    def _est_a_jour(self, nom):
+        signature = self.signatures[nom]
+        if signature is None:
+            return False
+        lire_signature = getattr(get_stockage(), "signature_" + nom)
+        if lire_signature() == signature:
+            return True
+        # L'écart vient peut-être d'une de nos écritures en cours : on attend qu'elle finisse
+        vider_ecritures()
+        return lire_signature() == self.signatures[nom]
+
+    def signer(self, nom):
+        """Mémorise l'état actuel du stockage comme identique à la mémoire (après nos écritures)"""
+        if self.signatures[nom] is not None:
+            self.signatures[nom] = getattr(get_stockage(), "signature_" + nom)()
+
+    def _remplacer(self, nom, elements):
+        """Met à jour la liste nom sur place (les écrans qui la tiennent voient le changement)"""
+        liste = getattr(self, nom)
+        if liste is None:
+            setattr(self, nom, ListeDevoirs(elements) if nom == "devoirs" and not isinstance(elements, ListeDevoirs) else elements)
+        elif liste is not elements:
+            liste[:] = elements
+
+    def charger_classes(self):
+        """Retourne la liste des classes, relue seulement si le stockage a changé"""
+        if self.classes is None or not self._est_a_jour("classes"):
+            if self.classes is not None:
+                historique.vider()  # nouveaux objets : les deltas de l'historique ne s'y appliquent plus
+            vider_ecritures()  # Lire ce qui a été sauvegardé, même si l'écriture était en attente
+            stockage = get_stockage()
+            self.signatures["classes"] = stockage.signature_classes()
+            data = stockage.charger_classes()
+            self._remplacer("classes", classes_depuis_donnees(data))
+            if any(item.get("id") != classe.id for item, classe in zip(data, self.classes)):
+                # Ancien fichier sans identifiants : on enregistre ceux qui viennent d'être attribués
+                sauvegarder_classes(self.classes)
+        return self.classes
+
+    def charger_devoirs(self):
+        """Retourne la liste des devoirs, relue seulement si le stockage a changé"""
+        classes = self.charger_classes()
+        if self.devoirs is None or not self._est_a_jour("devoirs"):
+            if self.devoirs is not None:
+                historique.vider()
+            vider_ecritures()
+            stockage = get_stockage()
+            self.signatures["devoirs"] = stockage.signature_devoirs()
+            self.ids_devoirs_reserves = True  # les classes orphelines sont enregistrées avec leur identifiant
+            devoirs = devoirs_depuis_donnees(stockage.charger_devoirs(), classes)
+            self._remplacer("devoirs", devoirs)
+            if devoirs.ids_attribues:
+                # Ancien fichier sans identifiants (de devoir ou de classe) : on enregistre ceux qui viennent d'être attribués
+                sauvegarder_devoirs(self.devoirs)
+        return self.devoirs
+
+    def instantane(self):
+        """État des classes connues (index et valeur des champs), à passer à restaurer()"""
+        return (dict(self.classes_par_id), dict(self.classes_par_nom), self.prochain_id_classe,
+                [(classe, classe.nom, classe.effectif, classe.couleur) for classe in self.classes_par_id.values()])
+
+    def restaurer(self, etat):
+        """Remet les classes dans l'état d'un instantane() (après un import qui a échoué)"""
+        classes_par_id, classes_par_nom, self.prochain_id_classe, champs = etat
+        self.classes_par_id = dict(classes_par_id)
+        self.classes_par_nom = dict(classes_par_nom)
+        for classe, nom, effectif, couleur in champs:
+            classe.nom, classe.effectif, classe.couleur = nom, effectif, couleur
+
+    def adopter_classes(self, classes):
+        """La liste sauvegardée devient le contenu de référence"""
+        self._remplacer("classes", classes)
+
+    def adopter_devoirs(self, devoirs):
+        """La liste sauvegardée devient le contenu de référence"""
+        self._remplacer("devoirs", devoirs)
+
+
+depot = Depot()
+
+def _ecrire_puis_signer(nom, fonction, *args):
+    """Exécute une écriture (thread d'écriture) puis met à jour la signature du dépôt"""
+    fonction(*args)
+    depot.signer(nom)
+
+def charger_classes():
+    """Retourne la liste (partagée) des instances de Classe"""
+    return depot.charger_classes()
+
+def verifier_donnees(data_classes, data_devoirs):
+    """Reconstruit classes et devoirs dans un dépôt à part : lève une exception si les données sont invalides, sans rien modifier"""
+    brouillon = Depot()
+    brouillon.ids_devoirs_reserves = True  # rien à réserver : ce dépôt n'a pas de stockage
+    devoirs_depuis_donnees(data_devoirs, classes_depuis_donnees(data_classes, brouillon), brouillon)
+
+def instantane_classes():
+    """État des classes du dépôt, à passer à restaurer_classes()"""
+    return depot.instantane()
+
+def restaurer_classes(etat):
+    """Remet les classes du dépôt dans l'état d'instantane_classes()"""
+    depot.restaurer(etat)
+
+def creer_classe(nom, effectif, couleur):
+    """Retourne une nouvelle instance de Classe (celle des devoirs orphelins de ce nom s'il y en a)"""
+    return depot.nouvelle_classe(nom, effectif, couleur)
+
+def renommer_classe(classe, nouveau_nom):
+    """Renomme une classe partagée par tous les écrans (ses devoirs la référencent par identifiant)"""
+    depot.renommer_classe(classe, nouveau_nom)
+
+def devoirs_de_classe(classe):
+    """Retourne les devoirs rattachés à une classe"""
+    return depot.charger_devoirs().devoirs_de_classe(classe)
+
+def devoirs_de_classe_par_date(classe):
+    """Retourne les devoirs rattachés à une classe, par date croissante (index tenu à jour, sans tri)"""
+    return depot.charger_devoirs().devoirs_de_classe_par_date(classe)
+
+def retirer_classe(classe, reassigner_a=None):
+    """Supprime une classe : ses devoirs sont supprimés avec elle, ou rattachés à reassigner_a.
+
+    Retourne les devoirs de la classe avec leur position d'avant la suppression
+    ((position, devoir), par positions croissantes), pour restaurer_classe().
+    """
+    classes = depot.charger_classes()
+    devoirs = depot.charger_devoirs()
+    concernes = devoirs.devoirs_de_classe(classe)
+    elements = sorted(((devoirs.index(devoir), devoir) for devoir in concernes), key=itemgetter(0))
+    if concernes:
+        # Une seule opération de stockage pour tous les devoirs de la classe
+        if reassigner_a is None:
+            devoirs.retirer_devoirs(concernes)
+            _planifier_operation("supprimer_devoirs_classe", devoirs, (), classe.id)
+        else:
+            for devoir in concernes:
+                devoirs.changer_classe(devoir, reassigner_a)
+            _planifier_operation("reassigner_devoirs_classe", devoirs, (), classe.id, reassigner_a)
+
+    classes[:] = [c for c in classes if c is not classe]
+    depot.oublier_classe(classe)
+    sauvegarder_classes(classes)
+    return elements
+
+def restaurer_classe(classe, position, elements, reassignes=False):
+    """Défait retirer_classe() : remet la classe à sa position et ses devoirs (elements) dans leur état d'avant"""
+    classes = depot.charger_classes()
+    devoirs = depot.charger_devoirs()
+    depot.reprendre_classe(classe)
+    classes.insert(position, classe)
+    if elements:
+        if reassignes:
+            for _, devoir in elements:
+                devoirs.changer_classe(devoir, classe)
+            indexes = sorted(map(devoirs.index, map(itemgetter(1), elements)))
+            _planifier_operation("modifier_devoirs", devoirs, indexes, indexes)
+        else:
+            for index, devoir in elements:
+                devoirs.insert(index, devoir)
+            indexes = [index for index, _ in elements]
+            _planifier_operation("ajouter_devoirs", devoirs, indexes, indexes)
+    sauvegarder_classes(classes)
+
+def sauvegarder_classes(classes):
+    """Sauvegarde une liste d'instances de Classe (en arrière-plan)"""
+    depot.adopter_classes(classes)
+    planifier_ecriture(_ecrire_puis_signer, "classes", get_stockage().sauvegarder_classes, list(classes), cle="classes")
+
+def charger_devoirs():
+    """Retourne la liste (partagée) des instances de Devoir, liées aux classes"""
+    return depot.charger_devoirs()
+
 def sauvegarder_devoirs(devoirs):
-    """Sauvegarde une liste d'instances de Devoir dans un fichier JSON"""
-    # Convertir chaque instance en dictionnaire
-    data = []
-    for devoir in devoirs:
-        data.append({
-            "contenu": devoir.contenu,
-            "classe_nom": devoir.classe_objet.nom,  # on stocke le nom, pas l'objet
-            "date": devoir.date,
-            "statut": devoir.statut
-        })
-
-    # Créer le dossier data s'il n'existe pas
-    os.makedirs(os.path.dirname(DEVOIRS_FILE), exist_ok=True)
-
-    # Sauvegarder dans le fichier
-    with open(DEVOIRS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
\ No newline at end of file
+    """Sauvegarde une liste complète d'instances de Devoir (en arrière-plan)"""
+    depot.adopter_devoirs(devoirs)
+    stockage = get_stockage()
+    if stockage.ecriture_unitaire:
+        # Des opérations unitaires peuvent la suivre dans la file : copie de la liste telle qu'elle est maintenant
+        planifier_ecriture(_ecrire_puis_signer, "devoirs", stockage.sauvegarder_devoirs, list(devoirs), cle="devoirs")
+    else:
+        # Chaque modification réécrit tout : une seule copie, prise par le thread d'écriture (la plus récente)
+        planifier_ecriture(_ecrire_puis_signer, "devoirs", _ecrire_copie, stockage.sauvegarder_devoirs, devoirs, cle="devoirs")
+
+def _ecrire_copie(ecrire, devoirs):
+    # list.copy est une seule opération C : le thread de l'interface ne peut pas modifier la liste pendant la copie
+    ecrire(list.copy(devoirs))
+
+# Opérations unitaires : la liste passée est déjà modifiée en mémoire, le
+# backend n'écrit que ce qui a changé quand il le peut (journal, SQLite).
+# Les écritures étant différées, on ne transmet pas la liste elle-même mais
+# un Extrait : les devoirs des positions concernées et de leurs voisines,
+# tels qu'au moment de la modification.
+
+class Extrait:
+    """Devoirs de quelques positions d'une liste (et de leurs voisines), avec la longueur de la liste à ce moment"""
+    __slots__ = ("longueur", "devoirs")
+
+    def __init__(self, devoirs, indexes):
+        self.longueur = len(devoirs)
+        self.devoirs = {voisin: devoirs[voisin] for index in indexes for voisin in (index - 1, index, index + 1)
+                        if 0 <= voisin < self.longueur}
+
+    def __len__(self):
+        return self.longueur
+
+    def __getitem__(self, index):
+        return self.devoirs[index]
+
+def _planifier_operation(operation, devoirs, indexes, *args, cle=None):
+    """Planifie stockage.operation(extrait, *args) ; indexes : positions de devoirs que l'opération lit"""
+    stockage = get_stockage()
+    if not stockage.ecriture_unitaire:
+        # Le backend réécrit tout à chaque fois : autant ne garder que la dernière écriture
+        sauvegarder_devoirs(devoirs)
+        return
+    planifier_ecriture(_ecrire_puis_signer, "devoirs", getattr(stockage, operation), Extrait(devoirs, indexes), *args, cle=cle)
+
+def sauvegarder_ajout_devoir(devoirs, index):
+    """Enregistre le devoir qui vient d'être inséré en devoirs[index]"""
+    _planifier_operation("ajouter_devoir", devoirs, (index,), index)
+
+def sauvegarder_modification_devoir(devoirs, index):
+    """Enregistre la modification (contenu, statut...) de devoirs[index]"""
+    # Plusieurs modifications du même devoir se regroupent en une seule écriture
+    _planifier_operation("modifier_devoir", devoirs, (index,), index, cle=("maj", devoirs[index].id))
+
+def sauvegarder_suppression_devoir(devoirs, devoir, index):
+    """Enregistre la suppression d'un devoir qui occupait la position index"""
+    _planifier_operation("supprimer_devoir", devoirs, (), devoir, index)
+
+def sauvegarder_ajout_devoirs(devoirs, indexes):
+    """Enregistre en une seule écriture les devoirs qui viennent d'être insérés aux positions indexes (croissantes)"""
+    indexes = list(indexes)
+    _planifier_operation("ajouter_devoirs", devoirs, indexes, indexes)
+
+def sauvegarder_modification_devoirs(devoirs, indexes):
+    """Enregistre en une seule écriture la modification de plusieurs devoirs (devoirs[i] pour i dans indexes)"""
+    indexes = list(indexes)
+    _planifier_operation("modifier_devoirs", devoirs, indexes, indexes)
+
+def sauvegarder_suppression_devoirs(devoirs, supprimes):
+    """Enregistre en une seule écriture la suppression de plusieurs devoirs (déjà retirés de la liste)"""
+    _planifier_operation("supprimer_devoirs", devoirs, (), [devoir.id for devoir in supprimes])
+
+def sauvegarder_deplacement_devoir(devoirs, ancien_index, nouvel_index):
+    """Enregistre le déplacement d'un devoir dans l'ordre manuel"""
+    _planifier_operation("deplacer_devoir", devoirs, (nouvel_index,), ancien_index, nouvel_index)
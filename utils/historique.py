@@ -0,0 +1,104 @@
+# utils/historique.py
+import sys
+import traceback
+from collections import deque
+
+from utils.config_manager import get_taille_historique
+
+
+def estimer_taille(delta):
+    """Estimation (en octets) de la mémoire retenue par un delta : conteneurs, valeurs et devoirs qu'il garde"""
+    taille = 0
+    a_voir = [delta]
+    while a_voir:
+        valeur = a_voir.pop()
+        taille += sys.getsizeof(valeur)
+        if isinstance(valeur, (list, tuple, set)):
+            a_voir.extend(valeur)
+        elif isinstance(valeur, dict):
+            a_voir.extend(valeur.values())
+        elif hasattr(valeur, "contenu"):
+            taille += sys.getsizeof(valeur.contenu)  # devoir retiré : seul l'historique le garde
+    return taille
+
+
+class Historique:
+    """Pile annuler / rétablir des modifications de classes et de devoirs.
+
+    Une entrée ne garde pas une copie des données mais le seul delta de la
+    modification (devoirs supprimés et leur position, anciennes et
+    nouvelles valeurs des champs changés...), avec deux fonctions qui
+    l'appliquent dans un sens ou dans l'autre par les mêmes chemins que les
+    modifications faites à la main (écriture unitaire, mise à jour des
+    seules lignes concernées). Pendant qu'une entrée est rejouée, les
+    modifications qu'elle fait ne sont pas enregistrées à nouveau.
+
+    La taille des deltas est estimée à l'enregistrement : au-delà de
+    taille_max octets (clé "historique_mo" de la configuration), les
+    entrées les plus anciennes sont oubliées.
+    """
+    def __init__(self, taille_max=None):
+        self.taille_max = taille_max  # None : lue dans la configuration au premier enregistrement
+        self.taille = 0
+        self._annulables = deque()  # (libellé, annuler, refaire, taille), la plus récente à droite
+        self._retablissables = []
+        self.en_cours = False
+
+    def enregistrer(self, libelle, annuler, refaire, delta):
+        """Ajoute une modification qui vient d'être faite ; delta est ce que gardent annuler() et refaire()"""
+        if self.en_cours:
+            return
+        if self.taille_max is None:
+            self.taille_max = get_taille_historique()
+        # Une nouvelle modification rend impossible de rétablir celles qui avaient été annulées
+        self.taille -= sum(entree[3] for entree in self._retablissables)
+        self._retablissables.clear()
+        taille = estimer_taille(delta)
+        self._annulables.append((libelle, annuler, refaire, taille))
+        self.taille += taille
+        # La plus récente reste, même si elle dépasse à elle seule la limite
+        while self.taille > self.taille_max and len(self._annulables) > 1:
+            self.taille -= self._annulables.popleft()[3]
+
+    def _rejouer(self, fonction):
+        """Applique un delta ; s'il ne s'applique plus (données changées entre-temps), l'historique est vidé"""
+        self.en_cours = True
+        try:
+            fonction()
+            return True
+        except Exception as e:
+            print(f"Erreur lors de l'annulation ou du rétablissement : {e}")
+            traceback.print_exc()
+            self.vider()
+            return False
+        finally:
+            self.en_cours = False
+
+    def annuler(self):
+        """Défait la dernière modification et retourne son libellé (None s'il n'y a rien à annuler)"""
+        if not self._annulables:
+            return None
+        entree = self._annulables.pop()
+        if not self._rejouer(entree[1]):
+            return None
+        self._retablissables.append(entree)
+        return entree[0]
+
+    def retablir(self):
+        """Refait la dernière modification annulée et retourne son libellé (None s'il n'y en a pas)"""
+        if not self._retablissables:
+            return None
+        entree = self._retablissables.pop()
+        if not self._rejouer(entree[2]):
+            return None
+        self._annulables.append(entree)
+        return entree[0]
+
+    def vider(self):
+        """Oublie tout l'historique (les données ont été relues : les deltas ne s'appliquent plus)"""
+        self._annulables.clear()
+        self._retablissables.clear()
+        self.taille = 0
+
+
+historique = Historique()
@@ -0,0 +1,99 @@
+# utils/persistance.py
+import atexit
+import itertools
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+
+class FileEcriture:
+    """File d'écritures différées, exécutées dans l'ordre par un seul thread.
+
+    Les écritures planifiées avec la même clé se remplacent : seule la
+    dernière est exécutée, à la place de la plus récente (les écritures
+    planifiées entre-temps passent donc avant elle). Le thread attend que
+    DELAI secondes se soient écoulées sans nouvelle écriture avant de vider
+    la file, ce qui regroupe les clics rapprochés.
+    """
+    DELAI = 0.2
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.taches = OrderedDict()  # clé -> (fonction, args)
+        self.compteur = itertools.count()  # clés des écritures non regroupables
+        self.derniere_planification = 0.0
+        self.vidage_demande = False
+        self.en_cours = False
+        self.thread = None
+
+    def planifier(self, fonction, *args, cle=None):
+        """Ajoute une écriture à la file (remplace celle de même clé si elle attend encore)"""
+        with self.condition:
+            if cle is None:
+                cle = ("unique", next(self.compteur))
+            else:
+                self.taches.pop(cle, None)
+            self.taches[cle] = (fonction, args)
+            self.derniere_planification = time.monotonic()
+
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._boucle, name="ecriture-donnees", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def vider(self):
+        """Exécute immédiatement les écritures en attente et attend leur fin"""
+        if threading.current_thread() is self.thread:
+            return  # Appel depuis une écriture : rien à attendre
+        with self.condition:
+            if not self.taches and not self.en_cours:
+                return
+            self.vidage_demande = True
+            self.condition.notify_all()
+            while self.taches or self.en_cours:
+                self.condition.wait()
+
+    def _boucle(self):
+        while True:
+            with self.condition:
+                while not self.taches:
+                    self.condition.wait()
+
+                # Regrouper les écritures tant que l'utilisateur enchaîne les actions
+                while not self.vidage_demande:
+                    reste = self.derniere_planification + self.DELAI - time.monotonic()
+                    if reste <= 0:
+                        break
+                    self.condition.wait(reste)
+
+                taches = list(self.taches.values())
+                self.taches.clear()
+                self.en_cours = True
+
+            for fonction, args in taches:
+                try:
+                    fonction(*args)
+                except Exception as e:
+                    print(f"Erreur lors de l'écriture des données: {e}")
+                    traceback.print_exc()
+
+            with self.condition:
+                self.en_cours = False
+                if not self.taches:
+                    self.vidage_demande = False
+                self.condition.notify_all()
+
+
+_file = FileEcriture()
+
+def planifier_ecriture(fonction, *args, cle=None):
+    """Planifie fonction(*args) sur le thread d'écriture"""
+    _file.planifier(fonction, *args, cle=cle)
+
+def vider_ecritures():
+    """Attend que toutes les écritures planifiées soient sur le disque"""
+    _file.vider()
+
+# Ne rien perdre si l'application se termine sans passer par la fermeture de la fenêtre
+atexit.register(vider_ecritures)
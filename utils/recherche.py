@@ -0,0 +1,179 @@
+# utils/recherche.py
+import re
+import unicodedata
+
+
+class _TableSansAccents(dict):
+    """Table pour str.translate : chaque caractère sans ses accents, calculé à sa première rencontre"""
+    def __missing__(self, code):
+        decompose = unicodedata.normalize("NFD", chr(code))
+        valeur = self[code] = "".join(c for c in decompose if not unicodedata.combining(c))
+        return valeur
+
+_SANS_ACCENTS = _TableSansAccents()
+_MOT = re.compile(r"\w+")
+_mots_normalises = {}  # mot en minuscules -> sans accents (le vocabulaire des devoirs est restreint)
+
+def normaliser(texte):
+    """Texte en minuscules et sans accents ("Élève" -> "eleve"), pour comparer sans en tenir compte"""
+    texte = texte.casefold()
+    return texte if texte.isascii() else texte.translate(_SANS_ACCENTS)
+
+def mots(texte):
+    """Mots normalisés d'un texte"""
+    resultat = []
+    for mot in _MOT.findall(texte.casefold()):
+        normalise = _mots_normalises.get(mot)
+        if normalise is None:
+            normalise = _mots_normalises[mot] = mot if mot.isascii() else mot.translate(_SANS_ACCENTS)
+        resultat.append(normalise)
+    return resultat
+
+
+class IndexRecherche:
+    """Index de recherche des devoirs d'une ListeDevoirs, par contenu et nom de classe.
+
+    Chaque mot des contenus renvoie aux devoirs qui le contiennent (index
+    inversé), et chaque morceau de 1 à 3 lettres renvoie aux mots qui le
+    contiennent (trigrammes) : un mot de la recherche peut ainsi être une
+    partie de mot ("fract" trouve "fractions"). Un devoir correspond si
+    chaque mot recherché se trouve dans son contenu ou dans le nom de sa
+    classe. Le nom des classes n'est pas indexé : il y en a peu, et un
+    renommage n'oblige pas à réindexer leurs devoirs.
+
+    L'index suit la liste par ajouter(), retirer() et mettre_a_jour() ;
+    le texte indexé de chaque devoir est gardé pour pouvoir le désindexer
+    après une modification de son contenu. Les derniers résultats par mot
+    recherché (pour le contenu) sont gardés et tenus à jour de la même
+    façon : effacer puis retaper une lettre ne refait pas les unions.
+    """
+    RESULTATS_MAX = 64  # mots recherchés dont le résultat est gardé
+
+    def __init__(self, devoirs, differe=False):
+        """differe : ne rien indexer tout de suite (voir indexer_par_tranches)"""
+        self.devoirs = devoirs
+        self._textes = {}  # id du devoir -> contenu indexé
+        self._devoirs_par_mot = {}  # mot -> {id des devoirs}
+        self._mots_par_morceau = {}  # morceau de 1 à 3 lettres -> {mots qui le contiennent}
+        self._resultats = {}  # mot recherché -> {id des devoirs dont le contenu le contient}
+        if not differe:
+            for devoir in devoirs:
+                self.ajouter(devoir)
+
+    def indexer_par_tranches(self, taille=200):
+        """Indexe les devoirs de la liste par tranches (générateur qui rend la main après chacune).
+
+        La liste peut changer entre deux tranches : l'index est remis en accord avec elle à la fin.
+        """
+        devoirs = list(self.devoirs)
+        for debut in range(0, len(devoirs), taille):
+            for devoir in devoirs[debut:debut + taille]:
+                self.ajouter(devoir)
+            yield
+        self.synchroniser()
+
+    def synchroniser(self):
+        """Remet l'index en accord avec la liste (devoirs retirés, ajoutés ou modifiés depuis leur indexation)"""
+        presents = {devoir.id for devoir in self.devoirs}
+        for id_devoir in [id_devoir for id_devoir in self._textes if id_devoir not in presents]:
+            self._retirer_id(id_devoir)
+        for devoir in self.devoirs:
+            if self._textes.get(devoir.id) != devoir.contenu:
+                self.mettre_a_jour(devoir)
+
+    @staticmethod
+    def _morceaux(mot):
+        return {mot[i:i + n] for n in (1, 2, 3) for i in range(len(mot) - n + 1)}
+
+    def ajouter(self, devoir):
+        """Indexe un devoir"""
+        self._textes[devoir.id] = devoir.contenu
+        mots_devoir = set(mots(devoir.contenu))
+        for mot in mots_devoir:
+            ids = self._devoirs_par_mot.get(mot)
+            if ids is None:
+                ids = self._devoirs_par_mot[mot] = set()
+                for morceau in self._morceaux(mot):
+                    self._mots_par_morceau.setdefault(morceau, set()).add(mot)
+            ids.add(devoir.id)
+        for morceau, ids in self._resultats.items():
+            if any(morceau in mot for mot in mots_devoir):
+                ids.add(devoir.id)
+
+    def retirer(self, devoir):
+        """Retire un devoir de l'index"""
+        self._retirer_id(devoir.id)
+
+    def _retirer_id(self, id_devoir):
+        texte = self._textes.pop(id_devoir, None)
+        if texte is None:
+            return
+        for ids in self._resultats.values():
+            ids.discard(id_devoir)
+        for mot in set(mots(texte)):
+            ids = self._devoirs_par_mot[mot]
+            ids.discard(id_devoir)
+            if not ids:
+                # Plus aucun devoir ne contient ce mot : on l'oublie aussi dans les morceaux
+                del self._devoirs_par_mot[mot]
+                for morceau in self._morceaux(mot):
+                    mots_morceau = self._mots_par_morceau[morceau]
+                    mots_morceau.discard(mot)
+                    if not mots_morceau:
+                        del self._mots_par_morceau[morceau]
+
+    def mettre_a_jour(self, devoir):
+        """Réindexe un devoir dont le contenu a changé"""
+        if self._textes.get(devoir.id) != devoir.contenu:
+            self.retirer(devoir)
+            self.ajouter(devoir)
+
+    def _mots_contenant(self, morceau):
+        """Mots indexés qui contiennent ce morceau de mot"""
+        if len(morceau) <= 3:
+            return self._mots_par_morceau.get(morceau, ())
+        # Intersection des trigrammes (la plus petite d'abord), puis vérification
+        ensembles = sorted((self._mots_par_morceau.get(morceau[i:i + 3], set())
+                            for i in range(len(morceau) - 2)), key=len)
+        candidats = ensembles[0].intersection(*ensembles[1:])
+        return [mot for mot in candidats if morceau in mot]
+
+    def _ids_contenu(self, morceau):
+        """Identifiants des devoirs dont le contenu contient ce morceau de mot"""
+        ids = self._resultats.pop(morceau, None)
+        if ids is None:
+            ids = set().union(*(self._devoirs_par_mot[mot] for mot in self._mots_contenant(morceau)))
+        self._resultats[morceau] = ids  # remis en fin : le plus récemment utilisé
+        if len(self._resultats) > self.RESULTATS_MAX:
+            del self._resultats[next(iter(self._resultats))]
+        return ids
+
+    def _ids_mot(self, morceau):
+        """Identifiants des devoirs dont le contenu ou le nom de classe contient ce morceau de mot"""
+        ids = self._ids_contenu(morceau)
+        classes = [classe for classe in self.devoirs.classes() if morceau in normaliser(classe.nom)]
+        if not classes:
+            return ids
+        ids = set(ids)
+        for classe in classes:
+            ids.update(self.devoirs.ids_de_classe(classe))
+        return ids
+
+    def rechercher(self, requete):
+        """Identifiants des devoirs qui correspondent à la recherche (None si elle est vide)"""
+        morceaux = set(mots(requete))
+        if not morceaux:
+            return None
+        # Les mots les plus longs d'abord : ce sont en général les plus sélectifs
+        morceaux = sorted(morceaux, key=len, reverse=True)
+        resultat = self._ids_mot(morceaux[0]).copy()  # copie : les résultats par mot sont gardés
+        for morceau in morceaux[1:]:
+            if not resultat:
+                break
+            resultat &= self._ids_mot(morceau)
+        return resultat
+
+    def correspond(self, requete, devoir):
+        """Indique si un devoir correspond à la recherche (sans passer par l'index)"""
+        texte = f"{normaliser(devoir.contenu)} {normaliser(devoir.classe_objet.nom)}"
+        return all(morceau in texte for morceau in mots(requete))
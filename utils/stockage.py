@@ -0,0 +1,613 @@
+# utils/stockage.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from utils.fichiers import ecrire_atomique, ecrire_json_atomique, restaurer_si_corrompu
+
+
+def signature_fichier(chemin):
+    """Retourne (date de modification, taille) du fichier, ou None s'il n'existe pas"""
+    try:
+        infos = os.stat(chemin)
+    except FileNotFoundError:
+        return None
+    return (infos.st_mtime_ns, infos.st_size)
+
+def classe_vers_dict(classe):
+    """Convertit une instance de Classe en dictionnaire sérialisable"""
+    return {
+        "id": classe.id,
+        "nom": classe.nom,
+        "effectif": classe.effectif,
+        "couleur": classe.couleur
+    }
+
+def devoir_vers_dict(devoir):
+    """Convertit une instance de Devoir en dictionnaire sérialisable"""
+    return {
+        "id": devoir.id,
+        "contenu": devoir.contenu,
+        "classe_id": devoir.classe_objet.id,  # on stocke l'identifiant, pas l'objet
+        "classe_nom": devoir.classe_objet.nom,  # nom au moment de l'écriture (repli si la classe disparaît)
+        "date": devoir.date,
+        "statut": devoir.statut
+    }
+
+
+class StockageJSON:
+    """Stockage historique : un fichier JSON pour les classes, un pour les devoirs.
+
+    Les opérations unitaires (ajout, modification, suppression, déplacement)
+    réécrivent le fichier complet : c'est le comportement d'origine.
+    """
+    ecriture_unitaire = False  # True si les opérations unitaires n'écrivent que le devoir concerné
+
+    def __init__(self, data_dir):
+        self.classes_file = os.path.join(data_dir, 'classes.json')
+        self.devoirs_file = os.path.join(data_dir, 'devoirs.json')
+
+        # Récupération au démarrage d'un fichier tronqué par un arrêt brutal
+        dossier_sauvegardes = os.path.join(data_dir, 'backup')
+        restaurer_si_corrompu(self.classes_file, dossier_sauvegardes, 'classes')
+        restaurer_si_corrompu(self.devoirs_file, dossier_sauvegardes, 'devoirs')
+
+    def _lire(self, chemin):
+        if not os.path.exists(chemin):
+            return []  # Retourne une liste vide si le fichier n'existe pas
+        with open(chemin, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _ecrire(self, chemin, data):
+        ecrire_json_atomique(chemin, data)
+
+    def signature_classes(self):
+        """Change dès que les classes stockées changent"""
+        return signature_fichier(self.classes_file)
+
+    def signature_devoirs(self):
+        """Change dès que les devoirs stockés changent"""
+        return signature_fichier(self.devoirs_file)
+
+    def charger_classes(self):
+        """Retourne les classes sous forme de dictionnaires"""
+        return self._lire(self.classes_file)
+
+    def sauvegarder_classes(self, classes):
+        """Réécrit toutes les classes"""
+        self._ecrire(self.classes_file, [classe_vers_dict(c) for c in classes])
+
+    def charger_devoirs(self):
+        """Retourne les devoirs sous forme de dictionnaires, dans l'ordre manuel"""
+        return self._lire(self.devoirs_file)
+
+    def sauvegarder_devoirs(self, devoirs):
+        """Réécrit tous les devoirs"""
+        self._ecrire(self.devoirs_file, [devoir_vers_dict(d) for d in devoirs])
+
+    def rechercher_devoirs(self, classe_id=None, statut=None, date_debut=None, date_fin=None):
+        """Retourne les devoirs correspondant aux critères (dates incluses)"""
+        resultats = []
+        for item in self.charger_devoirs():
+            if classe_id is not None and item.get("classe_id") != classe_id:
+                continue
+            if statut is not None and item["statut"] != statut:
+                continue
+            if date_debut is not None and item["date"] < date_debut:
+                continue
+            if date_fin is not None and item["date"] > date_fin:
+                continue
+            resultats.append(item)
+        return resultats
+
+    # Opérations unitaires : la liste passée est déjà à jour. Pour les backends à
+    # ecriture_unitaire, c'est un Extrait (utils/gestion.py) : len() et devoirs[i]
+    # pour les positions concernées et leurs voisines seulement
+
+    def ajouter_devoir(self, devoirs, index):
+        """Enregistre le devoir inséré en devoirs[index]"""
+        self.sauvegarder_devoirs(devoirs)
+
+    def modifier_devoir(self, devoirs, index):
+        """Enregistre la modification de devoirs[index]"""
+        self.sauvegarder_devoirs(devoirs)
+
+    def supprimer_devoir(self, devoirs, devoir, index):
+        """Enregistre la suppression de devoir, qui occupait la position index"""
+        self.sauvegarder_devoirs(devoirs)
+
+    def deplacer_devoir(self, devoirs, ancien_index, nouvel_index):
+        """Enregistre le déplacement d'un devoir de ancien_index vers nouvel_index"""
+        self.sauvegarder_devoirs(devoirs)
+
+    def ajouter_devoirs(self, devoirs, indexes):
+        """Enregistre les devoirs insérés aux positions indexes (croissantes)"""
+        self.sauvegarder_devoirs(devoirs)
+
+    def modifier_devoirs(self, devoirs, indexes):
+        """Enregistre la modification de plusieurs devoirs (devoirs[i] pour i dans indexes)"""
+        self.sauvegarder_devoirs(devoirs)
+
+    def supprimer_devoirs(self, devoirs, ids):
+        """Enregistre la suppression de plusieurs devoirs, désignés par leur identifiant"""
+        self.sauvegarder_devoirs(devoirs)
+
+    def supprimer_devoirs_classe(self, devoirs, classe_id):
+        """Enregistre la suppression de tous les devoirs d'une classe"""
+        self.sauvegarder_devoirs(devoirs)
+
+    def reassigner_devoirs_classe(self, devoirs, ancien_id, nouvelle_classe):
+        """Enregistre le rattachement des devoirs de la classe ancien_id à nouvelle_classe"""
+        self.sauvegarder_devoirs(devoirs)
+
+
+def appliquer_entree(data, entree):
+    """Rejoue une entrée du journal sur la liste de dictionnaires data"""
+    op = entree["op"]
+    if op == "ajout":
+        data.insert(entree["index"], entree["devoir"])
+    elif op == "maj":
+        data[entree["index"]] = entree["devoir"]
+    elif op == "suppression":
+        del data[entree["index"]]
+    elif op == "deplacement":
+        data.insert(entree["vers"], data.pop(entree["de"]))
+    elif op == "ajout_lot":
+        for index, devoir in entree["devoirs"]:
+            data.insert(index, devoir)
+    elif op == "maj_lot":
+        for index, devoir in entree["devoirs"]:
+            data[index] = devoir
+    elif op == "suppression_lot":
+        ids = set(entree["ids"])
+        data[:] = [item for item in data if item.get("id") not in ids]
+    elif op == "suppression_classe":
+        data[:] = [item for item in data if item.get("classe_id") != entree["classe_id"]]
+    elif op == "reassignation_classe":
+        for item in data:
+            if item.get("classe_id") == entree["de"]:
+                item["classe_id"] = entree["vers"]
+                item["classe_nom"] = entree["classe_nom"]
+
+
+class StockageJournal(StockageJSON):
+    """Stockage JSON avec journal des modifications pour les devoirs.
+
+    Chaque modification unitaire est ajoutée en fin de devoirs.journal (une
+    ligne JSON) au lieu de réécrire devoirs.json. Au chargement, le journal
+    est rejoué sur le dernier devoirs.json. Au-delà de SEUIL_COMPACTAGE
+    entrées, le journal est replié dans devoirs.json ; les écritures étant
+    faites par le thread d'écriture (utils/persistance.py), ce compactage
+    ne bloque pas l'interface.
+
+    La première ligne du journal contient l'empreinte du devoirs.json sur
+    lequel il s'applique : si l'application s'arrête entre l'écriture du
+    nouveau devoirs.json et la suppression du journal, celui-ci est reconnu
+    comme déjà intégré et ignoré.
+    """
+    SEUIL_COMPACTAGE = 500
+    ecriture_unitaire = True
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.journal_file = os.path.join(data_dir, 'devoirs.journal')
+        self.verrou = threading.RLock()
+        self.nb_entrees = 0
+        self.empreinte = None  # empreinte du devoirs.json courant
+
+    def signature_devoirs(self):
+        """Change dès que devoirs.json ou le journal changent"""
+        return (signature_fichier(self.devoirs_file), signature_fichier(self.journal_file))
+
+    def _lire_instantane(self):
+        """Retourne (données, empreinte) du devoirs.json"""
+        if not os.path.exists(self.devoirs_file):
+            return [], None
+        with open(self.devoirs_file, 'rb') as f:
+            contenu = f.read()
+        return json.loads(contenu.decode('utf-8')), hashlib.sha1(contenu).hexdigest()
+
+    def _ecrire_instantane(self, data):
+        """Écrit devoirs.json et retourne son empreinte"""
+        contenu = ecrire_json_atomique(self.devoirs_file, data)
+        return hashlib.sha1(contenu).hexdigest()
+
+    def _lire_journal(self, empreinte):
+        """Retourne les entrées du journal qui s'appliquent au devoirs.json d'empreinte donnée"""
+        if not os.path.exists(self.journal_file):
+            return []
+        with open(self.journal_file, 'rb') as f:
+            lignes = f.read().split(b'\n')
+
+        entrees = []
+        for ligne in lignes:
+            try:
+                entrees.append(json.loads(ligne.decode('utf-8')))
+            except ValueError:
+                break  # ligne tronquée (arrêt pendant une écriture) : on s'arrête là
+
+        if not entrees or entrees[0].get("base") != empreinte:
+            # Journal déjà intégré à devoirs.json (ou illisible) : on repart de zéro
+            os.remove(self.journal_file)
+            return []
+
+        # Réécrire le journal sans l'éventuelle fin tronquée
+        valides = entrees[1:]
+        if len(lignes) != len(entrees) + 1 or lignes[-1]:
+            self._reecrire_journal(empreinte, valides)
+        return valides
+
+    def _reecrire_journal(self, empreinte, entrees):
+        lignes = [json.dumps({"base": empreinte})]
+        lignes += [json.dumps(entree, ensure_ascii=False) for entree in entrees]
+        ecrire_atomique(self.journal_file, ("\n".join(lignes) + "\n").encode('utf-8'))
+
+    def charger_devoirs(self):
+        """Retourne le dernier devoirs.json sur lequel le journal a été rejoué"""
+        with self.verrou:
+            data, self.empreinte = self._lire_instantane()
+            entrees = self._lire_journal(self.empreinte)
+            for entree in entrees:
+                appliquer_entree(data, entree)
+            self.nb_entrees = len(entrees)
+            return data
+
+    def sauvegarder_devoirs(self, devoirs):
+        """Réécrit devoirs.json et vide le journal"""
+        with self.verrou:
+            self._remplacer_instantane([devoir_vers_dict(d) for d in devoirs])
+
+    def _remplacer_instantane(self, data):
+        self.empreinte = self._ecrire_instantane(data)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.nb_entrees = 0
+
+    def _journaliser(self, entree):
+        """Ajoute une entrée en fin de journal, et lance le compactage si besoin"""
+        with self.verrou:
+            if not os.path.exists(self.journal_file):
+                if self.empreinte is None:
+                    _, self.empreinte = self._lire_instantane()
+                if self.empreinte is None:
+                    # Pas encore de devoirs.json : on en crée un vide comme base
+                    self.empreinte = self._ecrire_instantane([])
+                self._reecrire_journal(self.empreinte, [])
+            with open(self.journal_file, 'ab') as f:
+                f.write((json.dumps(entree, ensure_ascii=False) + "\n").encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            self.nb_entrees += 1
+
+            if self.nb_entrees >= self.SEUIL_COMPACTAGE:
+                self.compacter()
+
+    def compacter(self):
+        """Replie le journal dans devoirs.json"""
+        with self.verrou:
+            self._remplacer_instantane(self.charger_devoirs())
+
+    def ajouter_devoir(self, devoirs, index):
+        """Journalise l'insertion de devoirs[index]"""
+        self._journaliser({"op": "ajout", "index": index, "devoir": devoir_vers_dict(devoirs[index])})
+
+    def modifier_devoir(self, devoirs, index):
+        """Journalise le nouvel état de devoirs[index]"""
+        self._journaliser({"op": "maj", "index": index, "devoir": devoir_vers_dict(devoirs[index])})
+
+    def supprimer_devoir(self, devoirs, devoir, index):
+        """Journalise la suppression du devoir en position index"""
+        self._journaliser({"op": "suppression", "index": index})
+
+    def deplacer_devoir(self, devoirs, ancien_index, nouvel_index):
+        """Journalise le déplacement d'un devoir"""
+        self._journaliser({"op": "deplacement", "de": ancien_index, "vers": nouvel_index})
+
+    def ajouter_devoirs(self, devoirs, indexes):
+        """Journalise l'insertion de plusieurs devoirs (une seule entrée, positions croissantes)"""
+        self._journaliser({"op": "ajout_lot", "devoirs": [[index, devoir_vers_dict(devoirs[index])] for index in indexes]})
+
+    def modifier_devoirs(self, devoirs, indexes):
+        """Journalise le nouvel état de plusieurs devoirs (une seule entrée)"""
+        self._journaliser({"op": "maj_lot", "devoirs": [[index, devoir_vers_dict(devoirs[index])] for index in indexes]})
+
+    def supprimer_devoirs(self, devoirs, ids):
+        """Journalise la suppression de plusieurs devoirs (une seule entrée)"""
+        self._journaliser({"op": "suppression_lot", "ids": list(ids)})
+
+    def supprimer_devoirs_classe(self, devoirs, classe_id):
+        """Journalise la suppression des devoirs d'une classe (une seule entrée)"""
+        self._journaliser({"op": "suppression_classe", "classe_id": classe_id})
+
+    def reassigner_devoirs_classe(self, devoirs, ancien_id, nouvelle_classe):
+        """Journalise le rattachement des devoirs d'une classe à une autre (une seule entrée)"""
+        self._journaliser({"op": "reassignation_classe", "de": ancien_id,
+                           "vers": nouvelle_classe.id, "classe_nom": nouvelle_classe.nom})
+
+
+class StockageSQLite:
+    """Stockage SQLite : une ligne par devoir, indexée par classe, date et statut.
+
+    Les devoirs référencent leur classe par son identifiant (classe_id) :
+    renommer une classe ne touche qu'une ligne de la table classes.
+
+    L'ordre manuel est porté par une colonne position (réel) : insérer ou
+    déplacer un devoir revient à lui donner une position entre ses deux
+    voisins, sans toucher aux autres lignes.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS classes (
+            id INTEGER PRIMARY KEY,
+            nom TEXT NOT NULL,
+            effectif INTEGER NOT NULL,
+            couleur TEXT NOT NULL,
+            position INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS devoirs (
+            id INTEGER PRIMARY KEY,
+            contenu TEXT NOT NULL,
+            classe_id INTEGER,
+            classe_nom TEXT NOT NULL,
+            date TEXT NOT NULL,
+            statut TEXT NOT NULL,
+            position REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_devoirs_date ON devoirs(date);
+        CREATE INDEX IF NOT EXISTS idx_devoirs_statut ON devoirs(statut);
+        CREATE INDEX IF NOT EXISTS idx_devoirs_position ON devoirs(position);
+    """
+    ECART_MINIMAL = 1e-9  # En dessous, on renumérote les positions
+    ecriture_unitaire = True
+
+    def __init__(self, data_dir):
+        self.chemin = os.path.join(data_dir, 'devoirs.db')
+        nouvelle_base = not os.path.exists(self.chemin)
+        # Les écritures se font sur le thread d'écriture (utils/persistance.py), les lectures sur celui
+        # de l'interface : une seule connexion (data_version ne compte que les écritures des autres),
+        # utilisée par un thread à la fois grâce au verrou
+        self.verrou = threading.RLock()
+        self.connexion = sqlite3.connect(self.chemin, check_same_thread=False)
+        self.connexion.row_factory = sqlite3.Row
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.executescript(self.SCHEMA)
+        self._migrer()
+        if nouvelle_base:
+            self._importer_json(data_dir)
+
+    def _migrer(self):
+        """Ajoute la colonne classe_id aux bases créées avant son introduction"""
+        colonnes = {ligne["name"] for ligne in self.connexion.execute("PRAGMA table_info(devoirs)")}
+        if "classe_id" not in colonnes:
+            with self.connexion:
+                self.connexion.execute("ALTER TABLE devoirs ADD COLUMN classe_id INTEGER")
+                self.connexion.execute(
+                    "UPDATE devoirs SET classe_id = (SELECT id FROM classes WHERE classes.nom = devoirs.classe_nom)"
+                )
+        self.connexion.execute("CREATE INDEX IF NOT EXISTS idx_devoirs_classe_id ON devoirs(classe_id)")
+
+    def _signature(self):
+        # Plutôt que la date du fichier (que nos propres écritures modifient),
+        # SQLite fournit un compteur qui ne change qu'avec les écritures
+        # d'autres connexions : exactement ce qui doit invalider un cache.
+        with self.verrou:
+            return self.connexion.execute("PRAGMA data_version").fetchone()[0]
+
+    signature_classes = _signature
+    signature_devoirs = _signature
+
+    def _importer_json(self, data_dir):
+        """Reprend les données des fichiers JSON lors de la création de la base"""
+        ancien = StockageJSON(data_dir)
+        with self.connexion:
+            ids_vus = set()
+            for position, item in enumerate(ancien.charger_classes()):
+                id_classe = item.get("id")
+                if id_classe in ids_vus:
+                    id_classe = None
+                ids_vus.add(id_classe)
+                self.connexion.execute(
+                    "INSERT INTO classes (id, nom, effectif, couleur, position) VALUES (?, ?, ?, ?, ?)",
+                    (id_classe, item["nom"], item["effectif"], item.get("couleur", "gris"), position)
+                )
+            # Ancien fichier : les devoirs ne connaissent que le nom de leur classe
+            ids_par_nom = {}
+            for ligne in self.connexion.execute("SELECT id, nom FROM classes ORDER BY position DESC"):
+                ids_par_nom[ligne["nom"]] = ligne["id"]
+            ids_vus = set()
+            for position, item in enumerate(ancien.charger_devoirs()):
+                # Sans identifiant (ancien fichier) ou en double, SQLite en attribue un
+                id_devoir = item.get("id")
+                if id_devoir in ids_vus:
+                    id_devoir = None
+                ids_vus.add(id_devoir)
+                classe_id = item.get("classe_id")
+                if classe_id is None:
+                    classe_id = ids_par_nom.get(item["classe_nom"])
+                self.connexion.execute(
+                    "INSERT INTO devoirs (id, contenu, classe_id, classe_nom, date, statut, position) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (id_devoir, item["contenu"], classe_id, item["classe_nom"], item["date"], item["statut"], float(position))
+                )
+
+    def charger_classes(self):
+        """Retourne les classes sous forme de dictionnaires"""
+        with self.verrou:
+            lignes = self.connexion.execute(
+                "SELECT id, nom, effectif, couleur FROM classes ORDER BY position"
+            )
+            return [dict(ligne) for ligne in lignes]
+
+    def sauvegarder_classes(self, classes):
+        """Réécrit toutes les classes (quelques dizaines de lignes au plus)"""
+        with self.verrou, self.connexion:
+            self.connexion.execute("DELETE FROM classes")
+            self.connexion.executemany(
+                "INSERT INTO classes (id, nom, effectif, couleur, position) VALUES (?, ?, ?, ?, ?)",
+                [(c.id, c.nom, c.effectif, c.couleur, position) for position, c in enumerate(classes)]
+            )
+
+    def charger_devoirs(self):
+        """Retourne les devoirs sous forme de dictionnaires, dans l'ordre manuel"""
+        with self.verrou:
+            lignes = self.connexion.execute(
+                "SELECT id, contenu, classe_id, classe_nom, date, statut FROM devoirs ORDER BY position"
+            )
+            return [dict(ligne) for ligne in lignes]
+
+    def sauvegarder_devoirs(self, devoirs):
+        """Réécrit tous les devoirs"""
+        with self.verrou, self.connexion:
+            self.connexion.execute("DELETE FROM devoirs")
+            for position, devoir in enumerate(devoirs):
+                self._inserer(devoir, float(position))
+
+    def rechercher_devoirs(self, classe_id=None, statut=None, date_debut=None, date_fin=None):
+        """Retourne les devoirs correspondant aux critères (dates incluses)"""
+        conditions = []
+        parametres = []
+        if classe_id is not None:
+            conditions.append("classe_id = ?")
+            parametres.append(classe_id)
+        if statut is not None:
+            conditions.append("statut = ?")
+            parametres.append(statut)
+        if date_debut is not None:
+            conditions.append("date >= ?")
+            parametres.append(date_debut)
+        if date_fin is not None:
+            conditions.append("date <= ?")
+            parametres.append(date_fin)
+        requete = "SELECT id, contenu, classe_id, classe_nom, date, statut FROM devoirs"
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        requete += " ORDER BY position"
+        with self.verrou:
+            return [dict(ligne) for ligne in self.connexion.execute(requete, parametres)]
+
+    def _inserer(self, devoir, position):
+        self.connexion.execute(
+            "INSERT INTO devoirs (id, contenu, classe_id, classe_nom, date, statut, position) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (devoir.id, devoir.contenu, devoir.classe_objet.id, devoir.classe_objet.nom, devoir.date, devoir.statut, position)
+        )
+
+    def _position(self, devoir):
+        ligne = self.connexion.execute(
+            "SELECT position FROM devoirs WHERE id = ?", (devoir.id,)
+        ).fetchone()
+        return ligne["position"] if ligne else None
+
+    def _position_entre(self, devoirs, index):
+        """Calcule une position pour devoirs[index] à partir de ses voisins"""
+        avant = self._position(devoirs[index - 1]) if index > 0 else None
+        apres = self._position(devoirs[index + 1]) if index + 1 < len(devoirs) else None
+
+        if avant is None and apres is None:
+            return 0.0
+        if avant is None:
+            return apres - 1.0
+        if apres is None:
+            return avant + 1.0
+        if apres - avant < self.ECART_MINIMAL:
+            # Plus de place entre les voisins : on renumérote tout une fois
+            self._renumeroter()
+            avant, apres = self._position(devoirs[index - 1]), self._position(devoirs[index + 1])
+        return (avant + apres) / 2
+
+    def _renumeroter(self):
+        """Redonne des positions entières à toutes les lignes, dans leur ordre actuel (sans la liste en mémoire)"""
+        ids = [ligne["id"] for ligne in self.connexion.execute("SELECT id FROM devoirs ORDER BY position")]
+        self.connexion.executemany(
+            "UPDATE devoirs SET position = ? WHERE id = ?",
+            [(float(i), id_devoir) for i, id_devoir in enumerate(ids)]
+        )
+
+    def _bornes(self, devoirs, premier, dernier):
+        """Positions entre lesquelles placer devoirs[premier..dernier] (inventées s'il n'y a pas de voisin en base)"""
+        nombre = dernier - premier + 1
+        avant = self._position(devoirs[premier - 1]) if premier > 0 else None
+        apres = self._position(devoirs[dernier + 1]) if dernier + 1 < len(devoirs) else None
+        if avant is None:
+            avant = (apres if apres is not None else float(nombre + 1)) - (nombre + 1)
+        if apres is None:
+            apres = avant + nombre + 1
+        return avant, apres
+
+    def ajouter_devoir(self, devoirs, index):
+        """Insère une seule ligne pour devoirs[index]"""
+        with self.verrou, self.connexion:
+            self._inserer(devoirs[index], self._position_entre(devoirs, index))
+
+    def ajouter_devoirs(self, devoirs, indexes):
+        """Insère les lignes de plusieurs devoirs (positions indexes croissantes), en une transaction"""
+        with self.verrou, self.connexion:
+            debut = 0
+            while debut < len(indexes):
+                # Suite de devoirs consécutifs : positions réparties entre les voisins déjà en base
+                fin = debut
+                while fin + 1 < len(indexes) and indexes[fin + 1] == indexes[fin] + 1:
+                    fin += 1
+                premier, dernier = indexes[debut], indexes[fin]
+                avant, apres = self._bornes(devoirs, premier, dernier)
+                if (apres - avant) / (dernier - premier + 2) < self.ECART_MINIMAL:
+                    # Plus de place entre les voisins : on renumérote tout une fois
+                    self._renumeroter()
+                    avant, apres = self._bornes(devoirs, premier, dernier)
+                pas = (apres - avant) / (dernier - premier + 2)
+                for rang, index in enumerate(range(premier, dernier + 1), 1):
+                    self._inserer(devoirs[index], avant + rang * pas)
+                debut = fin + 1
+
+    def modifier_devoir(self, devoirs, index):
+        """Met à jour la ligne de devoirs[index]"""
+        self.modifier_devoirs(devoirs, [index])
+
+    def modifier_devoirs(self, devoirs, indexes):
+        """Met à jour les lignes de plusieurs devoirs, en une transaction"""
+        with self.verrou, self.connexion:
+            self.connexion.executemany(
+                "UPDATE devoirs SET contenu = ?, classe_id = ?, classe_nom = ?, date = ?, statut = ? WHERE id = ?",
+                [(d.contenu, d.classe_objet.id, d.classe_objet.nom, d.date, d.statut, d.id)
+                 for d in (devoirs[index] for index in indexes)]
+            )
+
+    def supprimer_devoir(self, devoirs, devoir, index):
+        """Supprime la ligne du devoir"""
+        with self.verrou, self.connexion:
+            self.connexion.execute("DELETE FROM devoirs WHERE id = ?", (devoir.id,))
+
+    def deplacer_devoir(self, devoirs, ancien_index, nouvel_index):
+        """Change la position du devoir déplacé, entre ses nouveaux voisins"""
+        devoir = devoirs[nouvel_index]
+        with self.verrou, self.connexion:
+            self.connexion.execute(
+                "UPDATE devoirs SET position = ? WHERE id = ?",
+                (self._position_entre(devoirs, nouvel_index), devoir.id)
+            )
+
+    def supprimer_devoirs(self, devoirs, ids):
+        """Supprime les lignes de plusieurs devoirs, en une transaction"""
+        with self.verrou, self.connexion:
+            self.connexion.executemany("DELETE FROM devoirs WHERE id = ?", [(id_devoir,) for id_devoir in ids])
+
+    def supprimer_devoirs_classe(self, devoirs, classe_id):
+        """Supprime en une requête (indexée) les devoirs d'une classe"""
+        with self.verrou, self.connexion:
+            self.connexion.execute("DELETE FROM devoirs WHERE classe_id = ?", (classe_id,))
+
+    def reassigner_devoirs_classe(self, devoirs, ancien_id, nouvelle_classe):
+        """Rattache en une requête (indexée) les devoirs d'une classe à une autre"""
+        with self.verrou, self.connexion:
+            self.connexion.execute(
+                "UPDATE devoirs SET classe_id = ?, classe_nom = ? WHERE classe_id = ?",
+                (nouvelle_classe.id, nouvelle_classe.nom, ancien_id)
+            )
+
+
+def creer_stockage(type_stockage, data_dir):
+    """Instancie le backend de stockage demandé ("json", "journal" ou "sqlite")"""
+    if type_stockage == "sqlite":
+        return StockageSQLite(data_dir)
+    if type_stockage == "journal":
+        return StockageJournal(data_dir)
+    return StockageJSON(data_dir)